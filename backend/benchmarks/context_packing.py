@@ -0,0 +1,137 @@
+"""
+Context Packing Benchmark - Prompt size before/after pack_context
+
+Runs a fixed query set through retrieval and compares the naive context
+(chunks joined as-is) against the packed context.
+
+By default it runs fully offline: files from a local directory are chunked with
+`chunk_docs` and ranked with a simple lexical scorer standing in for the vector
+search. Use --live to query the configured Qdrant collection instead.
+
+Usage (from backend/):
+    python -m benchmarks.context_packing
+    python -m benchmarks.context_packing --source ../frontend --budget 2000
+    python -m benchmarks.context_packing --live --json
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+
+from langchain_core.documents import Document  # noqa: E402
+from src.rag.context import estimate_tokens, pack_context  # noqa: E402
+from src.rag.vectorstore import chunk_docs  # noqa: E402
+
+QUERIES = [
+    "How does the router decide which tool to call?",
+    "How are pull request counts fetched from GitHub?",
+    "How is a repository ingested into the vector store?",
+    "What does the classifier return?",
+    "How are rate limits tracked?",
+    "How is the chat endpoint implemented?",
+    "How are search results formatted?",
+    "Which embeddings are used for hybrid retrieval?",
+    "How are language percentages calculated?",
+    "How does the RAG chain build its prompt?",
+]
+
+EXTENSIONS = (".py", ".md", ".txt", ".json", ".toml", ".js", ".ts", ".tsx", ".html", ".css", ".java")
+TOKEN_RE = re.compile(r"[a-zA-Z_]{3,}")
+
+
+def load_local_docs(source_dir: Path):
+    """Load text files from a directory in the same shape GitLoader produces."""
+    docs = []
+    for path in sorted(source_dir.rglob("*")):
+        if not path.is_file() or not path.name.endswith(EXTENSIONS):
+            continue
+        if any(part in ("node_modules", "__pycache__", ".git") for part in path.parts):
+            continue
+        try:
+            text = path.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            continue
+        rel = str(path.relative_to(source_dir))
+        docs.append(Document(page_content=text, metadata={"source": rel, "file_path": rel}))
+    return docs
+
+
+def lexical_top_k(chunks, query: str, k: int = 10):
+    """Rank chunks by query term frequency (offline stand-in for vector search)."""
+    terms = [t.lower() for t in TOKEN_RE.findall(query)]
+    scored = []
+    for i, chunk in enumerate(chunks):
+        counts = Counter(t.lower() for t in TOKEN_RE.findall(chunk.page_content))
+        score = sum(counts[t] for t in terms)
+        if score:
+            scored.append((score, -i, chunk))
+    scored.sort(reverse=True, key=lambda x: (x[0], x[1]))
+    return [chunk for _, _, chunk in scored[:k]]
+
+
+def run(retrieve, budget: int):
+    rows = []
+    for query in QUERIES:
+        docs = retrieve(query)
+        naive = "\n\n".join(doc.page_content for doc in docs)
+        packed = pack_context(docs, token_budget=budget)
+        rows.append({
+            "query": query,
+            "chunks": len(docs),
+            "files": len({d.metadata.get("source") for d in docs}),
+            "naive_tokens": estimate_tokens(naive),
+            "packed_tokens": estimate_tokens(packed),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=str(Path(__file__).resolve().parents[1] / "src"),
+                        help="Directory to chunk for the offline run")
+    parser.add_argument("--budget", type=int, default=None, help="Token budget (default: settings)")
+    parser.add_argument("--live", action="store_true", help="Use the configured Qdrant retriever")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    from src.config.settings import settings
+    budget = args.budget or settings.RAG_CONTEXT_TOKEN_BUDGET
+
+    if args.live:
+        from src.rag.retriever import get_retriever
+        retriever = get_retriever()
+        retrieve = retriever.invoke
+    else:
+        chunks = chunk_docs(load_local_docs(Path(args.source)))
+        retrieve = lambda q: lexical_top_k(chunks, q)  # noqa: E731
+
+    rows = run(retrieve, budget)
+    naive_total = sum(r["naive_tokens"] for r in rows)
+    packed_total = sum(r["packed_tokens"] for r in rows)
+    summary = {
+        "budget": budget,
+        "queries": len(rows),
+        "naive_tokens": naive_total,
+        "packed_tokens": packed_total,
+        "reduction_pct": round((1 - packed_total / naive_total) * 100, 1) if naive_total else 0.0,
+    }
+
+    if args.json:
+        print(json.dumps({"summary": summary, "queries": rows}, indent=2))
+        return
+
+    print(f"{'query':<55} {'chunks':>6} {'files':>5} {'naive':>7} {'packed':>7}")
+    for r in rows:
+        print(f"{r['query'][:55]:<55} {r['chunks']:>6} {r['files']:>5} {r['naive_tokens']:>7} {r['packed_tokens']:>7}")
+    print(f"\nTotal: {naive_total} -> {packed_total} est. tokens "
+          f"({summary['reduction_pct']}% smaller, budget {budget})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Query Embedding Cache Benchmark - Embed latency and hit rate with the cache
+
+Replays a question stream with Zipf-distributed repeats (a few popular
+questions, a long tail of one-offs) through the cached dense + sparse query
+embedders, using the hashing stand-ins from benchmarks.fakes with a simulated
+remote latency.
+
+Reports, per phase:
+- cold: empty cache
+- warm: same stream again, memory tier populated
+- restart: fresh process-level cache backed by the same SQLite file
+and the memory used per cached dense vector.
+
+Usage (from backend/):
+    python -m benchmarks.embedding_cache
+    python -m benchmarks.embedding_cache --queries 5000 --distinct 800 --latency 0.05 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+
+from benchmarks.fakes import HashingEmbeddings, HashingSparseEmbeddings  # noqa: E402
+from src.rag.embedding_cache import (  # noqa: E402
+    CachedEmbeddings, CachedSparseEmbeddings, EmbeddingCache, ENTRY_OVERHEAD_BYTES,
+)
+
+WORDS = ("how does the router cache embeddings retriever qdrant webhook ingest "
+         "rate limit github token chunk index search stream prompt").split()
+
+
+def make_questions(distinct: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=8)) + f" #{i}?" for i in range(distinct)]
+
+
+def zipf_stream(questions: list[str], n: int, s: float, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** s for rank in range(len(questions))]
+    stream = rng.choices(questions, weights=weights, k=n)
+    # Some users type the same question with different spacing
+    return [q.replace(" ", "  ", 1) if rng.random() < 0.1 else q for q in stream]
+
+
+def run_phase(name, stream, cache, dim, latency):
+    dense = CachedEmbeddings(HashingEmbeddings(dim=dim, latency=latency), "hashing", cache)
+    sparse = CachedSparseEmbeddings(HashingSparseEmbeddings(), "hashing-bm25", cache)
+    misses = 0
+    timings = []
+    for question in stream:
+        before = len(cache)
+        start = time.perf_counter()
+        dense.embed_query(question)
+        sparse.embed_query(question)
+        timings.append((time.perf_counter() - start) * 1000)
+        misses += len(cache) > before
+    timings.sort()
+    return {
+        "phase": name,
+        "queries": len(stream),
+        "memory_hit_rate": round(1 - misses / len(stream), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95)], 3),
+        "total_s": round(sum(timings) / 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=500, help="Distinct questions in the pool")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of question popularity")
+    parser.add_argument("--dim", type=int, default=3072, help="Dense vector size")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated seconds per dense embed call")
+    parser.add_argument("--max-mb", type=float, default=32, help="Memory tier budget")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    stream = zipf_stream(make_questions(args.distinct, args.seed), args.queries, args.zipf, args.seed)
+    max_bytes = int(args.max_mb * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite3")
+        cache = EmbeddingCache(max_bytes, path=path)
+        rows = [run_phase("cold", stream, cache, args.dim, args.latency),
+                run_phase("warm", stream, cache, args.dim, args.latency)]
+        entries, nbytes = len(cache), cache.nbytes
+        cache.close()
+
+        # New cache object on the same file: what a restarted worker sees
+        restarted = EmbeddingCache(max_bytes, path=path)
+        rows.append(run_phase("restart", stream, restarted, args.dim, args.latency))
+        restarted.close()
+
+    summary = {
+        "distinct_in_stream": len({" ".join(q.split()) for q in stream}),
+        "cached_entries": entries,
+        "cache_bytes": nbytes,
+        "bytes_per_dense_vector": args.dim * 4 + ENTRY_OVERHEAD_BYTES,
+        "python_list_bytes_per_dense_vector": args.dim * (8 + 24),
+    }
+
+    if args.json:
+        print(json.dumps({"summary": summary, "phases": rows}, indent=2))
+        return
+
+    print(f"{'phase':<8} {'queries':>7} {'mem hit':>8} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'total s':>8}")
+    for r in rows:
+        print(f"{r['phase']:<8} {r['queries']:>7} {r['memory_hit_rate']:>8} {r['mean_ms']:>8} "
+              f"{r['p50_ms']:>7} {r['p95_ms']:>7} {r['total_s']:>8}")
+    print(f"\n{summary['distinct_in_stream']} distinct questions, {entries} cache entries, "
+          f"{nbytes / 1024 / 1024:.1f} MB in memory "
+          f"(~{summary['bytes_per_dense_vector']} B per dense vector vs "
+          f"~{summary['python_list_bytes_per_dense_vector']} B as a list of floats)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Offline stand-ins shared by the benchmark harnesses
+
+- GitHubReplayTransport: httpx.MockTransport replaying recorded GitHub API
+  responses (benchmarks/fixtures/github) for any 'owner/repo', with optional
+  injected network latency and per-route call counting
+- FakeChatModel: deterministic LangChain chat model that answers classifier
+  prompts with a keyword-based ClassificationResult and synthesizer prompts
+  with a short echo of the tool output
+- HashingEmbeddings / HashingSparseEmbeddings: deterministic local stand-ins
+  for the Gemini dense and FastEmbed BM25 sparse embeddings
+- SearxNGStandIn: httpx.MockTransport serving a SearxNG JSON API and the
+  result pages, with per-host latency so hedging/deadlines can be exercised
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, List, Optional
+from urllib.parse import urlencode
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GITHUB_TOKEN", "benchmark")
+
+import httpx  # noqa: E402
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+from langchain_qdrant.sparse_embeddings import SparseEmbeddings, SparseVector  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "github"
+REPO_RE = re.compile(r"\b([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)\b")
+
+
+def _load_fixtures(fixtures_dir: Path) -> dict:
+    return {p.stem: json.loads(p.read_text()) for p in fixtures_dir.glob("*.json")}
+
+
+def _fill_repo(obj: Any, repo: str, **extra) -> Any:
+    """Substitute {repo}/{owner}/{name} placeholders in a recorded payload."""
+    owner, name = repo.split("/", 1)
+    text = json.dumps(obj)
+    for key, value in {"repo": repo, "owner": owner, "name": name, **extra}.items():
+        text = text.replace("{" + key + "}", value)
+    return json.loads(text)
+
+
+class GitHubReplayTransport(httpx.MockTransport):
+    """
+    Replays recorded GitHub API responses.
+
+    Works for both httpx.Client and httpx.AsyncClient. List endpoints honour
+    `per_page`/`page` and send a real `Link` header so pagination code paths
+    are exercised.
+
+    Args:
+        latency: Seconds of simulated network latency per request
+        fixtures_dir: Directory with the recorded JSON payloads
+    """
+
+    def __init__(self, latency: float = 0.0, fixtures_dir: Path = FIXTURES_DIR):
+        self.latency = latency
+        self.fixtures = _load_fixtures(fixtures_dir)
+        self.calls: Counter = Counter()
+        self._filled: dict = {}
+        super().__init__(self._handle)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        return super().handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await super().handle_async_request(request)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _paginate(self, request: httpx.Request, items: list, per_page_default: int = 30) -> httpx.Response:
+        per_page = int(request.url.params.get("per_page", per_page_default))
+        page = int(request.url.params.get("page", 1))
+        last = max(1, math.ceil(len(items) / per_page))
+        body = items[(page - 1) * per_page: page * per_page]
+
+        links = []
+        base = f"{request.url.scheme}://{request.url.host}{request.url.path}"
+        params = dict(request.url.params)
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                params["page"] = str(number)
+                links.append(f'<{base}?{urlencode(params)}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        return self._json(body, headers=headers)
+
+    def _for_repo(self, name: str, repo: str, **extra) -> Any:
+        key = (name, repo, tuple(sorted(extra.items())))
+        if key not in self._filled:
+            self._filled[key] = _fill_repo(self.fixtures[name], repo, **extra)
+        return self._filled[key]
+
+    def _json(self, body: Any, status: int = 200, headers: Optional[dict] = None) -> httpx.Response:
+        headers = {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "1900000000", **(headers or {})}
+        return httpx.Response(status, json=body, headers=headers)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        f = self.fixtures
+
+        if path == "/search/issues":
+            query = request.url.params.get("q", "")
+            self.calls["search/issues"] += 1
+            for qualifier, count in f["meta"]["search_total_count"].items():
+                if qualifier in query:
+                    return self._json({"total_count": count, "incomplete_results": False, "items": []})
+            return self._json({"total_count": 0, "incomplete_results": False, "items": []})
+
+        match = re.fullmatch(r"/repos/([^/]+/[^/]+)(/.*)?", path)
+        if not match:
+            self.calls["unknown"] += 1
+            return self._json({"message": "Not Found"}, status=404)
+
+        repo, sub = match.group(1), match.group(2) or ""
+        self.calls[f"repos{sub or '/'}"] += 1
+
+        if sub == "":
+            return self._json(self._for_repo("repo", repo))
+        if sub == "/contributors":
+            return self._paginate(request, f["contributors"])
+        if sub == "/commits":
+            return self._paginate(request, self._for_repo("commits", repo))
+        if sub == "/languages":
+            return self._json(f["languages"])
+        if sub == "/releases/latest":
+            return self._json(f["release_latest"])
+        if sub == "/releases":
+            return self._paginate(request, [f["release_latest"]])
+        if sub == "/issues":
+            state = request.url.params.get("state", "open")
+            count = f["meta"]["issue_count"].get(state, 0)
+            template = self._for_repo("issues", repo, state=state)[0]
+            return self._paginate(request, [template] * count)
+
+        return self._json({"message": "Not Found"}, status=404)
+
+
+# --- Fake LLM -------------------------------------------------------------
+
+CLASSIFY_RULES = [
+    (("how does", "explain", "structure", "where is", "defined"), "RAG"),
+    (("pull request", " pr", "prs"), "GITHUB_PR_COUNT"),
+    (("contributor",), "GITHUB_CONTRIBUTORS"),
+    (("commit activity", "how active", "this week", "this month"), "GITHUB_COMMIT_ACTIVITY"),
+    (("commit",), "GITHUB_COMMITS"),
+    (("issue",), "GITHUB_ISSUES"),
+    (("language", "tech stack"), "GITHUB_LANGUAGES"),
+    (("release", "version"), "GITHUB_RELEASES"),
+    (("star", "fork", "stats", "watcher"), "GITHUB_STATS"),
+    (("overview", "tell me about", "summary"), "GITHUB_OVERVIEW"),
+]
+
+
+def classify_query(query: str) -> dict:
+    """Deterministic keyword classification mirroring the classifier prompt rules."""
+    lowered = f" {query.lower()}"
+    repos = REPO_RE.findall(query)
+    action = next((a for words, a in CLASSIFY_RULES if any(w in lowered for w in words)), None)
+    if action is None:
+        action = "GITHUB_OVERVIEW" if repos else "SEARCH"
+    return {
+        "action": action,
+        "repo": repos[0] if repos else None,
+        "repos": repos if len(repos) > 1 else [],
+        "reason": f"fake classifier matched {action}",
+    }
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model for offline runs.
+
+    Classifier prompts (ending in 'User query: ...' or a numbered
+    'User queries:' list) get a JSON classification,
+    everything else gets a short synthesized answer built from the prompt.
+    Token usage is reported as len(text) / 4 so usage accounting still works.
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-deterministic"
+
+    def _respond(self, prompt: str) -> str:
+        match = re.search(r"User queries:\n(.*)$", prompt, re.S)
+        if match:
+            queries = re.findall(r"^\d+\. (.*)$", match.group(1), re.M)
+            return json.dumps({"results": [classify_query(q) for q in queries]})
+        match = re.search(r"User query: (.*)\s*$", prompt, re.S)
+        if match:
+            return json.dumps(classify_query(match.group(1).strip()))
+        return "Here is what I found: " + " ".join(prompt.split())[-400:]
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = "\n".join(str(m.content) for m in messages)
+        text = self._respond(prompt)
+        usage = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (len(prompt) + len(text)) // 4,
+        }
+        message = AIMessage(content=text, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+# --- Fake embeddings ------------------------------------------------------
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic dense embeddings via the hashing trick (no model, no network).
+
+    Args:
+        dim: Vector size (gemini-embedding-001 produces 3072)
+        latency: Seconds of simulated remote latency per embed call
+    """
+
+    def __init__(self, dim: int = 3072, latency: float = 0.0):
+        self.dim = dim
+        self.latency = latency
+        self.seconds = 0.0  # time spent in embed_documents
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in TOKEN_RE.findall(text.lower()):
+            h = _token_hash(token)
+            vector[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = [self._embed(t) for t in texts]
+        self.seconds += time.perf_counter() - start
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._embed(text)
+
+
+class HashingSparseEmbeddings(SparseEmbeddings):
+    """Deterministic term-frequency sparse vectors standing in for Qdrant/bm25."""
+
+    def __init__(self, vocab_size: int = 2 ** 20):
+        self.vocab_size = vocab_size
+        self.seconds = 0.0  # time spent in embed_documents
+
+    def _embed(self, text: str) -> SparseVector:
+        counts = Counter(_token_hash(t) % self.vocab_size for t in TOKEN_RE.findall(text.lower()))
+        indices = sorted(counts)
+        return SparseVector(indices=indices, values=[float(counts[i]) for i in indices])
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        start = time.perf_counter()
+        vectors = [self._embed(t) for t in texts]
+        self.seconds += time.perf_counter() - start
+        return vectors
+
+    def embed_query(self, text: str) -> SparseVector:
+        return self._embed(text)
+
+
+# --- Fake web search --------------------------------------------------------
+
+class SearxNGStandIn(httpx.MockTransport):
+    """
+    Local stand-in for SearxNG instances and the pages they link to.
+
+    `GET <host>/search?q=...&format=json` returns deterministic results
+    pointing at https://pages.test/...; any other request returns a small
+    HTML page for that URL.
+
+    Args:
+        latency: Seconds per request, keyed by host ("*" = default)
+        failing_hosts: Hosts that answer with HTTP 503
+        results: Results returned per search
+    """
+
+    def __init__(self, latency: Optional[dict] = None, failing_hosts=(), results: int = 10):
+        self.latency = latency or {}
+        self.failing_hosts = set(failing_hosts)
+        self.results = results
+        self.calls: Counter = Counter()
+        super().__init__(self._handle)
+
+    def _delay(self, request: httpx.Request) -> float:
+        return self.latency.get(request.url.host, self.latency.get("*", 0.0))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self._delay(request))
+        return super().handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self._delay(request))
+        return await super().handle_async_request(request)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.calls[host] += 1
+        if host in self.failing_hosts:
+            return httpx.Response(503, text="Service Unavailable")
+
+        if request.url.path == "/search":
+            query = request.url.params.get("q", "")
+            slug = "-".join(TOKEN_RE.findall(query.lower())) or "empty"
+            return httpx.Response(200, json={"query": query, "results": [
+                {
+                    "title": f"{query} - result {i} ({host})",
+                    "url": f"https://pages.test/{slug}/{i}",
+                    "content": f"Snippet {i} about {query}.",
+                    "engine": "standin",
+                }
+                for i in range(1, self.results + 1)
+            ]})
+
+        body = (
+            f"<html><head><title>{request.url.path}</title><style>body {{}}</style>"
+            f"<script>var tracking = 1;</script></head><body><nav>Home | Docs</nav>"
+            f"<main><h1>{request.url.path}</h1>" + "<p>Lorem ipsum &amp; dolor sit amet.</p>" * 200
+            + "</main></body></html>"
+        )
+        return httpx.Response(200, text=body, headers={"content-type": "text/html; charset=utf-8"})
@@ -0,0 +1,176 @@
+"""
+GitHub Tools Benchmark - Offline latency/throughput of tools, router and agent
+
+Replays recorded GitHub responses through an httpx.MockTransport and uses a
+deterministic fake LLM, so nothing touches api.github.com or Gemini.
+
+Timed targets:
+- every public function in src/tools/github_api.py
+- router_agent dispatch for each GITHUB_ACTION_MAP action, with the tool
+  result cache cleared inside every op (router_agent.*) and served from it
+  (router_agent.cached.*)
+- multi-repo comparisons (concurrent fan-out over the shared client)
+- GitHubAgent.run end to end (fake classifier + fake synthesizer, tool
+  result cache cleared inside every op)
+
+Each row reports latency percentiles, ops/s and HTTP calls per op, so
+regressions in concurrency (latency grows with --latency-ms) and caching
+(calls_per_op) show up in the JSON output.
+
+Usage (from backend/):
+    python -m benchmarks.github_tools
+    python -m benchmarks.github_tools --latency-ms 50 --iterations 20 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fakes import FakeChatModel, GitHubReplayTransport
+
+from src.tools import github_api
+from src.agents import router
+from src.agents.classifier import ClassificationResult, QueryClassifier, get_classifier, set_classifier
+from src.agents.github_agent import GitHubAgent
+from src.tools.cache import tool_cache
+
+REPO = "vercel/next.js"
+COMPARE_REPOS = ["facebook/react", "vuejs/core", "sveltejs/svelte"]
+
+TOOL_FUNCTIONS = [
+    "get_open_pull_requests",
+    "get_repository_stats",
+    "get_top_contributors",
+    "get_recent_commits",
+    "get_issue_stats",
+    "get_language_breakdown",
+    "get_latest_release",
+    "get_repo_overview",
+]
+
+AGENT_QUERIES = [
+    f"How many open PRs are in {REPO}?",
+    f"How many stars does {REPO} have?",
+    f"Who are the top contributors to {REPO}?",
+    f"Show me latest commits for {REPO}",
+    f"How active was {REPO} this month?",
+    f"Issue stats for {REPO}",
+    f"What languages are used in {REPO}?",
+    f"What is the latest release of {REPO}?",
+    f"Give me an overview of {REPO}",
+]
+
+
+def _percentile(sorted_values, pct):
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def time_op(name, fn, transport, iterations, warmup=1):
+    for _ in range(warmup):
+        fn()
+    calls_before = transport.total_calls
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "name": name,
+        "iterations": iterations,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "max_ms": round(latencies[-1], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "ops_per_s": round(iterations / elapsed, 2) if elapsed else None,
+        "http_calls_per_op": round((transport.total_calls - calls_before) / iterations, 2),
+    }
+
+
+def uncached(fn):
+    """Wrap an op so every call misses the tool result cache (as load_test does per level)."""
+    def op():
+        tool_cache.clear()
+        return fn()
+    return op
+
+
+def run(iterations: int, latency_ms: float, llm_latency_ms: float):
+    transport = GitHubReplayTransport(latency=latency_ms / 1000)
+    github_api.set_transport(transport)
+
+    llm = FakeChatModel(latency=llm_latency_ms / 1000)
+    set_classifier(QueryClassifier(llm=llm))
+    agent = GitHubAgent(llm=llm)
+
+    results = []
+    try:
+        for fn_name in TOOL_FUNCTIONS:
+            fn = getattr(github_api, fn_name)
+            results.append(time_op(f"tools.{fn_name}", lambda fn=fn: fn(REPO), transport, iterations))
+
+        for action in router.GITHUB_ACTION_MAP:
+            decision = ClassificationResult(action=action, repo=REPO, reason="benchmark")
+            route = lambda d=decision: router.router_agent("benchmark", d)
+            results.append(time_op(f"router_agent.{action}", uncached(route), transport, iterations))
+            results.append(time_op(f"router_agent.cached.{action}", route, transport, iterations))
+
+        for action in ("GITHUB_STATS", "GITHUB_PR_COUNT"):
+            decision = ClassificationResult(action=action, repo=COMPARE_REPOS[0], repos=COMPARE_REPOS, reason="benchmark")
+            results.append(time_op(
+                f"router_agent.compare.{action}",
+                uncached(lambda d=decision: router.router_agent("benchmark", d)),
+                transport,
+                iterations,
+            ))
+
+        for query in AGENT_QUERIES:
+            action = get_classifier().classify(query).action
+            results.append(time_op(f"agent.run.{action}", uncached(lambda q=query: agent.run(q)),
+                                   transport, iterations))
+    finally:
+        github_api.set_transport(None)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "network_latency_ms": latency_ms,
+            "llm_latency_ms": llm_latency_ms,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per GitHub request")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Injected latency per fake LLM call")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.latency_ms, args.llm_latency_ms)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'benchmark':<45} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>9} {'calls/op':>9}")
+    for r in report["results"]:
+        print(f"{r['name']:<45} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['ops_per_s']:>9.1f} {r['http_calls_per_op']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Import Time Benchmark - Cold start budget for `import src.main`
+
+Runs `python -X importtime -c "import src.main"` in fresh interpreters with
+GEMINI_API_KEY / GITHUB_TOKEN removed from the environment (importing the app
+must not need secrets), then:
+- reports the median total import time and the slowest modules
+- exits with status 1 if the total exceeds --budget-ms, if the import fails,
+  or if a module from DEFERRED_MODULES was imported eagerly
+
+tests/test_import_time.py runs the same checks under pytest, so the budget is
+enforced with the rest of the test suite.
+
+Usage (from backend/):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 800 --runs 5 --top 20
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TARGET = "src.main"
+BUDGET_MS = 1000
+
+# Heavy SDKs that must only load once a request needs them (or in the lifespan hook)
+DEFERRED_MODULES = (
+    "langchain_core",
+    "langchain_google_genai",
+    "google.generativeai",
+    "langchain_qdrant",
+    "qdrant_client",
+    "fastembed",
+    "langchain_community",
+    "langchain_text_splitters",
+    "duckduckgo_search",
+)
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure_once(target: str) -> tuple[int, list[tuple[str, int, int]]]:
+    """Import `target` in a fresh interpreter; returns (total µs, [(module, self µs, cumulative µs)])."""
+    env = {k: v for k, v in os.environ.items() if k not in ("GEMINI_API_KEY", "GITHUB_TOKEN")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    modules, total = [], None
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = int(match.group(1)), int(match.group(2)), match.group(4)
+        modules.append((name, self_us, cumulative_us))
+        if name == target:
+            total = cumulative_us
+    if total is None:
+        raise RuntimeError(f"{target} not found in -X importtime output")
+    return total, modules
+
+
+def measure(target: str = TARGET, runs: int = 3) -> tuple[float, list[str], list]:
+    """Import `target` `runs` times; returns (median ms, eagerly imported DEFERRED_MODULES, runs sorted by total)."""
+    results = sorted((measure_once(target) for _ in range(runs)), key=lambda run: run[0])
+    imported = {name for _, mods in results for name, _, _ in mods}
+    eager = sorted(m for m in DEFERRED_MODULES if m in imported)
+    return results[len(results) // 2][0] / 1000, eager, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--target", default=TARGET)
+    args = parser.parse_args()
+
+    try:
+        median_ms, eager, runs = measure(args.target, args.runs)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    modules = runs[len(runs) // 2][1]
+
+    print(f"⏱️ import {args.target}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {runs[0][0] / 1000:.0f}, max {runs[-1][0] / 1000:.0f}), budget {args.budget_ms:.0f} ms")
+    print("\nSlowest modules (self time, median run):")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:>8.1f} ms  (cumulative {cumulative_us / 1000:>8.1f} ms)  {name}")
+
+    failed = False
+    if eager:
+        print(f"\n❌ Imported eagerly (should be deferred): {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"\n❌ Import time {median_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("\n✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Ingestion Throughput Benchmark - Synthetic repositories end to end
+
+Generates a synthetic local git repository of configurable size and language
+mix, then runs the real ingestion stages on it:
+    load_repo -> chunk_docs -> index_chunks (embed + upsert)
+
+Embeddings use the deterministic hashing stand-ins from benchmarks.fakes and
+Qdrant runs embedded (memory or on-disk local mode), so the numbers only
+depend on our loader/pipeline code and the machine.
+
+Reports time per stage, files/s, chunks/s and peak RSS after each stage.
+With --junk, the repo also gets the files the ingestion policy should skip
+(node_modules/, lock files, minified bundles, oversized fixtures) and the
+report shows what was skipped and the bytes saved.
+
+Usage (from backend/):
+    python -m benchmarks.ingestion --files 2000
+    python -m benchmarks.ingestion --files 2000 --junk 20
+    python -m benchmarks.ingestion --files 50000 --mix py=40,ts=30,md=15,json=10,css=5 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fakes import HashingEmbeddings, HashingSparseEmbeddings
+
+from src.config.settings import settings
+from src.rag import vectorstore
+from src.rag.ingest_policy import SkipReport
+from src.rag.loader import load_repo
+
+DEFAULT_MIX = "py=35,ts=25,js=10,md=10,json=10,java=5,css=5"
+WORDS = ("cache request client token repo index vector chunk query merge stream batch "
+         "config handler router result parse limit page commit issue release").split()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _ident(rng: random.Random) -> str:
+    return "_".join(rng.sample(WORDS, 2))
+
+
+def _py(rng, lines):
+    out = [f'"""Module {_ident(rng)}."""', "import os", ""]
+    while len(out) < lines:
+        name = _ident(rng)
+        out += [f"def {name}(value, limit=10):", f'    """Return the {name.replace("_", " ")}."""',
+                "    result = []", "    for i in range(limit):", "        result.append(value * i)",
+                "    return result", ""]
+    return out
+
+
+def _ts(rng, lines):
+    out = ["import { z } from 'zod';", ""]
+    while len(out) < lines:
+        name = _ident(rng)
+        out += [f"export function {name}(input: string): number {{", "  const parts = input.split(',');",
+                "  return parts.length;", "}", ""]
+    return out
+
+
+def _java(rng, lines):
+    out = ["package com.example;", "", f"public class {_ident(rng).title().replace('_', '')} {{"]
+    while len(out) < lines - 1:
+        out += [f"    public int {_ident(rng)}(int value) {{", "        return value * 2;", "    }", ""]
+    return out + ["}"]
+
+
+def _md(rng, lines):
+    out = [f"# {_ident(rng)}", ""]
+    while len(out) < lines:
+        out += [" ".join(rng.choice(WORDS) for _ in range(14)) + ".", ""]
+    return out
+
+
+def _json_file(rng, lines):
+    items = {f"{_ident(rng)}_{i}": rng.randint(0, 10_000) for i in range(max(1, lines - 2))}
+    return json.dumps(items, indent=2).splitlines()
+
+
+def _css(rng, lines):
+    out = []
+    while len(out) < lines:
+        out += [f".{_ident(rng).replace('_', '-')} {{", "  display: flex;", "  margin: 0 auto;", "}"]
+    return out
+
+
+GENERATORS = {"py": _py, "ts": _ts, "js": _ts, "java": _java, "md": _md, "json": _json_file, "css": _css}
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        ext, weight = part.split("=")
+        if ext not in GENERATORS:
+            raise ValueError(f"Unsupported extension '{ext}', choose from {sorted(GENERATORS)}")
+        weights[ext] = float(weight)
+    return weights
+
+
+def _junk_files(rng: random.Random, count: int) -> dict:
+    """Files a real repo carries that are not worth embedding: {relative path: content}."""
+    out = {}
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            pkg = f"node_modules/{_ident(rng)}_{i}"
+            out[f"{pkg}/index.js"] = "\n".join(_ts(rng, 200)) + "\n"
+        elif kind == 1:
+            deps = {f"node_modules/{_ident(rng)}_{j}": {"version": f"1.{j}.0", "resolved": "https://registry"
+                    f".npmjs.org/x/-/x-1.{j}.0.tgz", "integrity": "sha512-" + "a" * 86} for j in range(300)}
+            out[f"pkg{i}/package-lock.json"] = json.dumps({"lockfileVersion": 3, "packages": deps}, indent=2)
+        elif kind == 2:
+            out[f"static/app{i}.min.js"] = ";".join(f"var {_ident(rng)}=function(a){{return a*{j}}}"
+                                                      for j in range(1500))
+        else:
+            out[f"tests/fixtures/data{i}.json"] = json.dumps(
+                [{_ident(rng): rng.random() for _ in range(10)} for _ in range(2500)], indent=1)
+    return out
+
+
+def generate_repo(path: Path, files: int, mix: dict, avg_lines: int, seed: int, junk: int = 0) -> dict:
+    """Write a synthetic repository (plus `junk` skippable files) and commit it on branch 'main'."""
+    rng = random.Random(seed)
+    exts, weights = zip(*mix.items())
+    total_bytes = 0
+    for i in range(files):
+        ext = rng.choices(exts, weights)[0]
+        depth = rng.randint(0, 4)
+        folder = path.joinpath(*(f"pkg{rng.randint(0, 20)}" for _ in range(depth)))
+        folder.mkdir(parents=True, exist_ok=True)
+        lines = max(3, int(rng.expovariate(1 / avg_lines)))
+        content = "\n".join(GENERATORS[ext](rng, lines)) + "\n"
+        (folder / f"file_{i}.{ext}").write_text(content)
+        total_bytes += len(content)
+    for rel, content in _junk_files(rng, junk).items():
+        (path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (path / rel).write_text(content)
+        total_bytes += len(content)
+
+    git = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    subprocess.run(git + ["-C", str(path), "add", "-A"], check=True)
+    subprocess.run(git + ["-C", str(path), "commit", "-q", "-m", "synthetic"], check=True)
+    return {"files": files + junk, "bytes": total_bytes}
+
+
+def run(files: int, mix: dict, avg_lines: int, dim: int, qdrant_mode: str, seed: int, embed_latency_ms: float,
+        junk: int = 0):
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source"
+        start = time.perf_counter()
+        repo_info = generate_repo(source, files, mix, avg_lines, seed, junk)
+        generate_s = time.perf_counter() - start
+
+        settings.QDRANT_MODE = qdrant_mode
+        settings.QDRANT_PATH = os.path.join(tmp, "qdrant")
+        vectorstore._client = None
+
+        start = time.perf_counter()
+        skipped = SkipReport("synthetic")
+        docs = load_repo(str(source), repo_path=os.path.join(tmp, "clone"), report=skipped)
+        stages["load"] = {"seconds": time.perf_counter() - start, "peak_rss_mb": _peak_rss_mb()}
+
+        start = time.perf_counter()
+        chunks = vectorstore.chunk_docs(docs)
+        stages["chunk"] = {"seconds": time.perf_counter() - start, "peak_rss_mb": _peak_rss_mb()}
+
+        dense = HashingEmbeddings(dim=dim, latency=embed_latency_ms / 1000)
+        sparse = HashingSparseEmbeddings()
+        start = time.perf_counter()
+        vs = vectorstore.index_chunks(chunks, "bench-ingestion", dense=dense, sparse=sparse)
+        index_s = time.perf_counter() - start
+        embed_s = dense.seconds + sparse.seconds
+        stages["embed"] = {"seconds": embed_s, "peak_rss_mb": _peak_rss_mb()}
+        stages["upsert"] = {"seconds": index_s - embed_s, "peak_rss_mb": _peak_rss_mb()}
+        points = vs.client.count("bench-ingestion").count
+        vs.client.close()
+        vectorstore._client = None
+
+    total_s = sum(s["seconds"] for s in stages.values())
+    for stage in stages.values():
+        stage["seconds"] = round(stage["seconds"], 3)
+    return {
+        "config": {"files": files, "mix": mix, "avg_lines": avg_lines, "dim": dim,
+                   "qdrant_mode": qdrant_mode, "seed": seed, "embed_latency_ms": embed_latency_ms, "junk": junk},
+        "repo": {**repo_info, "generate_s": round(generate_s, 3)},
+        "documents": len(docs),
+        "policy": skipped.as_dict(),
+        "chunks": len(chunks),
+        "points": points,
+        "stages": stages,
+        "total_s": round(total_s, 3),
+        "files_per_s": round(len(docs) / total_s, 1) if total_s else None,
+        "chunks_per_s": round(len(chunks) / total_s, 1) if total_s else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Extension weights, e.g. py=50,md=50")
+    parser.add_argument("--avg-lines", type=int, default=80)
+    parser.add_argument("--dim", type=int, default=3072)
+    parser.add_argument("--qdrant-mode", choices=["memory", "local"], default="memory")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated latency per embed batch")
+    parser.add_argument("--junk", type=int, default=0,
+                        help="Extra vendored/lock/minified/fixture files the ingestion policy should skip")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run(args.files, parse_mix(args.mix), args.avg_lines, args.dim,
+                 args.qdrant_mode, args.seed, args.embed_latency_ms, args.junk)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nRepo: {report['repo']['files']} files, {report['repo']['bytes'] / 1e6:.1f} MB "
+          f"-> {report['documents']} documents, {report['chunks']} chunks")
+    policy = report["policy"]
+    if policy["skipped_files"]:
+        reasons = ", ".join(f"{r['files']} {reason}" for reason, r in policy["by_reason"].items())
+        print(f"Skipped {policy['skipped_files']} files, {policy['bytes_saved'] / 1e6:.1f} MB not embedded ({reasons})")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<7} {stage['seconds']:>9.2f}s   peak RSS {stage['peak_rss_mb']:>8.1f} MB")
+    print(f"Total {report['total_s']:.2f}s | {report['files_per_s']} files/s | "
+          f"{report['chunks_per_s']} chunks/s | peak RSS {report['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Load Test - Concurrent /chat traffic against the ASGI app, fully offline
+
+Drives src.main:app in-process through httpx.ASGITransport (lifespan
+included), with:
+- FakeChatModel for the classifier, synthesizer and RAG answers
+- GitHubReplayTransport for the GitHub API, SearxNGStandIn for web search
+- an in-memory (or local on-disk) Qdrant seeded with synthetic chunks and
+  hashing embeddings for RAG questions
+
+Closed-loop model: `--concurrency` virtual users each send /chat requests
+back to back for `--duration` seconds. Several concurrency levels run one
+after the other, so the report shows where throughput stops growing and
+latency collapses. For every level it reports throughput, p50/p95/p99
+latency and error rate, per query kind and per `--window` seconds over time,
+plus tool/search cache hit rates and GitHub calls per request.
+
+Caches are cleared before each level (unless --keep-caches) so levels are
+comparable; --repos controls how many distinct repos GitHub queries spread
+over, and so how often they hit the tool cache.
+
+Usage (from backend/):
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --concurrency 1 8 32 64 --duration 20 --mix github=70,search=20,rag=10
+    python -m benchmarks.load_test --github-latency-ms 80 --llm-latency-ms 400 --output load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+# Must be set before src.config.settings is imported
+os.environ.setdefault("QDRANT_MODE", "memory")
+os.environ.setdefault("SEARCH_PROVIDERS", "searxng")
+os.environ.setdefault("WARM_ENABLED", "false")
+
+import anyio  # noqa: E402
+import httpx  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeChatModel,
+    GitHubReplayTransport,
+    HashingEmbeddings,
+    HashingSparseEmbeddings,
+    SearxNGStandIn,
+)
+
+from src.agents import router  # noqa: E402
+from src.agents.classifier import QueryClassifier, set_classifier  # noqa: E402
+from src.agents.github_agent import GitHubAgent, set_agent  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+from src.main import app  # noqa: E402
+from src.rag import embedding, rag_chain, vectorstore  # noqa: E402
+from src.rag.embedding_cache import get_embedding_cache  # noqa: E402
+from src.tools import github_api, search  # noqa: E402
+from src.tools.cache import tool_cache  # noqa: E402
+
+DEFAULT_MIX = "github=70,search=20,rag=10"
+RAG_REPO = "loadtest/rag-target"
+
+QUERIES = {
+    "github": [
+        "How many open PRs are in {repo}?",
+        "How many stars does {repo} have?",
+        "Who are the top contributors to {repo}?",
+        "Show me latest commits for {repo}",
+        "Issue stats for {repo}",
+        "What languages are used in {repo}?",
+        "What is the latest release of {repo}?",
+        "Give me an overview of {repo}",
+    ],
+    # No repo and none of the fake classifier's GitHub keywords -> SEARCH
+    "search": [
+        "latest news on rust async runtimes {n}",
+        "best vector database for small teams {n}",
+        "what is retrieval augmented generation {n}",
+        "fastapi vs flask benchmarks {n}",
+    ],
+    "rag": [
+        "How does the request router work in {repo}?",
+        "Explain the ingestion pipeline of {repo}",
+        "Where is the result cache defined in {repo}?",
+    ],
+}
+
+WORDS = ("cache request client token repo index vector chunk query merge stream batch "
+         "config handler router result parse limit page commit issue release").split()
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        kind, weight = part.split("=")
+        if kind not in QUERIES:
+            raise ValueError(f"Unsupported query kind '{kind}', choose from {sorted(QUERIES)}")
+        weights[kind] = float(weight)
+    return weights
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _latency_stats(latencies_s: list[float]) -> dict:
+    values = sorted(seconds * 1000 for seconds in latencies_s)
+    return {
+        "p50_ms": round(_percentile(values, 50), 1) if values else None,
+        "p95_ms": round(_percentile(values, 95), 1) if values else None,
+        "p99_ms": round(_percentile(values, 99), 1) if values else None,
+        "mean_ms": round(statistics.fmean(values), 1) if values else None,
+    }
+
+
+def _counter(cache: str, result: str) -> float:
+    return REGISTRY.get_sample_value("github_assistant_cache_requests_total",
+                                     {"cache": cache, "result": result}) or 0.0
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Offline environment ------------------------------------------------------
+
+def setup(args) -> dict:
+    """Wire fakes into the app; returns the transports (for call counts)."""
+    llm = FakeChatModel(latency=args.llm_latency_ms / 1000)
+    set_classifier(QueryClassifier(llm=llm))
+    set_agent(GitHubAgent(llm=llm))
+    rag_chain.set_rag_llm(llm)
+
+    github = GitHubReplayTransport(latency=args.github_latency_ms / 1000)
+    github_api.set_transport(github)
+    searxng = SearxNGStandIn(latency={"*": args.search_latency_ms / 1000})
+    search.set_transport(searxng)
+
+    settings.QDRANT_MODE = args.qdrant_mode
+    if args.qdrant_mode == "local":
+        settings.QDRANT_PATH = tempfile.mkdtemp(prefix="loadtest-qdrant-")
+    vectorstore._client = None
+    embedding.set_embeddings(HashingEmbeddings(dim=args.dim, latency=args.embed_latency_ms / 1000),
+                             HashingSparseEmbeddings())
+    seed_rag_repo(args.rag_chunks, args.seed)
+    return {"github": github, "searxng": searxng}
+
+
+def teardown() -> None:
+    set_classifier(None)
+    set_agent(None)
+    rag_chain.set_rag_llm(None)
+    embedding.set_embeddings(None, None)
+    github_api.set_transport(None)
+    search.set_transport(None)
+
+
+def seed_rag_repo(chunks: int, seed: int) -> None:
+    """Index synthetic chunks for RAG_REPO and mark it ingested, so RAG queries never clone."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(chunks):
+        body = " ".join(rng.choice(WORDS) for _ in range(120))
+        docs.append(Document(page_content=f"def handler_{i}():\n    # {body}\n", metadata={
+            "source": f"src/module_{i % 40}.py", "repo": RAG_REPO, "start_index": 0,
+        }))
+    vectorstore.index_chunks(docs)
+    router.ingested_repos.add(RAG_REPO)
+
+
+# --- Load generation ------------------------------------------------------------
+
+class QueryMix:
+    """Draws (kind, query) pairs according to the mix weights."""
+
+    def __init__(self, weights: dict, repos: int, search_variants: int, seed: int):
+        self.kinds, self.weights = zip(*weights.items())
+        self.repos = [f"loadtest/repo-{i}" for i in range(repos)]
+        self.search_variants = search_variants
+        self.rng = random.Random(seed)
+
+    def draw(self) -> tuple[str, str]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        template = self.rng.choice(QUERIES[kind])
+        repo = RAG_REPO if kind == "rag" else self.rng.choice(self.repos)
+        return kind, template.format(repo=repo, n=self.rng.randrange(self.search_variants))
+
+
+async def _user(client: httpx.AsyncClient, mix: QueryMix, stop_at: float, t0: float,
+                think_s: float, samples: list) -> None:
+    while time.perf_counter() < stop_at:
+        kind, query = mix.draw()
+        start = time.perf_counter()
+        try:
+            response = await client.post("/chat", json={"query": query})
+            status = response.status_code
+        except Exception as e:
+            status = type(e).__name__
+        end = time.perf_counter()
+        samples.append({"t": end - t0, "latency": end - start, "kind": kind, "ok": status == 200,
+                        "status": status})
+        if think_s:
+            await asyncio.sleep(think_s)
+
+
+def _summarize(samples: list, elapsed: float) -> dict:
+    errors = sum(not s["ok"] for s in samples)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        **_latency_stats([s["latency"] for s in samples if s["ok"]]),
+    }
+
+
+def _timeline(samples: list, window: float, duration: float) -> list:
+    buckets = defaultdict(list)
+    for s in samples:
+        buckets[int(s["t"] // window)].append(s)
+    rows = []
+    for index in range(int(duration // window) + 1):
+        bucket = buckets.get(index, [])
+        if not bucket and index * window >= duration:
+            break
+        rows.append({"t_s": round((index + 1) * window, 2), **_summarize(bucket, window)})
+    return rows
+
+
+async def run_level(client, concurrency: int, args, mix: QueryMix, transports: dict) -> dict:
+    if not args.keep_caches:
+        tool_cache.clear()
+        get_embedding_cache().clear()
+        if search.get_search_backend().cache is not None:
+            search.get_search_backend().cache.clear()
+
+    # The app logs every request; printing from dozens of threads skews the numbers
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else io.StringIO()):
+        # Warm-up traffic is not measured
+        if args.warmup:
+            await asyncio.gather(*(_user(client, mix, time.perf_counter() + args.warmup, time.perf_counter(),
+                                         args.think_ms / 1000, []) for _ in range(concurrency)))
+
+        cache_before = {name: (_counter(name, "hit"), _counter(name, "miss"))
+                        for name in ("tool_result", "web_search", "query_embedding_dense")}
+        github_before = transports["github"].total_calls
+
+        samples: list = []
+        t0 = time.perf_counter()
+        stop_at = t0 + args.duration
+        await asyncio.gather(*(_user(client, mix, stop_at, t0, args.think_ms / 1000, samples)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+    hit_rates = {}
+    for name, (hits_before, misses_before) in cache_before.items():
+        hits = _counter(name, "hit") - hits_before
+        misses = _counter(name, "miss") - misses_before
+        hit_rates[name] = round(hits / (hits + misses), 3) if hits + misses else None
+
+    by_kind = defaultdict(list)
+    for s in samples:
+        by_kind[s["kind"]].append(s)
+    statuses = defaultdict(int)
+    for s in samples:
+        if not s["ok"]:
+            statuses[str(s["status"])] += 1
+
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        **_summarize(samples, elapsed),
+        "errors_by_status": dict(statuses),
+        "by_kind": {kind: _summarize(items, elapsed) for kind, items in sorted(by_kind.items())},
+        "cache_hit_rate": hit_rates,
+        "github_calls_per_request": round((transports["github"].total_calls - github_before) / len(samples), 2)
+        if samples else None,
+        "timeline": _timeline(samples, args.window, args.duration),
+    }
+
+
+async def run(args) -> dict:
+    transports = setup(args)
+    mix = QueryMix(parse_mix(args.mix), args.repos, args.search_variants, args.seed)
+    levels = []
+    try:
+        async with app.router.lifespan_context(app):
+            # Sync endpoints run on anyio's thread pool (40 threads by default, as under uvicorn)
+            if args.threads:
+                anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                         timeout=args.timeout) as client:
+                for concurrency in args.concurrency:
+                    print(f"🚦 {concurrency} concurrent users for {args.duration:.0f}s...")
+                    levels.append(await run_level(client, concurrency, args, mix, transports))
+    finally:
+        teardown()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "state_backend": settings.STATE_BACKEND,
+            "args": vars(args),
+        },
+        "levels": levels,
+    }
+
+
+def _fmt(value, width: int = 8, digits: int = 1) -> str:
+    return f"{value:>{width}.{digits}f}" if value is not None else f"{'-':>{width}}"
+
+
+def print_report(report: dict, show_timeline: bool) -> None:
+    print(f"\n{'users':>5} {'req':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6} "
+          f"{'tool hit':>8} {'search hit':>10} {'embed hit':>9} {'gh/req':>6}")
+    for level in report["levels"]:
+        hits = level["cache_hit_rate"]
+        print(f"{level['concurrency']:>5} {level['requests']:>7} {_fmt(level['throughput_rps'])} "
+              f"{_fmt(level['p50_ms'])} {_fmt(level['p95_ms'])} {_fmt(level['p99_ms'])} "
+              f"{level['error_rate'] * 100:>6.1f} {_fmt(hits['tool_result'], 8, 2)} "
+              f"{_fmt(hits['web_search'], 10, 2)} {_fmt(hits['query_embedding_dense'], 9, 2)} "
+              f"{_fmt(level['github_calls_per_request'], 6, 2)}")
+        for kind, stats in level["by_kind"].items():
+            print(f"{'':>5} {kind:>7} {_fmt(stats['throughput_rps'])} {_fmt(stats['p50_ms'])} "
+                  f"{_fmt(stats['p95_ms'])} {_fmt(stats['p99_ms'])} {stats['error_rate'] * 100:>6.1f}")
+        if level["errors_by_status"]:
+            print(f"{'':>5} errors: {level['errors_by_status']}")
+
+    if not show_timeline:
+        return
+    for level in report["levels"]:
+        print(f"\n⏱️ Timeline at {level['concurrency']} users")
+        print(f"{'t s':>6} {'req':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err %':>6}")
+        for row in level["timeline"]:
+            print(f"{row['t_s']:>6.1f} {row['requests']:>6} {_fmt(row['throughput_rps'])} "
+                  f"{_fmt(row['p50_ms'])} {_fmt(row['p95_ms'])} {_fmt(row['p99_ms'])} "
+                  f"{row['error_rate'] * 100:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each level")
+    parser.add_argument("--window", type=float, default=1, help="Timeline bucket size in seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Query kind weights, e.g. github=50,search=30,rag=20")
+    parser.add_argument("--repos", type=int, default=20, help="Distinct repos GitHub queries spread over")
+    parser.add_argument("--search-variants", type=int, default=50, help="Distinct search queries per template")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause between a user's requests")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--github-latency-ms", type=float, default=60)
+    parser.add_argument("--search-latency-ms", type=float, default=150)
+    parser.add_argument("--embed-latency-ms", type=float, default=40)
+    parser.add_argument("--qdrant-mode", choices=["memory", "local"], default="memory")
+    parser.add_argument("--rag-chunks", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--threads", type=int, help="Size of the endpoint thread pool (default: anyio's 40)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument("--keep-caches", action="store_true", help="Don't clear caches between levels")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeline", action="store_true", help="Also print the per-window timeline")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own logging during the run")
+    parser.add_argument("--output", help="Write the full report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report, args.timeline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Qdrant Mode Benchmark - Local (embedded) vs server retrieval latency
+
+Builds a hybrid collection (dense + sparse, same layout as ingestion) filled
+with random vectors and times hybrid queries in each QDRANT_MODE:
+- memory: QdrantClient(":memory:")
+- local:  QdrantClient(path=...) in a temp directory
+- server: QdrantClient(url=QDRANT_URL), skipped when unreachable
+
+No embedding model or API key is needed.
+
+Usage (from backend/):
+    python -m benchmarks.qdrant_modes
+    python -m benchmarks.qdrant_modes --sizes 1000 10000 50000 --dim 3072 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from qdrant_client import QdrantClient, models
+
+DENSE_VECTOR_NAME = ""
+SPARSE_VECTOR_NAME = "langchain-sparse"
+COLLECTION = "bench-qdrant-modes"
+
+
+def _random_dense(rng: random.Random, dim: int):
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+def _random_sparse(rng: random.Random, terms: int = 30, vocab: int = 50_000):
+    indices = sorted(rng.sample(range(vocab), terms))
+    return models.SparseVector(indices=indices, values=[rng.random() for _ in indices])
+
+
+def _fill(client: QdrantClient, size: int, dim: int, seed: int, batch: int = 256) -> float:
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config={DENSE_VECTOR_NAME: models.VectorParams(size=dim, distance=models.Distance.COSINE)},
+        sparse_vectors_config={SPARSE_VECTOR_NAME: models.SparseVectorParams(index=models.SparseIndexParams(on_disk=False))},
+    )
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for offset in range(0, size, batch):
+        points = [
+            models.PointStruct(
+                id=i,
+                vector={DENSE_VECTOR_NAME: _random_dense(rng, dim), SPARSE_VECTOR_NAME: _random_sparse(rng)},
+                payload={"page_content": f"chunk {i}", "metadata": {"source": f"file_{i % 500}.py"}},
+            )
+            for i in range(offset, min(offset + batch, size))
+        ]
+        client.upsert(COLLECTION, points=points, wait=True)
+    return time.perf_counter() - start
+
+
+def _query(client: QdrantClient, dense, sparse, k: int = 10):
+    # Same shape as langchain-qdrant's HYBRID retrieval: two prefetches fused with RRF
+    return client.query_points(
+        COLLECTION,
+        prefetch=[
+            models.Prefetch(using=DENSE_VECTOR_NAME, query=dense, limit=k),
+            models.Prefetch(using=SPARSE_VECTOR_NAME, query=sparse, limit=k),
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        limit=k,
+        with_payload=True,
+    )
+
+
+def bench_mode(name: str, client: QdrantClient, size: int, dim: int, queries: int, seed: int):
+    upsert_s = _fill(client, size, dim, seed)
+    rng = random.Random(seed + 1)
+    probes = [(_random_dense(rng, dim), _random_sparse(rng)) for _ in range(queries)]
+
+    _query(client, *probes[0])  # warm-up
+    latencies = []
+    for dense, sparse in probes:
+        start = time.perf_counter()
+        _query(client, dense, sparse)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    client.delete_collection(COLLECTION)
+    latencies.sort()
+    return {
+        "mode": name,
+        "size": size,
+        "dim": dim,
+        "upsert_s": round(upsert_s, 3),
+        "query_p50_ms": round(statistics.median(latencies), 3),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "query_mean_ms": round(statistics.fmean(latencies), 3),
+    }
+
+
+def _server_client():
+    url = os.getenv("QDRANT_URL", "http://localhost:6333")
+    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY"), timeout=5)
+    try:
+        client.get_collections()
+    except Exception as e:
+        print(f"⚠️ Skipping server mode, {url} unreachable: {e}")
+        return None
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--dim", type=int, default=3072, help="Dense dimension (gemini-embedding-001 = 3072)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", default=["memory", "local", "server"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        clients = {}
+        if "memory" in args.modes:
+            clients["memory"] = QdrantClient(location=":memory:")
+        if "local" in args.modes:
+            clients["local"] = QdrantClient(path=os.path.join(tmp, "qdrant"))
+        if "server" in args.modes:
+            server = _server_client()
+            if server:
+                clients["server"] = server
+
+        for size in args.sizes:
+            for name, client in clients.items():
+                rows.append(bench_mode(name, client, size, args.dim, args.queries, args.seed))
+                if not args.json:
+                    r = rows[-1]
+                    print(f"{r['mode']:<7} size={r['size']:<7} upsert={r['upsert_s']:>8.2f}s "
+                          f"p50={r['query_p50_ms']:>8.2f}ms p95={r['query_p95_ms']:>8.2f}ms")
+
+        for client in clients.values():
+            client.close()
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
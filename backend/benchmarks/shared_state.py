@@ -0,0 +1,140 @@
+"""
+Shared State Benchmark - Several workers, one ingestion per repo
+
+Starts N worker processes (like `uvicorn --workers N`) that all ask for the
+same repos at once, with ingestion replaced by a sleep so nothing is cloned
+or embedded. Runs once per backend:
+
+- memory: every process has its own registry -> each repo is ingested N times
+- redis: the RESP stand-in (scripts/resp_server.py) is shared -> once per repo
+
+Also checks what another process sees afterwards: the GitHub rate-limit
+budget reported by the workers, and the tool results they cached.
+
+Needs the redis package for the redis run (pip install redis).
+
+Usage (from backend/):
+    python -m benchmarks.shared_state
+    python -m benchmarks.shared_state --workers 8 --repos 20 --ingest-ms 200
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import types
+
+RATE_LIMIT_RESET = 4_102_444_800  # 2100-01-01, so the budget never expires mid-run
+
+
+def _worker(backend: str, url: str, repos: list[str], ingest_s: float, worker_id: int) -> dict:
+    """One 'uvicorn worker': configure the backend, then race the others for every repo."""
+    os.environ["STATE_BACKEND"] = backend
+    os.environ["REDIS_URL"] = url
+
+    # Ingestion stand-in: sleep instead of clone + embed + upsert
+    runs = []
+
+    def ingest_repo_to_vectorstore(repo_url, repo=None, replace=False):
+        time.sleep(ingest_s)
+        runs.append(repo_url)
+
+    fake_vectorstore = types.ModuleType("src.rag.vectorstore")
+    fake_vectorstore.ingest_repo_to_vectorstore = ingest_repo_to_vectorstore
+    sys.modules["src.rag.vectorstore"] = fake_vectorstore
+
+    import httpx
+    from src.agents import router
+    from src.tools import github_api
+    from src.tools.cache import tool_cache
+
+    router.get_head_sha = lambda repo: "0" * 40
+    order = list(repos)
+    random.Random(worker_id).shuffle(order)
+
+    start = time.perf_counter()
+    for repo in order:
+        router.ensure_ingested(repo)
+        tool_cache.set("GITHUB_STATS", repo, f"stats of {repo} from worker {worker_id}")
+    elapsed = time.perf_counter() - start
+
+    # Each worker reports a different remaining count for the same window
+    github_api._check_rate_limit(httpx.Response(200, headers={
+        "X-RateLimit-Remaining": str(5000 - 10 * (worker_id + 1)),
+        "X-RateLimit-Reset": str(RATE_LIMIT_RESET),
+    }))
+    return {"ingestions": len(runs), "seconds": elapsed}
+
+
+def _observer(backend: str, url: str, repos: list[str]) -> dict:
+    """A fresh process on the same backend: what does it see?"""
+    os.environ["STATE_BACKEND"] = backend
+    os.environ["REDIS_URL"] = url
+    from src.agents import router
+    from src.tools import github_api
+    from src.tools.cache import tool_cache
+    return {
+        "registered": sum(repo in router.ingested_repos for repo in repos),
+        "cached": sum(tool_cache.get("GITHUB_STATS", repo) is not None for repo in repos),
+        "budget": github_api._remaining_request_budget(),
+    }
+
+
+def run_backend(backend: str, url: str, args) -> dict:
+    repos = [f"bench-org/repo-{i}" for i in range(args.repos)]
+    ctx = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with ctx.Pool(args.workers) as pool:
+        results = pool.starmap(_worker, [(backend, url, repos, args.ingest_ms / 1000, i)
+                                         for i in range(args.workers)])
+    wall = time.perf_counter() - start
+    with ctx.Pool(1) as pool:
+        seen = pool.apply(_observer, (backend, url, repos))
+    return {
+        "backend": backend,
+        "workers": args.workers,
+        "repos": args.repos,
+        "ingestions": sum(r["ingestions"] for r in results),
+        "wall_s": round(wall, 2),
+        "slowest_worker_s": round(max(r["seconds"] for r in results), 2),
+        "observer_registered": seen["registered"],
+        "observer_cached": seen["cached"],
+        "observer_budget": seen["budget"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repos", type=int, default=10)
+    parser.add_argument("--ingest-ms", type=float, default=100)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from scripts.resp_server import start_server
+
+    rows = [run_backend("memory", "", args)]
+    server, url = start_server()
+    try:
+        rows.append(run_backend("redis", url, args))
+    finally:
+        server.shutdown()
+
+    print(f"{'backend':<8} {'workers':>7} {'repos':>6} {'ingestions':>11} {'wall s':>7} "
+          f"{'seen: registered':>17} {'cached':>7} {'budget':>7}")
+    for row in rows:
+        print(f"{row['backend']:<8} {row['workers']:>7} {row['repos']:>6} {row['ingestions']:>11} "
+              f"{row['wall_s']:>7.2f} {row['observer_registered']:>17} {row['observer_cached']:>7} "
+              f"{str(row['observer_budget']):>7}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+        print(f"\n📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Tool Payload Benchmark - Synthesizer prompt tokens before/after compact payloads
+
+For every router action, runs the tool offline (recorded GitHub responses,
+SearxNG stand-in for SEARCH) and compares what ends up in the synthesizer
+prompt:
+
+- before: the markdown the tools used to return (render_markdown), or the
+  stringified list of dicts web_search used to return
+- after: the compact serialization (to_prompt)
+
+Tokens are estimated with src.rag.context.estimate_tokens, for the tool
+payload alone and for the full synthesizer prompt.
+
+Usage (from backend/):
+    python -m benchmarks.tool_payloads
+    python -m benchmarks.tool_payloads --output payloads.json
+"""
+
+import argparse
+import json
+
+from benchmarks.fakes import FakeChatModel, GitHubReplayTransport, SearxNGStandIn
+
+from src.agents import router
+from src.agents.github_agent import GitHubAgent
+from src.rag.context import estimate_tokens
+from src.tools import github_api, search
+from src.tools.render import render_markdown, to_prompt
+from src.tools.search_providers import SearxNGProvider
+from src.utils.aio import run_sync
+
+REPO = "vercel/next.js"
+COMPARE_REPOS = ["facebook/react", "vuejs/core", "sveltejs/svelte"]
+QUERY = "Tell me about this repository"
+
+
+def _legacy_search_payload(result) -> str:
+    """What web_search used to hand the synthesizer: str() of a list of dicts."""
+    return str([{"title": h.title, "url": h.url, "content": h.content} for h in result.hits])
+
+
+def measure(agent, name, before: str, after: str) -> dict:
+    prompt_before = agent.synthesizer_prompt.format(query=QUERY, tool_output=before, history="(none)")
+    prompt_after = agent.synthesizer_prompt.format(query=QUERY, tool_output=after, history="(none)")
+    payload_before, payload_after = estimate_tokens(before), estimate_tokens(after)
+    total_before, total_after = estimate_tokens(prompt_before), estimate_tokens(prompt_after)
+    return {
+        "action": name,
+        "payload_tokens_before": payload_before,
+        "payload_tokens_after": payload_after,
+        "prompt_tokens_before": total_before,
+        "prompt_tokens_after": total_after,
+        "prompt_reduction_pct": round((1 - total_after / total_before) * 100, 1),
+    }
+
+
+def run():
+    agent = GitHubAgent(llm=FakeChatModel())
+    github_api.set_transport(GitHubReplayTransport())
+    search.set_transport(SearxNGStandIn())
+    backend = search.SearchBackend(providers=[SearxNGProvider("http://searx.test")],
+                                   deadline=5, hedge_delay=1)
+
+    rows = []
+    try:
+        for action, handler in router.GITHUB_ACTION_MAP.items():
+            result = handler(REPO)
+            rows.append(measure(agent, action, render_markdown(result), to_prompt(result)))
+
+        for action in ("GITHUB_STATS", "GITHUB_OVERVIEW"):
+            result = router.compare_repositories(action, COMPARE_REPOS)
+            rows.append(measure(agent, f"compare.{action}", render_markdown(result), to_prompt(result)))
+
+        result = run_sync(backend.search("nextjs app router caching", num_results=5))
+        rows.append(measure(agent, "SEARCH", _legacy_search_payload(result), to_prompt(result)))
+    finally:
+        github_api.set_transport(None)
+        search.set_transport(None)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run()
+    print(f"{'action':<26} {'payload before':>14} {'after':>6} {'prompt before':>14} {'after':>6} {'saved':>7}")
+    for row in rows:
+        print(f"{row['action']:<26} {row['payload_tokens_before']:>14} {row['payload_tokens_after']:>6} "
+              f"{row['prompt_tokens_before']:>14} {row['prompt_tokens_after']:>6} "
+              f"{row['prompt_reduction_pct']:>6.1f}%")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": rows}, f, indent=2)
+        print(f"\n📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Web Search Benchmark - Deadline, hedging, caching and page fetching offline
+
+Runs src/tools/search.SearchBackend against local SearxNG stand-ins
+(benchmarks.fakes.SearxNGStandIn), so nothing touches the network.
+
+Scenarios:
+- cold: first search through the preferred (fast) provider
+- cached: the same query again, differently cased/spaced (served from the TTL cache)
+- hedged: the preferred provider is slow, the backup answers after the hedge delay
+- failover: the preferred provider returns 503, the backup answers immediately
+- deadline: every provider is slower than the deadline
+- pages: top results fetched concurrently and trimmed
+
+Usage (from backend/):
+    python -m benchmarks.web_search
+    python -m benchmarks.web_search --slow-ms 2000 --hedge-ms 200 --deadline-ms 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.fakes import SearxNGStandIn
+
+from src.tools import search
+from src.tools.cache import ToolResultCache
+from src.tools.results import ToolError
+from src.tools.search_providers import SearxNGProvider
+
+PRIMARY = "http://searx-primary.test"
+BACKUP = "http://searx-backup.test"
+
+
+def _backend(args, fetch_pages=0):
+    return search.SearchBackend(
+        providers=[SearxNGProvider(PRIMARY), SearxNGProvider(BACKUP)],
+        deadline=args.deadline_ms / 1000,
+        hedge_delay=args.hedge_ms / 1000,
+        cache=ToolResultCache(ttl=600, max_entries=100, name="web_search"),
+        fetch_pages=fetch_pages,
+        page_chars=args.page_chars,
+    )
+
+
+async def _timed(name, backend, query, transport):
+    calls_before = sum(transport.calls.values())
+    start = time.perf_counter()
+    result = await backend.search(query, num_results=5)
+    ms = (time.perf_counter() - start) * 1000
+    failed = isinstance(result, ToolError)
+    hits = () if failed else result.hits
+    return {
+        "scenario": name,
+        "ms": round(ms, 1),
+        "http_calls": sum(transport.calls.values()) - calls_before,
+        "results": len(hits),
+        "answered_by": None if failed else hits[0].title.rsplit("(", 1)[-1].rstrip(")") if hits else None,
+        "error": result.message if failed else None,
+        "page_chars": sum(len(h.page_content or "") for h in hits),
+    }
+
+
+async def run(args):
+    fast, slow = args.fast_ms / 1000, args.slow_ms / 1000
+    rows = []
+
+    transport = SearxNGStandIn(latency={"*": fast})
+    search.set_transport(transport)
+    backend = _backend(args)
+    rows.append(await _timed("cold", backend, "fastapi lifespan events", transport))
+    rows.append(await _timed("cached", backend, "  FastAPI   Lifespan events? ", transport))
+
+    transport = SearxNGStandIn(latency={"searx-primary.test": slow, "*": fast})
+    search.set_transport(transport)
+    rows.append(await _timed("hedged", _backend(args), "qdrant hybrid search", transport))
+
+    transport = SearxNGStandIn(latency={"*": fast}, failing_hosts={"searx-primary.test"})
+    search.set_transport(transport)
+    rows.append(await _timed("failover", _backend(args), "langchain runnables", transport))
+
+    transport = SearxNGStandIn(latency={"*": args.deadline_ms / 1000 * 2})
+    search.set_transport(transport)
+    rows.append(await _timed("deadline", _backend(args), "slow everywhere", transport))
+
+    transport = SearxNGStandIn(latency={"*": fast})
+    search.set_transport(transport)
+    rows.append(await _timed("pages", _backend(args, fetch_pages=args.pages), "httpx async client", transport))
+
+    search.set_transport(None)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fast-ms", type=float, default=50)
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    parser.add_argument("--hedge-ms", type=float, default=300)
+    parser.add_argument("--deadline-ms", type=float, default=1500)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-chars", type=int, default=2000)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args))
+    print(f"{'scenario':<10} {'ms':>8} {'calls':>6} {'results':>8} {'page chars':>11}  answered by / error")
+    for row in rows:
+        print(f"{row['scenario']:<10} {row['ms']:>8.1f} {row['http_calls']:>6} {row['results']:>8} "
+              f"{row['page_chars']:>11}  {row['error'] or row['answered_by']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+        print(f"\n📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
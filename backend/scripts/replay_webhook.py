@@ -0,0 +1,74 @@
+"""
+Replay recorded GitHub webhook payloads against /webhooks/github
+
+Signs each payload with GITHUB_WEBHOOK_SECRET (X-Hub-Signature-256) exactly
+like GitHub does, then posts it either to a running server or in-process
+through FastAPI's TestClient.
+
+Usage (from backend/):
+    GITHUB_WEBHOOK_SECRET=dev python -m scripts.replay_webhook push
+    GITHUB_WEBHOOK_SECRET=dev python -m scripts.replay_webhook push issues release --in-process
+    python -m scripts.replay_webhook push --url https://my-host/webhooks/github --secret dev
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import uuid
+from pathlib import Path
+
+import httpx
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "webhooks"
+
+
+def sign(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def build_request(event: str, secret: str, repo: str | None = None):
+    payload = json.loads((FIXTURES_DIR / f"{event}.json").read_text())
+    if repo:
+        payload["repository"]["full_name"] = repo
+        payload["repository"]["name"] = repo.split("/", 1)[1]
+    body = json.dumps(payload).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "X-GitHub-Event": event,
+        "X-GitHub-Delivery": str(uuid.uuid4()),
+        "X-Hub-Signature-256": sign(body, secret),
+    }
+    return body, headers
+
+
+def main():
+    events = sorted(p.stem for p in FIXTURES_DIR.glob("*.json"))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("events", nargs="+", choices=events)
+    parser.add_argument("--url", default="http://localhost:8000/webhooks/github")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET"))
+    parser.add_argument("--repo", help="Override repository.full_name in the payload")
+    parser.add_argument("--in-process", action="store_true", help="Call the app via TestClient instead of HTTP")
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error("--secret or GITHUB_WEBHOOK_SECRET is required")
+
+    if args.in_process:
+        os.environ["GITHUB_WEBHOOK_SECRET"] = args.secret
+        from fastapi.testclient import TestClient
+        from src.main import app
+        client, url = TestClient(app), "/webhooks/github"
+    else:
+        client, url = httpx.Client(timeout=10), args.url
+
+    for event in args.events:
+        body, headers = build_request(event, args.secret, args.repo)
+        response = client.post(url, content=body, headers=headers)
+        print(f"{event:<13} -> {response.status_code} {response.text}")
+
+
+if __name__ == "__main__":
+    main()
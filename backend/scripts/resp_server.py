@@ -0,0 +1,275 @@
+"""
+RESP Stand-in Server - A tiny Redis-protocol server for local runs and benchmarks
+
+Speaks enough RESP2 for src/state/redis_backend.RedisState (and redis-cli):
+PING, ECHO, SELECT, CLIENT, GET, SET [EX|PX] [NX|XX], DEL, EXISTS, EXPIRE,
+PEXPIRE, TTL, PTTL, KEYS, DBSIZE, FLUSHDB/FLUSHALL, SADD, SREM, SISMEMBER,
+SMEMBERS, SCARD, HSET, HGET, HDEL, HGETALL, and EVAL of the lock-release
+and rate-limit scripts. Data lives in a src.state.memory.MemoryState, nothing is persisted.
+
+Not a Redis replacement: one process, no persistence, no replication. Use it
+to try STATE_BACKEND=redis with several workers without installing Redis.
+
+Usage (from backend/):
+    python -m scripts.resp_server --port 6390
+    STATE_BACKEND=redis REDIS_URL=redis://127.0.0.1:6390/0 uvicorn src.main:app --workers 4
+
+In-process (benchmarks):
+    server, url = start_server()
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import fnmatch
+import socketserver
+import threading
+
+from src.state.memory import MemoryState
+from src.state.redis_backend import COMPARE_AND_DELETE, LOWER_BUDGET
+
+
+class RespError(Exception):
+    """Sent to the client as a RESP error ('-ERR ...')."""
+
+
+def encode(value) -> bytes:
+    """Encode a Python value as a RESP2 reply."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, bool):
+        return f":{int(value)}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, (bytes, bytearray)):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, (list, tuple, set)):
+        return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+    raise TypeError(f"Can't encode {type(value).__name__}")
+
+
+def read_command(rfile) -> list[bytes] | None:
+    """Read one command (RESP array of bulk strings, or an inline command). None on EOF."""
+    line = rfile.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = rfile.readline()
+        if not header.startswith(b"$"):
+            raise RespError("ERR Protocol error: expected bulk string")
+        length = int(header[1:])
+        args.append(rfile.read(length + 2)[:-2])
+    return args
+
+
+class CommandHandler:
+    """Executes commands against a MemoryState."""
+
+    def __init__(self, state: MemoryState):
+        self.state = state
+
+    def execute(self, args: list[bytes]):
+        if not args:
+            return RespError("ERR empty command")
+        name, *rest = args
+        method = getattr(self, f"cmd_{name.decode().lower()}", None)
+        if method is None:
+            return RespError(f"ERR unknown command '{name.decode()}'")
+        try:
+            return method(*rest)
+        except TypeError as e:
+            if "holds a" in str(e):
+                return RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+            return RespError(f"ERR wrong number of arguments for '{name.decode().lower()}' command")
+        except (ValueError, IndexError):
+            return RespError("ERR syntax error")
+        except RespError as e:
+            return e
+
+    # --- Connection ---------------------------------------------------------
+
+    def cmd_ping(self, message: bytes = None):
+        return message if message is not None else "PONG"
+
+    def cmd_echo(self, message: bytes):
+        return message
+
+    def cmd_select(self, db: bytes):
+        return "OK"
+
+    def cmd_hello(self, *args):
+        return RespError("NOPROTO this stand-in only speaks RESP2")
+
+    def cmd_client(self, *args):
+        # redis-py sends CLIENT SETINFO on connect
+        return "OK"
+
+    # --- Keys ---------------------------------------------------------------
+
+    def cmd_get(self, key: bytes):
+        return self.state.get(key.decode())
+
+    def cmd_set(self, key: bytes, value: bytes, *options: bytes):
+        ttl, nx, xx = None, False, False
+        opts = [o.upper() for o in options]
+        i = 0
+        while i < len(opts):
+            if opts[i] == b"EX":
+                ttl, i = float(opts[i + 1]), i + 2
+            elif opts[i] == b"PX":
+                ttl, i = float(opts[i + 1]) / 1000, i + 2
+            elif opts[i] in (b"NX", b"XX"):
+                nx, xx, i = nx or opts[i] == b"NX", xx or opts[i] == b"XX", i + 1
+            else:
+                raise RespError("ERR syntax error")
+        if xx and self.state.get(key.decode()) is None:
+            return None
+        return "OK" if self.state.set(key.decode(), value, ttl=ttl, only_if_absent=nx) else None
+
+    def cmd_del(self, *keys: bytes):
+        return self.state.delete(*(k.decode() for k in keys))
+
+    def cmd_exists(self, *keys: bytes):
+        live = set(self.state.keys())
+        return sum(k.decode() in live for k in keys)
+
+    def cmd_expire(self, key: bytes, seconds: bytes):
+        return self.state.expire(key.decode(), float(seconds))
+
+    def cmd_pexpire(self, key: bytes, ms: bytes):
+        return self.state.expire(key.decode(), float(ms) / 1000)
+
+    def cmd_pttl(self, key: bytes):
+        if key.decode() not in self.state.keys():
+            return -2
+        ttl = self.state.ttl(key.decode())
+        return -1 if ttl is None else int(ttl * 1000)
+
+    def cmd_ttl(self, key: bytes):
+        pttl = self.cmd_pttl(key)
+        return pttl if pttl < 0 else pttl // 1000
+
+    def cmd_keys(self, pattern: bytes):
+        return [k.encode() for k in self.state.keys() if fnmatch.fnmatchcase(k, pattern.decode())]
+
+    def cmd_dbsize(self):
+        return len(self.state.keys())
+
+    def cmd_flushdb(self, *args):
+        self.state.flush()
+        return "OK"
+
+    cmd_flushall = cmd_flushdb
+
+    def cmd_eval(self, script: bytes, numkeys: bytes, *args: bytes):
+        keys, argv = args[:int(numkeys)], args[int(numkeys):]
+        script = script.decode().strip()
+        if script == COMPARE_AND_DELETE.strip():
+            return int(self.state.compare_and_delete(keys[0].decode(), argv[0]))
+        if script == LOWER_BUDGET.strip():
+            remaining, window, ttl_ms = (int(a) for a in argv[:3])
+            return int(self.state.lower_budget(keys[0].decode(), remaining, window, ttl_ms / 1000))
+        raise RespError("ERR this stand-in only runs the lock-release and rate-limit scripts")
+
+    # --- Sets ---------------------------------------------------------------
+
+    def cmd_sadd(self, name: bytes, *members: bytes):
+        return self.state.sadd(name.decode(), *(m.decode() for m in members))
+
+    def cmd_srem(self, name: bytes, *members: bytes):
+        return self.state.srem(name.decode(), *(m.decode() for m in members))
+
+    def cmd_sismember(self, name: bytes, member: bytes):
+        return self.state.sismember(name.decode(), member.decode())
+
+    def cmd_smembers(self, name: bytes):
+        return [m.encode() for m in sorted(self.state.smembers(name.decode()))]
+
+    def cmd_scard(self, name: bytes):
+        return len(self.state.smembers(name.decode()))
+
+    # --- Hashes -------------------------------------------------------------
+
+    def cmd_hset(self, name: bytes, *pairs: bytes):
+        if not pairs or len(pairs) % 2:
+            raise TypeError("wrong number of arguments")
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += self.state.hget(name.decode(), field.decode()) is None
+            self.state.hset(name.decode(), field.decode(), value.decode())
+        return added
+
+    def cmd_hget(self, name: bytes, field: bytes):
+        value = self.state.hget(name.decode(), field.decode())
+        return value.encode() if value is not None else None
+
+    def cmd_hdel(self, name: bytes, *fields: bytes):
+        return self.state.hdel(name.decode(), *(f.decode() for f in fields))
+
+    def cmd_hgetall(self, name: bytes):
+        flat = []
+        for field, value in self.state.hgetall(name.decode()).items():
+            flat += [field.encode(), value.encode()]
+        return flat
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                args = read_command(self.rfile)
+            except RespError as e:
+                self.wfile.write(encode(e))
+                return
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            if args and args[0].upper() == b"QUIT":
+                self.wfile.write(encode("OK"))
+                return
+            self.wfile.write(encode(self.server.commands.execute(args)))
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], state: MemoryState | None = None):
+        super().__init__(address, _Handler)
+        self.commands = CommandHandler(state or MemoryState())
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0) -> tuple[RespServer, str]:
+    """Serve in a background thread; returns (server, redis:// URL). Port 0 picks a free port."""
+    server = RespServer((host, port))
+    threading.Thread(target=server.serve_forever, name="resp-server", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"redis://{host}:{port}/0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server = RespServer((args.host, args.port))
+    print(f"🧪 RESP stand-in listening on redis://{args.host}:{args.port}/0 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,35 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import PydanticOutputParser
+from concurrent.futures import ThreadPoolExecutor
+
 from src.config.settings import settings
-from langchain_core.prompts import ChatPromptTemplate
+from src.observability.tracing import stage_span
 
 from pydantic import BaseModel , Field
 
 
 #in the below form the llm gives the response rather than just random response 
 class ClassificationResult(BaseModel):
-    action:str = Field(... , description="GITHUB_PR_COUNT | GITHUB_STATS | GITHUB_CONTRIBUTORS | GITHUB_COMMITS | GITHUB_ISSUES | GITHUB_LANGUAGES | GITHUB_RELEASES | GITHUB_OVERVIEW | SEARCH | RAG")
+    action:str = Field(... , description="GITHUB_PR_COUNT | GITHUB_STATS | GITHUB_CONTRIBUTORS | GITHUB_COMMITS | GITHUB_COMMIT_ACTIVITY | GITHUB_ISSUES | GITHUB_LANGUAGES | GITHUB_RELEASES | GITHUB_OVERVIEW | SEARCH | RAG")
     repo:str | None =Field(None , description="Repository full name if needed")
+    repos: list[str] = Field(default_factory=list , description="All repository full names when the user compares several repositories")
+    limit: int | None = Field(None , description="How many items the user asked for (e.g. top 50 contributors), otherwise null")
+    days: int | None = Field(None , description="Time window in days the user asked about (e.g. 7 for 'this week'), otherwise null")
     reason: str = Field(... , description="Why this classification was made")
 
 
 
 
-parser = PydanticOutputParser(pydantic_object=ClassificationResult)
+# Batch classification LLM calls (groups, then per-query fallbacks) for /chat/batch
+_classify_executor = ThreadPoolExecutor(
+    max_workers=settings.BATCH_MAX_CONCURRENCY,
+    thread_name_prefix="classify"
+)
 
-#
-class QueryClassifier:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model = "gemini-2.5-flash",
-            temperature=0,
-            google_api_key=settings.GEMINI_API_KEY
-        )
-        self.prompt=ChatPromptTemplate.from_messages([
-            ("system", """
+
+class BatchClassificationResult(BaseModel):
+    results: list[ClassificationResult] = Field(... , description="One classification per query, in the same order as the queries")
+
+
+SYSTEM_PROMPT = """
 You are a routing classifier for a GitHub Assistant.
 
 Your output determines which internal tool should be called.
@@ -71,6 +74,14 @@ Examples:
 - "What are the recent commits in rust-lang/rust?"
 - "Show me latest commits for flutter/flutter"
 
+### 4️⃣b GITHUB_COMMIT_ACTIVITY
+Choose when user asks about:
+- How active a repo has been over a period
+- Commit counts per author or per day in a time window
+Examples:
+- "How many commits landed in rust-lang/rust this month?"
+- "Who committed most to nodejs/node in the last 7 days?"
+
 ### 5️⃣ GITHUB_ISSUES
 Choose when user asks about:
 - Issue count (open/closed)
@@ -124,24 +135,142 @@ Choose **RAG** when:
 Examples:
 - "How does authentication work in this repo?"
 - "Explain the folder structure of vercel/next.js"
+- "Where is the APIRouter class defined in fastapi/fastapi?"
+
+## COMPARISONS
+When the user asks about SEVERAL repositories at once (e.g. "compare stars of facebook/react, vuejs/core and sveltejs/svelte"):
+- Pick the one action that fits the metric being compared (GITHUB_STATS, GITHUB_PR_COUNT, ...)
+- Put every repository in `repos`, in the order the user mentioned them
+- Set `repo` to the first one
+If the user gives well-known project names without owners, use their canonical 'owner/repo'.
+
+## COUNTS AND TIME WINDOWS
+- Set `limit` when the user asks for a number of items ("top 50 contributors", "last 20 commits")
+- Set `days` when the user names a time window ("this week" = 7, "this month" = 30, "last 90 days" = 90)
+- Leave both null otherwise; the tools have sensible defaults
 
 ## Output fields:
-- action = GITHUB_PR_COUNT | GITHUB_STATS | GITHUB_CONTRIBUTORS | GITHUB_COMMITS | GITHUB_ISSUES | GITHUB_LANGUAGES | GITHUB_RELEASES | GITHUB_OVERVIEW | SEARCH | RAG
+- action = GITHUB_PR_COUNT | GITHUB_STATS | GITHUB_CONTRIBUTORS | GITHUB_COMMITS | GITHUB_COMMIT_ACTIVITY | GITHUB_ISSUES | GITHUB_LANGUAGES | GITHUB_RELEASES | GITHUB_OVERVIEW | SEARCH | RAG
 - repo = repository name in 'owner/repo' format OR null
+- repos = list of 'owner/repo' names for comparisons, otherwise empty
+- limit = number of items asked for OR null
+- days = time window in days OR null
 - reason = clear explanation of classification
-"""),
+"""
+
+#
+class QueryClassifier:
+    def __init__(self, llm=None):
+        # llm can be injected (e.g. a fake chat model in benchmarks)
+        if llm is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            llm = ChatGoogleGenerativeAI(
+                model = "gemini-2.5-flash",
+                temperature=0,
+                google_api_key=settings.GEMINI_API_KEY
+            )
+        self.llm = llm
+        # langchain_core's prompt/parser stack is the slowest import left on the
+        # startup path, so it loads with the first classifier instead
+        from langchain_core.output_parsers import PydanticOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+        from src.observability.callbacks import TokenUsageCallback
+        self.usage_callback = TokenUsageCallback("classifier")
+        self.parser = PydanticOutputParser(pydantic_object=ClassificationResult)
+        self.batch_parser = PydanticOutputParser(pydantic_object=BatchClassificationResult)
+        self.prompt=ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
     ("user", "User query: {query}")
-        ]).partial(schema=parser.get_format_instructions())
+        ]).partial(schema=self.parser.get_format_instructions())
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            ("user", "Classify each of these user queries independently. "
+                     "Return exactly one result per query, in the same order.\n\n"
+                     "User queries:\n{queries}")
+        ]).partial(schema=self.batch_parser.get_format_instructions())
 
     def classify(self , query) -> ClassificationResult:
-        chain = self.prompt | self.llm | parser
-        return chain.invoke({"query": query})
+        chain = self.prompt | self.llm | self.parser
+        with stage_span("classify") as span:
+            result = chain.invoke(
+                {"query": query},
+                config={"callbacks": [self.usage_callback]}
+            )
+            span.action = result.action
+        return result
+
+    def _classify_group(self, queries: list[str]) -> list[ClassificationResult]:
+        chain = self.batch_prompt | self.llm | self.batch_parser
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(queries, 1))
+        with stage_span("classify", action="batch") as span:
+            batch = chain.invoke(
+                {"queries": numbered},
+                config={"callbacks": [self.usage_callback]}
+            )
+            if len(batch.results) != len(queries):
+                span.outcome = "error"
+        return batch.results
+
+    def classify_batch(self, queries: list[str]) -> list:
+        """
+        Classify many queries with one LLM call per BATCH_CLASSIFY_SIZE queries.
+
+        Identical queries (up to whitespace) are classified once, and the
+        group calls run concurrently. Returns one ClassificationResult per
+        query, or the Exception raised for it. Queries the batch call could
+        not classify (bad JSON, wrong result count) fall back to individual
+        classify() calls, which run concurrently too.
+        """
+        unique = list(dict.fromkeys(" ".join(q.split()) for q in queries))
+        size = settings.BATCH_CLASSIFY_SIZE
+        groups = [unique[start:start + size] for start in range(0, len(unique), size)]
+        group_futures = [_classify_executor.submit(self._classify_group, group) for group in groups]
+
+        decided = {}
+        for group, future in zip(groups, group_futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"⚠️ Batch classification failed, classifying one by one: {e}")
+                results = []
+            if len(results) == len(group):
+                decided.update(zip(group, results))
+
+        # Submitted here rather than from inside a group task, which would
+        # wait on the pool it is holding a worker of
+        fallbacks = {q: _classify_executor.submit(self.classify, q) for q in unique if q not in decided}
+        for query, future in fallbacks.items():
+            try:
+                decided[query] = future.result()
+            except Exception as e:
+                decided[query] = e
+        return [decided[" ".join(q.split())] for q in queries]
     
 
 
+# Built on first use (or by the app's lifespan hook), not at import time
+_classifier = None
+
+
+def get_classifier() -> QueryClassifier:
+    """Return the shared classifier, creating it (and its LLM client) on first use."""
+    global _classifier
+    if _classifier is None:
+        _classifier = QueryClassifier()
+    return _classifier
+
+
+def set_classifier(classifier: QueryClassifier | None) -> None:
+    """Replace the shared classifier (e.g. one with a fake LLM); None resets it."""
+    global _classifier
+    _classifier = classifier
 
 
-classifier_agent = QueryClassifier()
+def __getattr__(name):
+    # Keeps `from src.agents.classifier import classifier_agent` working, lazily
+    if name == "classifier_agent":
+        return get_classifier()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 
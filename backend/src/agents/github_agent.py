@@ -1,23 +1,57 @@
-from src.agents.router import route_query
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from src.agents.router import route_query, route_batch
+from src.config.settings import settings
+from src.observability.metrics import SYNTHESIS_FALLBACKS
+from src.observability.tracing import stage_span
+from src.tools.render import render_markdown, to_prompt
 import os
 
+logger = logging.getLogger(__name__)
+
+# Synthesis calls for /chat/batch items
+_synth_executor = ThreadPoolExecutor(
+    max_workers=settings.BATCH_MAX_CONCURRENCY,
+    thread_name_prefix="synthesize"
+)
+
 class GitHubAgent:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
+    def __init__(self, llm=None):
+        # llm can be injected (e.g. a fake chat model in benchmarks)
+        if llm is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            llm = ChatGoogleGenerativeAI(
+                model="gemini-2.5-flash",
+                temperature=0.7,
+                google_api_key=os.getenv("GEMINI_API_KEY")
+            )
+        self.llm = llm
+        # Loaded here rather than at import time to keep cold start fast
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.exceptions import (
+            ModelAPIError, ModelConnectionError, ModelRateLimitError, ModelTimeoutError,
         )
-        
+        from src.observability.callbacks import TokenUsageCallback
+        self.usage_callback = TokenUsageCallback("synthesizer")
+        # Failures worth answering around with the raw tool result: provider
+        # outages, rate limits, timeouts and network errors. Anything else
+        # (bad prompt, auth, a bug) should surface.
+        self.transient_errors = (
+            ModelAPIError, ModelConnectionError, ModelRateLimitError, ModelTimeoutError,
+            httpx.TransportError, TimeoutError, ConnectionError,
+        )
+
         self.synthesizer_prompt = ChatPromptTemplate.from_template("""
         You are a helpful GitHub Assistant.
         
+        Earlier in this conversation:
+        {history}
+
         The user asked: "{query}"
         
-        I have gathered the following information from my tools:
+        I have gathered the following information from my tools (structured data is given as compact key=value lines):
         "{tool_output}"
         
         Please synthesize this information into a friendly, clear, and concise answer for the user.
@@ -26,24 +60,81 @@ class GitHubAgent:
         
         self.synthesizer_chain = self.synthesizer_prompt | self.llm | StrOutputParser()
 
-    def run(self, query: str):
+    def run(self, query: str, session=None):
         print(f" Processing: {query}")
         
-        # 1. Route the query and get raw data
-        raw_result = route_query(query)
+        # 1. Route the query and get raw data (the session fills in the repo of follow-ups)
+        raw_result = route_query(query, session)
         
         # 2. Synthesize the final answer
-        final_answer = self.synthesizer_chain.invoke({
-            "query": query,
-            "tool_output": raw_result
-        })
-        
-        return final_answer
+        answer = self.synthesize(query, raw_result, history=session.summary if session else "")
+        if session is not None:
+            session.add_turn(query, answer)
+        return answer
+
+    def synthesize(self, query: str, raw_result, history: str = "") -> str:
+        try:
+            with stage_span("llm", action="synthesize"):
+                return self.synthesizer_chain.invoke(
+                    {"query": query, "tool_output": to_prompt(raw_result), "history": history or "(none)"},
+                    config={"callbacks": [self.usage_callback]}
+                )
+        except self.transient_errors as e:
+            # The data was fetched fine: show it as markdown rather than failing the request
+            SYNTHESIS_FALLBACKS.labels(type(e).__name__).inc()
+            logger.warning("Synthesis failed, answering with the tool result as is: %r", e, exc_info=e)
+            return render_markdown(raw_result)
+
+    def run_batch(self, queries: list[str]) -> list[dict]:
+        """Answer many queries; returns {query, response, error} per query, in order."""
+        print(f" Processing batch of {len(queries)} queries")
+        raw_results = route_batch(queries)
+
+        futures = [
+            None if isinstance(raw, Exception) else _synth_executor.submit(self.synthesize, query, raw)
+            for query, raw in zip(queries, raw_results)
+        ]
+
+        items = []
+        for query, raw, future in zip(queries, raw_results, futures):
+            item = {"query": query, "response": None, "error": None}
+            if future is None:
+                item["error"] = str(raw) or type(raw).__name__
+            else:
+                try:
+                    item["response"] = future.result()
+                except Exception as e:
+                    item["error"] = str(e) or type(e).__name__
+            items.append(item)
+        return items
+
+# Singleton instance, built on first use (or by the app's lifespan hook)
+_agent = None
+
+
+def get_agent() -> GitHubAgent:
+    """Return the shared agent, creating it (and its LLM clients) on first use."""
+    global _agent
+    if _agent is None:
+        _agent = GitHubAgent()
+    return _agent
+
+
+def set_agent(agent: GitHubAgent | None) -> None:
+    """Replace the shared agent (e.g. one with a fake LLM); None resets it."""
+    global _agent
+    _agent = agent
+
+
+def __getattr__(name):
+    # Keeps `from src.agents.github_agent import agent` working, lazily
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Singleton instance
-agent = GitHubAgent()
 
 if __name__ == "__main__":
     # Test run
-    response = agent.run("what is the latest update in the github?")
+    settings.validate()
+    response = get_agent().run("what is the latest update in the github?")
     print("\nFinal Answer:\n", response)
@@ -37,24 +37,62 @@
 
 
 
-from src.agents.classifier import classifier_agent , ClassificationResult
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from src.agents.classifier import get_classifier , ClassificationResult
+from src.config.settings import settings
 from src.tools.github_api import (
     get_open_pull_requests,
     get_repository_stats,
     get_top_contributors,
     get_recent_commits,
+    get_commit_activity,
     get_issue_stats,
     get_language_breakdown,
     get_latest_release,
-    get_repo_overview
+    get_repo_overview,
+    get_head_sha
 )
 from src.tools.search import web_search
-from src.rag.rag_chain import get_rag_chain
-from src.rag.vectorstore import ingest_repo_to_vectorstore
+from src.observability.tracing import stage_span, is_error_result
+from src.utils.singleflight import SingleFlight
+from src.tools.cache import tool_cache
+from src.tools.results import Comparison, ToolError
+from src.state import SharedDict, SharedSet, get_state
 
 
 
-ingested_repos = set()
+# Shared by all workers (STATE_BACKEND), so each repo is ingested once per deployment.
+# Keyed by repo_key(): GitHub repo names are case-insensitive.
+ingested_repos = SharedSet("ingested_repos")
+# Default-branch commit each ingested repo was indexed at (kept current by the warmer/webhooks)
+indexed_heads = SharedDict("indexed_heads")
+
+
+
+def repo_key(repo: str) -> str:
+    """The key a repo's ingest/index state is stored under (owner/repo, lowercased)."""
+    return repo.lower()
+
+
+# How often each repo is asked about; the background warmer keeps the hottest ones warm
+repo_query_counts = Counter()
+_query_counts_lock = threading.Lock()
+
+# Concurrent chats asking for the same data share one execution
+_tool_flight = SingleFlight("github_tool")
+_ingest_flight = SingleFlight("ingest")
+
+def _since(days: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def get_recent_commit_activity(repo: str, limit: int = 10, days: int | None = None):
+    """Commit activity over the last `days` days (default GITHUB_COMMIT_ACTIVITY_DAYS), top `limit` authors."""
+    return get_commit_activity(repo, _since(days or settings.GITHUB_COMMIT_ACTIVITY_DAYS), top=limit)
+
 
 # Map action types to their corresponding functions
 GITHUB_ACTION_MAP = {
@@ -62,23 +100,161 @@ GITHUB_ACTION_MAP = {
     "GITHUB_STATS": get_repository_stats,
     "GITHUB_CONTRIBUTORS": get_top_contributors,
     "GITHUB_COMMITS": get_recent_commits,
+    "GITHUB_COMMIT_ACTIVITY": get_recent_commit_activity,
     "GITHUB_ISSUES": get_issue_stats,
     "GITHUB_LANGUAGES": get_language_breakdown,
     "GITHUB_RELEASES": get_latest_release,
     "GITHUB_OVERVIEW": get_repo_overview,
 }
 
-def router_agent(query:str , decision : ClassificationResult):
+# Which of the classifier's `limit`/`days` each action takes
+ACTION_PARAMS = {
+    "GITHUB_CONTRIBUTORS": ("limit",),
+    "GITHUB_COMMITS": ("limit", "days"),
+    "GITHUB_COMMIT_ACTIVITY": ("limit", "days"),
+}
+
+# Shared by all requests, so comparisons can't exceed the global concurrency limit
+_compare_executor = ThreadPoolExecutor(
+    max_workers=settings.GITHUB_MAX_CONCURRENCY,
+    thread_name_prefix="compare"
+)
+
+# Runs the de-duplicated work items of /chat/batch requests
+_batch_executor = ThreadPoolExecutor(
+    max_workers=settings.BATCH_MAX_CONCURRENCY,
+    thread_name_prefix="batch"
+)
+
+
+def _action_params(action: str, limit: int | None, days: int | None) -> dict:
+    """The decision's `limit`/`days` that `action` takes (others ignore them), limit clamped."""
+    params = {}
+    if limit and "limit" in ACTION_PARAMS.get(action, ()):
+        params["limit"] = max(1, min(limit, settings.GITHUB_MAX_LIMIT))
+    if days and "days" in ACTION_PARAMS.get(action, ()):
+        params["days"] = days
+    return params
+
+
+def _cache_action(action: str, params: dict) -> str:
+    """Cache key for an action and its parameters, e.g. GITHUB_CONTRIBUTORS?limit=50."""
+    if not params:
+        return action
+    return action + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def run_github_action(action: str, repo: str, refresh: bool = False, ttl: float | None = None,
+                      limit: int | None = None, days: int | None = None):
+    """
+    Run one GitHub tool, serving from the result cache when possible.
+
+    refresh=True skips the cache lookup (the result is still cached, with
+    `ttl` overriding the default freshness). `limit` and `days` come from
+    the classifier and are passed on to the tools that take them.
+    """
+    params = _action_params(action, limit, days)
+    cache_action = _cache_action(action, params)
+    if not refresh:
+        cached = tool_cache.get(cache_action, repo)
+        if cached is not None:
+            return cached
+
+    kwargs = dict(params)
+    if action == "GITHUB_COMMITS" and "days" in kwargs:
+        # Cached by window length; the window itself starts when the tool runs
+        kwargs["since"] = _since(kwargs.pop("days"))
+    handler = GITHUB_ACTION_MAP[action]
+    with stage_span("github_tool", action=action, repo=repo) as span:
+        result = _tool_flight.do((cache_action, repo), handler, repo, **kwargs)
+        if is_error_result(result):
+            span.outcome = "error"
+        else:
+            tool_cache.set(cache_action, repo, result, ttl=ttl)
+    return result
+
+
+def compare_repositories(action: str, repos: list[str], limit: int | None = None,
+                         days: int | None = None) -> Comparison:
+    """Run one GitHub action for several repos concurrently and collect the results per repo."""
+    futures = {
+        repo: _compare_executor.submit(run_github_action, action, repo, limit=limit, days=days)
+        for repo in repos
+    }
+
+    results, failures = [], []
+    for repo, future in futures.items():
+        try:
+            result = future.result()
+        except Exception as e:
+            result = ToolError(f"{type(e).__name__}: {e}")
+        (failures if is_error_result(result) else results).append((repo, result))
+    return Comparison(action=action, results=tuple(results), failures=tuple(failures))
+
+
+def record_repo_queries(repos: list[str]) -> None:
+    with _query_counts_lock:
+        repo_query_counts.update(repos)
+
+
+def hot_repos(limit: int) -> list[str]:
+    """The `limit` most asked-about repos, most popular first."""
+    with _query_counts_lock:
+        return [repo for repo, _ in repo_query_counts.most_common(limit)]
+
+
+def decay_repo_query_counts(factor: float = 0.5) -> None:
+    """Age query counts so repos that stopped being asked about drop off the hot list."""
+    with _query_counts_lock:
+        for repo, count in list(repo_query_counts.items()):
+            count = int(count * factor)
+            if count:
+                repo_query_counts[repo] = count
+            else:
+                del repo_query_counts[repo]
+
+
+def _decision_repos(decision: ClassificationResult) -> list[str]:
+    repos = list(dict.fromkeys(decision.repos or []))
+    if decision.repo and decision.repo not in repos:
+        repos.insert(0, decision.repo)
+    return repos
+
+
+def resolve_session_repo(decision: ClassificationResult, session=None) -> ClassificationResult:
+    """Fill in the conversation's last repo when a follow-up question doesn't name one."""
+    if session is None or not session.last_repo:
+        return decision
+    needs_repo = decision.action in GITHUB_ACTION_MAP or decision.action == "RAG"
+    if needs_repo and not _decision_repos(decision):
+        print(f"🧠 No repo in the question, using {session.last_repo} from the conversation")
+        return decision.model_copy(update={"repo": session.last_repo})
+    return decision
+
+
+def router_agent(query:str , decision : ClassificationResult, session=None):
+    decision = resolve_session_repo(decision, session)
+    if session is not None and len(_decision_repos(decision)) == 1:
+        session.last_repo = _decision_repos(decision)[0]
+
     print(f"🔀 Routing to {decision.action} | Repo: {decision.repo}")
     print(f"   Reason: {decision.reason}")
+    record_repo_queries(_decision_repos(decision))
 
     # Handle GitHub API actions
     if decision.action in GITHUB_ACTION_MAP:
-        if not decision.repo:
+        repos = _decision_repos(decision)
+        if not repos:
             return "❌ I need a repository name to fetch GitHub data. Please specify in 'owner/repo' format."
-        
-        handler = GITHUB_ACTION_MAP[decision.action]
-        return handler(decision.repo)
+
+        if len(repos) > 1:
+            if len(repos) > settings.MAX_COMPARE_REPOS:
+                return f"❌ I can compare at most {settings.MAX_COMPARE_REPOS} repositories at once."
+            print(f"   Comparing: {', '.join(repos)}")
+            return compare_repositories(decision.action, repos, decision.limit, decision.days)
+
+        # Follow-ups in the same conversation are served by the shared tool cache
+        return run_github_action(decision.action, repos[0], limit=decision.limit, days=decision.days)
     
     # Handle web search
     elif decision.action == "SEARCH":
@@ -87,17 +263,21 @@ def router_agent(query:str , decision : ClassificationResult):
     # Handle RAG for code understanding
     elif decision.action =="RAG":
         if decision.repo:
+            repo = repo_key(decision.repo)
             # --- Smart ingestion check ---
-            if decision.repo not in ingested_repos:
-                repo_url = f"https://github.com/{decision.repo}"
-                print(f"📥 New Repo detected: {decision.repo}. Ingesting...")
-                ingest_repo_to_vectorstore(repo_url)
-                # Mark as done!
-                ingested_repos.add(decision.repo)
-                print(f"✅ {decision.repo} added to memory!")
+            if repo not in ingested_repos:
+                ensure_ingested(repo)
             else:
                 print(f"📦 {decision.repo} is already ingested. Skipping download.")
 
+            # Structure and "where is X defined" questions are answered from the repo index
+            from src.rag.repo_index import answer_structural_query
+            result = answer_structural_query(query, repo)
+            if result is not None:
+                return result
+
+        # RAG pulls in LangChain/Qdrant/FastEmbed; only import it once a RAG question arrives
+        from src.rag.rag_chain import get_rag_chain
         from src.rag.retriever import get_retriever
         retriever = get_retriever()
         rag_chain = get_rag_chain(retriever)
@@ -107,6 +287,99 @@ def router_agent(query:str , decision : ClassificationResult):
         print(f"⚠️ Warning: Unknown action '{decision.action}'")
         return "I'm sorry, I wasn't sure which tool to use for that request."
 
-def route_query(query:str):
-    decision = classifier_agent.classify(query=query)
-    return router_agent(query , decision)
\ No newline at end of file
+def ensure_ingested(repo: str):
+    """
+    Ingest a repo unless it already is.
+
+    Concurrent callers in this process wait for one ingestion run
+    (single-flight); other workers wait on the shared ingest lock.
+    """
+    repo = repo_key(repo)
+    if repo not in ingested_repos:
+        _ingest_flight.do(repo, _ingest_repo, repo)
+
+def _ingest_repo(repo: str):
+    if repo in ingested_repos:
+        return
+    ttl = settings.INGEST_LOCK_TTL
+    with get_state().lock(f"ingest:{repo}", ttl=ttl, timeout=ttl):
+        # Another worker may have finished it while we waited for the lock
+        if repo in ingested_repos:
+            return
+        from src.rag.vectorstore import ingest_repo_to_vectorstore
+        repo_url = f"https://github.com/{repo}"
+        print(f"📥 New Repo detected: {repo}. Ingesting...")
+        # Read HEAD first: anything pushed during the clone is picked up by the next refresh
+        head = get_head_sha(repo)
+        ingest_repo_to_vectorstore(repo_url, repo=repo)
+        # Mark as done!
+        ingested_repos.add(repo)
+        if head:
+            indexed_heads[repo] = head
+        print(f"✅ {repo} added to memory!")
+
+def rebuild_index(repo: str, head: str | None = None):
+    """
+    Re-ingest an already ingested repo from scratch (e.g. when the changes
+    since the indexed commit can't be listed). The old chunks stay searchable
+    until the new ones are indexed.
+
+    Holds the same `index:{repo}` lock as incremental re-indexes, so a
+    webhook update can't interleave with the swap and leave duplicate chunks.
+    """
+    from src.rag.vectorstore import ingest_repo_to_vectorstore
+    repo = repo_key(repo)
+    ttl = settings.INGEST_LOCK_TTL
+    with get_state().lock(f"index:{repo}", ttl=ttl, timeout=ttl):
+        print(f"🔁 Rebuilding the index of {repo}...")
+        head = head or get_head_sha(repo)
+        ingest_repo_to_vectorstore(f"https://github.com/{repo}", repo=repo, replace=True)
+        if head:
+            indexed_heads[repo] = head
+
+def route_query(query:str, session=None):
+    decision = get_classifier().classify(query=query)
+    return router_agent(query , decision, session)
+
+
+def _work_key(query: str, decision: ClassificationResult) -> tuple:
+    """Identity of the tool work a query needs; equal keys share one execution."""
+    if decision.action in GITHUB_ACTION_MAP:
+        params = _action_params(decision.action, decision.limit, decision.days)
+        return (_cache_action(decision.action, params), tuple(_decision_repos(decision)))
+    # SEARCH / RAG depend on the query text itself
+    return (decision.action, decision.repo, " ".join(query.lower().split()))
+
+
+def route_batch(queries: list[str]) -> list:
+    """
+    Route many queries at once.
+
+    Queries are classified in batched LLM calls, identical work items (e.g. the
+    same action on the same repo) run only once, and distinct items run
+    concurrently. Returns one raw tool result per query, in order, or the
+    Exception raised for it.
+    """
+    decisions = get_classifier().classify_batch(queries)
+
+    work = {}
+    for query, decision in zip(queries, decisions):
+        if not isinstance(decision, Exception):
+            work.setdefault(_work_key(query, decision), (query, decision))
+    print(f"📦 Batch of {len(queries)} queries -> {len(work)} unique tool calls")
+
+    futures = {
+        key: _batch_executor.submit(router_agent, query, decision)
+        for key, (query, decision) in work.items()
+    }
+
+    results = []
+    for query, decision in zip(queries, decisions):
+        if isinstance(decision, Exception):
+            results.append(decision)
+            continue
+        try:
+            results.append(futures[_work_key(query, decision)].result())
+        except Exception as e:
+            results.append(e)
+    return results
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+Conversation Sessions - Bounded server-side context for follow-up questions
+
+A session remembers, per client conversation:
+- the last repository a question resolved to, so "and how many open issues?"
+  is routed to the same repo instead of being refused
+- a rolling compact summary of earlier turns for the synthesizer
+
+Tool results are not kept per session: follow-ups are served by the shared
+tool cache (src/tools/cache.py), which webhook events invalidate.
+
+- SessionStore: in-process LRU with a TTL per session, a cap on the number
+  of sessions and a cap on their (approximate) total size in bytes
+  (STATE_BACKEND=memory)
+- SharedSessionStore: in the shared state backend (STATE_BACKEND=redis), so
+  any worker can serve the next turn of a conversation without sticky routing
+
+A session id the store doesn't know (expired, evicted, or never issued) is
+logged and starts a new conversation under that id.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from src.config.settings import settings
+from src.state import get_state
+
+# Rough fixed cost of a session object (ids, dicts, lock) in the byte budget
+SESSION_OVERHEAD_BYTES = 1024
+
+
+class Session:
+    """
+    Context of one conversation. Mutations are thread-safe; call
+    SessionStore.save() afterwards so the store can re-account its size.
+    """
+
+    __slots__ = ("id", "last_repo", "summary", "turns", "summary_chars", "nbytes", "_lock")
+
+    def __init__(self, session_id: str, summary_chars: int):
+        self.id = session_id
+        self.last_repo: Optional[str] = None
+        self.summary = ""
+        self.turns = 0
+        self.summary_chars = summary_chars
+        self.nbytes = SESSION_OVERHEAD_BYTES
+        self._lock = threading.Lock()
+
+    def add_turn(self, query: str, answer: str) -> None:
+        """Append a turn to the rolling summary, dropping the oldest turns past summary_chars."""
+        line = f"Q: {' '.join(query.split())[:200]} | A: {' '.join(str(answer).split())[:300]}"
+        with self._lock:
+            self.turns += 1
+            lines = (self.summary.splitlines() if self.summary else []) + [line]
+            while len(lines) > 1 and sum(len(l) + 1 for l in lines) > self.summary_chars:
+                lines.pop(0)
+            self.summary = "\n".join(lines)[-self.summary_chars:]
+
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            return json.dumps({"last_repo": self.last_repo, "summary": self.summary,
+                               "turns": self.turns}).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, session_id: str, data: bytes, summary_chars: int) -> "Session":
+        payload = json.loads(data)
+        session = cls(session_id, summary_chars)
+        session.last_repo = payload.get("last_repo")
+        session.summary = payload.get("summary", "")
+        session.turns = payload.get("turns", 0)
+        session.measure()
+        return session
+
+    def measure(self) -> int:
+        """Recompute the approximate memory footprint in bytes."""
+        with self._lock:
+            size = SESSION_OVERHEAD_BYTES + len(self.summary) + len(self.last_repo or "")
+            self.nbytes = size
+        return size
+
+
+class SessionStore:
+    """
+    Thread-safe LRU of sessions with idle TTL, count and byte caps.
+
+    Args:
+        ttl: Seconds a session survives without being used
+        max_sessions: Max sessions before the least recently used is evicted
+        max_bytes: Max approximate total size of all sessions
+    """
+
+    def __init__(self, ttl: float, max_sessions: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, tuple[float, Session]]" = OrderedDict()
+        self._bytes = 0
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """Return the live session with this id, or start a new one (new id if none given)."""
+        requested = session_id
+        session_id = session_id or uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._sessions[session_id] = (now, entry[1])
+                self._sessions.move_to_end(session_id)
+                return entry[1]
+            if entry is not None:
+                self._drop(session_id)
+            if requested:
+                _log_unknown(requested)
+
+            session = Session(session_id, settings.SESSION_SUMMARY_CHARS)
+            self._sessions[session_id] = (now, session)
+            self._bytes += session.nbytes
+            self._evict()
+            return session
+
+    def save(self, session: Session) -> None:
+        """Re-account a session's size after it changed and enforce the caps."""
+        before = session.nbytes
+        after = session.measure()
+        with self._lock:
+            if session.id in self._sessions:
+                self._bytes += after - before
+                self._sessions[session.id] = (time.monotonic(), session)
+                self._sessions.move_to_end(session.id)
+            self._evict()
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._drop(session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, session_id: str) -> bool:
+        entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1].nbytes
+        return True
+
+    def _evict(self) -> None:
+        """Drop expired sessions, then least recently used ones until under both caps (lock held)."""
+        now = time.monotonic()
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            over_cap = len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+            if not over_cap and now - last_used <= self.ttl:
+                break
+            # Never evict the only (i.e. current) session for being large
+            if len(self._sessions) == 1 and now - last_used <= self.ttl:
+                break
+            self._drop(session_id)
+
+
+class SharedSessionStore:
+    """
+    Same interface as SessionStore, stored in the shared state backend.
+
+    Each session is JSON under session:<id>, expiring after `ttl` idle
+    seconds. The number and size of sessions are bounded by the server's
+    eviction policy instead of max_sessions/max_bytes. Two workers serving
+    turns of one conversation at the same time: the last save wins.
+    """
+
+    def __init__(self, ttl: float, max_sessions: int = 0, max_bytes: int = 0):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+
+    def _key(self, session_id: str) -> str:
+        return f"session:{session_id}"
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """Return the live session with this id, or start a new one (new id if none given)."""
+        if session_id:
+            data = get_state().get(self._key(session_id))
+            if data is not None:
+                return Session.from_bytes(session_id, data, settings.SESSION_SUMMARY_CHARS)
+            _log_unknown(session_id)
+        # Stored by save(), once the turn is done
+        return Session(session_id or uuid.uuid4().hex, settings.SESSION_SUMMARY_CHARS)
+
+    def save(self, session: Session) -> None:
+        """Store the session and restart its idle TTL."""
+        session.measure()
+        get_state().set(self._key(session.id), session.to_bytes(), ttl=self.ttl)
+
+    def delete(self, session_id: str) -> bool:
+        return bool(get_state().delete(self._key(session_id)))
+
+
+def _log_unknown(session_id: str) -> None:
+    print(f"🧠 Session {session_id[:16]} is unknown or expired, starting a new conversation")
+
+
+def make_session_store(ttl: float, max_sessions: int, max_bytes: int):
+    """The session store matching STATE_BACKEND: in-process, or shared by all workers."""
+    if settings.STATE_BACKEND == "redis":
+        return SharedSessionStore(ttl=ttl, max_sessions=max_sessions, max_bytes=max_bytes)
+    return SessionStore(ttl=ttl, max_sessions=max_sessions, max_bytes=max_bytes)
+
+
+session_store = make_session_store(
+    ttl=settings.SESSION_TTL,
+    max_sessions=settings.SESSION_MAX_SESSIONS,
+    max_bytes=settings.SESSION_MAX_BYTES
+)
@@ -9,13 +9,105 @@ class Settings :
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
     QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+    # server = QDRANT_URL over the network, memory = in-process ":memory:",
+    # local = embedded on-disk store at QDRANT_PATH (single process only)
+    QDRANT_MODE = os.getenv("QDRANT_MODE", "server")
+    QDRANT_PATH = os.getenv("QDRANT_PATH", "./data/qdrant")
     SEARXNG_URL = os.getenv("SEARXNG_URL", "http://localhost:8080")
+    # Max concurrent page requests per paginated listing
+    GITHUB_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))
+    # Requests kept in reserve when spending the rate limit on pagination
+    GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))
+    # Commits aggregated per commit-activity window (newest first; 100 per request)
+    GITHUB_COMMIT_ACTIVITY_MAX = int(os.getenv("GITHUB_COMMIT_ACTIVITY_MAX", "3000"))
+    # Window used when a commit-activity question doesn't name one, and the
+    # largest "top N" a question may ask a listing tool for
+    GITHUB_COMMIT_ACTIVITY_DAYS = int(os.getenv("GITHUB_COMMIT_ACTIVITY_DAYS", "30"))
+    GITHUB_MAX_LIMIT = int(os.getenv("GITHUB_MAX_LIMIT", "500"))
+    # Max GitHub tool calls running at once across all requests (comparisons, batches)
+    GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+    MAX_COMPARE_REPOS = int(os.getenv("MAX_COMPARE_REPOS", "10"))
+    # GitHub tool result cache (invalidated per repo by /webhooks/github)
+    TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", "300"))
+    TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "2000"))
+    GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+    # /chat/batch limits
+    MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "500"))
+    BATCH_CLASSIFY_SIZE = int(os.getenv("BATCH_CLASSIFY_SIZE", "25"))
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "3000"))
+    # Query embedding cache (dense + sparse), keyed on model + normalized question
+    EMBED_CACHE_MAX_BYTES = int(os.getenv("EMBED_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    # SQLite file so cached embeddings survive restarts ("" = memory only)
+    EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "")
+    EMBED_CACHE_DISK_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_DISK_MAX_ENTRIES", "200000"))
+    OTEL_ENABLED = os.getenv("OTEL_ENABLED", "false").lower() == "true"
+    OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "github-assistant")
+    # Web search: providers are tried in order, hedging to the next one when slow.
+    # SearxNG only joins the default list when SEARXNG_URL is set explicitly.
+    SEARCH_PROVIDERS = [p.strip() for p in os.getenv(
+        "SEARCH_PROVIDERS", "duckduckgo,searxng" if os.getenv("SEARXNG_URL") else "duckduckgo"
+    ).split(",") if p.strip()]
+    SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "8"))
+    SEARCH_HEDGE_DELAY = float(os.getenv("SEARCH_HEDGE_DELAY", "1.5"))
+    SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+    SEARCH_FETCH_PAGES = int(os.getenv("SEARCH_FETCH_PAGES", "0"))
+    SEARCH_PAGE_CHARS = int(os.getenv("SEARCH_PAGE_CHARS", "2000"))
+    # Conversation sessions (follow-up questions reuse the last repo and a summary of earlier turns)
+    SESSION_TTL = float(os.getenv("SESSION_TTL", "1800"))
+    SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+    SESSION_SUMMARY_CHARS = int(os.getenv("SESSION_SUMMARY_CHARS", "1500"))
+    # Background warmer: keeps tool results and RAG indexes of hot repos fresh
+    WARM_ENABLED = os.getenv("WARM_ENABLED", "false").lower() == "true"
+    WARM_WATCHLIST = [r.strip() for r in os.getenv("WARM_WATCHLIST", "").split(",") if r.strip()]
+    WARM_INTERVAL = float(os.getenv("WARM_INTERVAL", "900"))
+    WARM_MAX_REPOS = int(os.getenv("WARM_MAX_REPOS", "200"))
+    WARM_AUTO_TOP = int(os.getenv("WARM_AUTO_TOP", "50"))
+    WARM_RAG = os.getenv("WARM_RAG", "true").lower() == "true"
+    # Shared state across workers/pods: memory = this process only, redis = REDIS_URL
+    STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    STATE_KEY_PREFIX = os.getenv("STATE_KEY_PREFIX", "github-assistant:")
+    # Held while a repo is cloned and indexed; must exceed the slowest ingestion
+    INGEST_LOCK_TTL = float(os.getenv("INGEST_LOCK_TTL", "1800"))
+    # Every ingestion clones into its own directory under here
+    REPO_CLONE_DIR = os.getenv("REPO_CLONE_DIR", "./data/repos")
+    # Ingestion policy: which files of a repo are chunked and embedded (src/rag/ingest_policy.py)
+    INGEST_MAX_FILE_BYTES = int(os.getenv("INGEST_MAX_FILE_BYTES", str(256 * 1024)))
+    INGEST_MAX_LINE_LENGTH = int(os.getenv("INGEST_MAX_LINE_LENGTH", "5000"))
+    INGEST_MINIFIED_AVG_LINE = int(os.getenv("INGEST_MINIFIED_AVG_LINE", "300"))
+    INGEST_SKIP_GENERATED = os.getenv("INGEST_SKIP_GENERATED", "true").lower() == "true"
+    INGEST_SKIP_VENDORED = os.getenv("INGEST_SKIP_VENDORED", "true").lower() == "true"
+    INGEST_RESPECT_GITIGNORE = os.getenv("INGEST_RESPECT_GITIGNORE", "true").lower() == "true"
+    INGEST_INCLUDE = [g.strip() for g in os.getenv("INGEST_INCLUDE", "").split(",") if g.strip()]
+    INGEST_EXCLUDE = [g.strip() for g in os.getenv("INGEST_EXCLUDE", "").split(",") if g.strip()]
+    # JSON file with per-repo overrides of the above ("" = none)
+    INGEST_POLICY_FILE = os.getenv("INGEST_POLICY_FILE", "")
+    # File tree + symbol index per repo, answers structure / "where is X defined" questions
+    REPO_INDEX_ENABLED = os.getenv("REPO_INDEX_ENABLED", "true").lower() == "true"
     
     def validate(self):
         if not self.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required")
         if not self.GITHUB_TOKEN:
             raise ValueError("GITHUB_TOKEN is required")
+        if self.QDRANT_MODE not in ("server", "memory", "local"):
+            raise ValueError("QDRANT_MODE must be one of: server, memory, local")
+        unknown = set(self.SEARCH_PROVIDERS) - {"duckduckgo", "searxng"}
+        if unknown or not self.SEARCH_PROVIDERS:
+            raise ValueError("SEARCH_PROVIDERS must be a comma-separated list of: duckduckgo, searxng")
+        if self.STATE_BACKEND not in ("memory", "redis"):
+            raise ValueError("STATE_BACKEND must be one of: memory, redis")
+        if self.STATE_BACKEND == "redis" and self.QDRANT_MODE != "server":
+            # The shared state would mark repos as ingested in vectors only one process can see
+            raise ValueError(
+                f"STATE_BACKEND=redis needs QDRANT_MODE=server: with QDRANT_MODE={self.QDRANT_MODE} "
+                "each process has its own vector store. Use STATE_BACKEND=memory for a single process."
+            )
+        if self.INGEST_POLICY_FILE and not os.path.isfile(self.INGEST_POLICY_FILE):
+            raise ValueError(f"INGEST_POLICY_FILE not found: {self.INGEST_POLICY_FILE}")
 
-settings = Settings()
-settings.validate()
\ No newline at end of file
+# validate() runs at app startup (FastAPI lifespan), so modules can be imported without secrets
+settings = Settings()
\ No newline at end of file
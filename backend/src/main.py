@@ -1,10 +1,33 @@
-from fastapi import FastAPI ,HTTPException
-from src.agents.github_agent import agent
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from fastapi import FastAPI ,HTTPException, Response
+from src.agents.github_agent import get_agent
+from src.agents.session import session_store
+from src.observability.metrics import render_metrics
+from src.observability.tracing import stage_span
+from src.server.webhooks import router as webhook_router
+from src.server.warmer import warmer
+from src.state import get_state, set_state
+from src.config.settings import settings
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 
 import os
-app = FastAPI(title="GitHub Assistant API")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Secrets are checked and LLM clients built here rather than at import time
+    settings.validate()
+    get_state()
+    get_agent()
+    if settings.WARM_ENABLED:
+        warmer.start()
+    yield
+    warmer.stop()
+    set_state(None)
+
+
+app = FastAPI(title="GitHub Assistant API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,9 +37,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(webhook_router)
+
 
 class ChatRequest(BaseModel):
     query: str
+    # Omit to start a new conversation; send back the returned id for follow-ups
+    session_id: str | None = Field(None, max_length=128)
+
+
+class BatchChatRequest(BaseModel):
+    queries: list[str] = Field(..., min_length=1, max_length=settings.MAX_BATCH_SIZE)
 
 
 @app.post("/chat")
@@ -24,12 +55,32 @@ def chat_endpoint(request: ChatRequest):
   
   try:
         user_query = request.query
-        response = agent.run(user_query)
-        return {"response": response}
+        session = session_store.get_or_create(request.session_id)
+        with stage_span("request", action="chat"):
+            response = get_agent().run(user_query, session=session)
+        session_store.save(session)
+        return {"response": response, "session_id": session.id}
   except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/batch")
+def chat_batch_endpoint(request: BatchChatRequest):
+  # Per-item failures are reported in each result's "error" field
+  try:
+        with stage_span("request", action="chat_batch"):
+            results = get_agent().run_batch(request.queries)
+        return {"results": results}
+  except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 
 if __name__ == "__main__":
     import uvicorn
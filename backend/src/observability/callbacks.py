@@ -0,0 +1,28 @@
+"""
+LLM Callbacks - LangChain handlers that feed the Prometheus metrics
+
+Kept out of metrics.py so that importing the metrics (which nearly every
+module does) does not load langchain_core's callback stack at startup.
+"""
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.observability.metrics import LLM_TOKENS
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """LangChain callback that adds the usage_metadata of each LLM response to LLM_TOKENS."""
+
+    def __init__(self, component: str):
+        self.component = component
+
+    def on_llm_end(self, response: LLMResult, **kwargs) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+                LLM_TOKENS.labels(self.component, "input").inc(usage.get("input_tokens", 0))
+                LLM_TOKENS.labels(self.component, "output").inc(usage.get("output_tokens", 0))
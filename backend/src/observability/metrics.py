@@ -0,0 +1,66 @@
+"""
+Prometheus Metrics - Latency histograms and LLM token counters
+
+Exposed in Prometheus text format on the /metrics endpoint.
+
+Labels:
+- stage: pipeline stage (classify, github_tool, web_search, retrieve, repo_index, llm, ingest, request)
+- action: tool action or sub-operation within the stage (e.g. GITHUB_STATS, synthesize, load)
+- outcome: success | error
+"""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+STAGE_LATENCY = Histogram(
+    "github_assistant_stage_duration_seconds",
+    "Latency of each pipeline stage",
+    ["stage", "action", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+LLM_TOKENS = Counter(
+    "github_assistant_llm_tokens_total",
+    "LLM tokens used, by component and direction",
+    ["component", "kind"],
+)
+
+CACHE_REQUESTS = Counter(
+    "github_assistant_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+
+CACHE_BYTES = Gauge(
+    "github_assistant_cache_bytes",
+    "Approximate memory held by a size-bounded cache",
+    ["cache"],
+)
+
+INGEST_FILES = Counter(
+    "github_assistant_ingest_files_total",
+    "Repository files seen by the ingestion policy, by decision (kept or the skip reason)",
+    ["decision"],
+)
+
+INGEST_BYTES = Counter(
+    "github_assistant_ingest_bytes_total",
+    "Bytes of repository files seen by the ingestion policy, by decision (kept or the skip reason)",
+    ["decision"],
+)
+
+SYNTHESIS_FALLBACKS = Counter(
+    "github_assistant_synthesis_fallbacks_total",
+    "Answers sent as the rendered tool result because the synthesis LLM call failed, by error type",
+    ["error"],
+)
+
+SINGLEFLIGHT_SAVED = Counter(
+    "github_assistant_singleflight_saved_total",
+    "Calls that joined an identical in-flight execution instead of running their own",
+    ["name"],
+)
+
+
+def render_metrics() -> tuple:
+    """Return (payload, content_type) for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,100 @@
+"""
+Tracing - Per-stage spans recorded as Prometheus histograms and (optionally) OpenTelemetry spans
+
+Usage:
+    with stage_span("github_tool", action="GITHUB_STATS") as span:
+        result = handler(repo)
+        if is_error_result(result):
+            span.outcome = "error"
+
+OpenTelemetry export is enabled with OTEL_ENABLED=true and needs the optional
+`opentelemetry-sdk` and `opentelemetry-exporter-otlp-proto-http` packages.
+The exporter reads the standard OTEL_EXPORTER_OTLP_* environment variables.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from src.config.settings import settings
+from .metrics import STAGE_LATENCY
+
+_tracer = None
+_tracer_initialized = False
+
+
+def _get_tracer():
+    """Set up the OpenTelemetry tracer on first use (None when disabled/unavailable)."""
+    global _tracer, _tracer_initialized
+    if _tracer_initialized:
+        return _tracer
+    _tracer_initialized = True
+
+    if not settings.OTEL_ENABLED:
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        print("⚠️ OTEL_ENABLED is set but opentelemetry-sdk is not installed. Tracing disabled.")
+        return None
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("github-assistant")
+    return _tracer
+
+
+class StageSpan:
+    """Handle yielded by stage_span; set `outcome`/`action` before the block exits."""
+
+    def __init__(self, stage: str, action: str):
+        self.stage = stage
+        self.action = action
+        self.outcome = "success"
+        self.otel_span = None
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.otel_span is not None:
+            self.otel_span.set_attribute(key, value)
+
+
+@contextmanager
+def stage_span(stage: str, action: str = "", **attributes):
+    """Time a pipeline stage; exceptions mark the outcome as 'error' and are re-raised."""
+    span = StageSpan(stage, action)
+    tracer = _get_tracer()
+    otel_cm = tracer.start_as_current_span(f"{stage}:{action}" if action else stage) if tracer else None
+    if otel_cm is not None:
+        span.otel_span = otel_cm.__enter__()
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+
+    start = time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield span
+    except BaseException as e:
+        error = e
+        span.outcome = "error"
+        raise
+    finally:
+        STAGE_LATENCY.labels(span.stage, span.action, span.outcome).observe(time.perf_counter() - start)
+        if otel_cm is not None:
+            span.set_attribute("action", span.action)
+            span.set_attribute("outcome", span.outcome)
+            if error is not None:
+                otel_cm.__exit__(type(error), error, error.__traceback__)
+            else:
+                otel_cm.__exit__(None, None, None)
+
+
+def is_error_result(result) -> bool:
+    """Tools report failures as a ToolError (or legacy '❌'/'⚠️' strings) instead of raising."""
+    if getattr(result, "is_error", False):
+        return True
+    return isinstance(result, str) and result.startswith(("❌", "⚠️"))
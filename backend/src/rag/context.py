@@ -0,0 +1,183 @@
+"""
+Context Packing - Turns retrieved chunks into a compact prompt context
+
+Retrieved chunks from the same file often overlap (chunk_overlap) or sit right
+next to each other. Instead of pasting them one after another, this module:
+- Groups chunks by their `source` file (in retrieval rank order)
+- Merges overlapping and adjacent ranges back into continuous spans
+- Drops duplicated chunks and spans contained in another span
+- Packs the result under a token budget with a header per file
+"""
+
+from typing import Dict, List, Optional
+from langchain_core.documents import Document
+from src.config.settings import settings
+
+# Rough chars-per-token ratio used to estimate prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Chunks separated by at most this many characters (whitespace stripped by the
+# splitter) are treated as adjacent and merged into one span
+ADJACENT_GAP = 2
+
+# Minimum overlap (in chars) to merge two chunks that have no start_index
+MIN_TEXT_OVERLAP = 20
+
+SPAN_SEPARATOR = "\n...\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of a text using a fixed chars-per-token ratio."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _text_overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of `left` that is a prefix of `right`."""
+    max_len = min(len(left), len(right))
+    for size in range(max_len, MIN_TEXT_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _merge_positioned(chunks: List[Document]) -> List[str]:
+    """Merge chunks that carry a `start_index` into continuous spans."""
+    ordered = sorted(chunks, key=lambda d: d.metadata["start_index"])
+    spans = []
+    span_start = span_end = None
+    span_text = ""
+
+    for doc in ordered:
+        start = doc.metadata["start_index"]
+        text = doc.page_content
+        end = start + len(text)
+
+        if span_end is not None and start <= span_end + ADJACENT_GAP:
+            if end > span_end:
+                if start >= span_end:
+                    span_text += "\n" + text
+                else:
+                    span_text += text[span_end - start:]
+                span_end = end
+            # else: chunk is fully contained in the current span
+            continue
+
+        if span_end is not None:
+            spans.append(span_text)
+        span_start, span_end, span_text = start, end, text
+
+    if span_start is not None:
+        spans.append(span_text)
+    return spans
+
+
+def _merge_by_text(chunks: List[Document]) -> List[str]:
+    """Merge chunks without position info by detecting textual overlaps."""
+    spans: List[str] = []
+    for doc in chunks:
+        text = doc.page_content
+        if any(text in span for span in spans):
+            continue
+
+        merged = False
+        for i, span in enumerate(spans):
+            if span in text:
+                spans[i] = text
+                merged = True
+                break
+            overlap = _text_overlap(span, text)
+            if overlap:
+                spans[i] = span + text[overlap:]
+                merged = True
+                break
+            overlap = _text_overlap(text, span)
+            if overlap:
+                spans[i] = text + span[overlap:]
+                merged = True
+                break
+
+        if not merged:
+            spans.append(text)
+    return spans
+
+
+def group_by_source(docs: List[Document]) -> Dict[str, List[str]]:
+    """
+    Groups retrieved chunks by source file and merges them into spans.
+
+    Args:
+        docs: Retrieved documents, best match first
+
+    Returns:
+        Ordered mapping of source -> merged, de-duplicated text spans.
+        Sources keep the rank of their best chunk.
+    """
+    grouped: Dict[str, List[Document]] = {}
+    for doc in docs:
+        source = doc.metadata.get("source", "Unknown Source")
+        grouped.setdefault(source, [])
+        # Exact duplicates happen when a repo was ingested more than once
+        if any(d.page_content == doc.page_content for d in grouped[source]):
+            continue
+        grouped[source].append(doc)
+
+    result = {}
+    for source, chunks in grouped.items():
+        positioned = [d for d in chunks if "start_index" in d.metadata]
+        unpositioned = [d for d in chunks if "start_index" not in d.metadata]
+        spans = _merge_positioned(positioned) if positioned else []
+        if unpositioned:
+            spans = _merge_by_text(
+                [Document(page_content=s) for s in spans] + unpositioned
+            )
+        result[source] = spans
+    return result
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly `max_tokens`, preferring a line boundary."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    newline = cut.rfind("\n")
+    if newline > max_chars // 2:
+        cut = cut[:newline]
+    return cut + "\n[...truncated]"
+
+
+def pack_context(docs: List[Document], token_budget: Optional[int] = None) -> str:
+    """
+    Builds the prompt context from retrieved chunks.
+
+    Args:
+        docs: Retrieved documents, best match first
+        token_budget: Max estimated tokens for the context
+                      (defaults to settings.RAG_CONTEXT_TOKEN_BUDGET)
+
+    Returns:
+        Context string with one `### File:` section per source file
+    """
+    if token_budget is None:
+        token_budget = settings.RAG_CONTEXT_TOKEN_BUDGET
+
+    sections = []
+    remaining = token_budget
+
+    for source, spans in group_by_source(docs).items():
+        header = f"### File: {source}\n"
+        header_tokens = estimate_tokens(header)
+        if remaining <= header_tokens:
+            break
+
+        body = SPAN_SEPARATOR.join(spans)
+        body_budget = remaining - header_tokens
+        if estimate_tokens(body) > body_budget:
+            body = _truncate_to_tokens(body, body_budget)
+            sections.append(header + body)
+            break
+
+        sections.append(header + body)
+        remaining -= header_tokens + estimate_tokens(body)
+
+    return "\n\n".join(sections)
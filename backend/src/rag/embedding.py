@@ -1,19 +1,84 @@
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from langchain_core.embeddings import Embeddings
 import os
 from langchain_qdrant import FastEmbedSparse
+from src.utils.singleflight import SingleFlight
 google_apikey=os.getenv("GEMINI_API_KEY")
 
+DENSE_MODEL = "gemini-embedding-001"
+SPARSE_MODEL = "Qdrant/bm25"
+
+# Concurrent retrievals of the same question share one remote embed call
+_embed_flight = SingleFlight("embed_query")
+
+
+class SingleFlightEmbeddings(Embeddings):
+    """Wraps an embeddings model so identical concurrent embed_query calls are coalesced."""
+
+    def __init__(self, inner: Embeddings, model: str):
+        self.inner = inner
+        self.model = model
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        return _embed_flight.do((self.model, text), self.inner.embed_query, text)
+
+
+# Stand-ins for offline runs (set_embeddings); None = the real models
+_dense_override = None
+_sparse_override = None
+
+
+# Query-side embedders (cached), built once per process
+_query_embeddings = None
+
+
+def set_embeddings(dense: Embeddings | None = None, sparse=None) -> None:
+    """Use these embeddings instead of Gemini / FastEmbed (benchmarks, load tests)."""
+    global _dense_override, _sparse_override, _query_embeddings
+    _dense_override, _sparse_override = dense, sparse
+    _query_embeddings = None
+
+
 def get_dense_vector():
+    if _dense_override is not None:
+        return _dense_override
 
     dense_vector= GoogleGenerativeAIEmbeddings(
-        model="gemini-embedding-001",
+        model=DENSE_MODEL,
         google_api_key=google_apikey
     )
-    return dense_vector
+    return SingleFlightEmbeddings(dense_vector, DENSE_MODEL)
 
 
 
 def get_sparse_vector():
-    sparse_vector=FastEmbedSparse(model_name="Qdrant/bm25")
-    return sparse_vector
\ No newline at end of file
+    if _sparse_override is not None:
+        return _sparse_override
+    sparse_vector=FastEmbedSparse(model_name=SPARSE_MODEL)
+    return sparse_vector
+
+
+def get_query_embeddings():
+    """
+    (dense, sparse) embedders for retrieval, shared by all queries.
+
+    embed_query goes through the query embedding cache (cache first, then
+    one single-flight remote call on a miss); the clients and the FastEmbed
+    model are created once instead of per question.
+    """
+    global _query_embeddings
+    if _query_embeddings is None:
+        from .embedding_cache import CachedEmbeddings, CachedSparseEmbeddings, get_embedding_cache
+        cache = get_embedding_cache()
+        dense, sparse = get_dense_vector(), get_sparse_vector()
+        dense_model = getattr(dense, "model", None) or type(dense).__name__
+        sparse_model = SPARSE_MODEL if _sparse_override is None else type(sparse).__name__
+        _query_embeddings = (
+            CachedEmbeddings(dense, dense_model, cache),
+            CachedSparseEmbeddings(sparse, sparse_model, cache),
+        )
+    return _query_embeddings
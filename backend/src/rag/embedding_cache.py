@@ -0,0 +1,287 @@
+"""
+Query Embedding Cache - Skip the embed round trip for repeated questions
+
+Wraps the dense (Gemini) and sparse (FastEmbed BM25) query embedders used
+by connect_to_vector_store:
+- keyed on (model, normalized question text), values stored as packed
+  float32 bytes (Qdrant stores float32 anyway), so a 3072-dim vector costs
+  12 KB instead of ~100 KB of Python floats
+- LRU bounded by EMBED_CACHE_MAX_BYTES
+- optional SQLite file (EMBED_CACHE_PATH) behind the memory tier, so cached
+  embeddings survive restarts and are shared by workers on the same host
+- hit/miss counts per tier in CACHE_REQUESTS, memory use in CACHE_BYTES
+
+Document embeddings (ingestion) are not cached.
+"""
+
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant.sparse_embeddings import SparseEmbeddings, SparseVector
+
+from src.config.settings import settings
+from src.observability.metrics import CACHE_BYTES, CACHE_REQUESTS
+
+# Rough per-entry cost of the key string and OrderedDict slot in the byte budget
+ENTRY_OVERHEAD_BYTES = 200
+
+# Trim the disk tier every this many writes
+DISK_TRIM_EVERY = 500
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive cache key (the embedder is called with this text too)."""
+    return " ".join(text.split())
+
+
+# --- Codecs ---------------------------------------------------------------
+# Payloads are little-endian uint32/float32 whatever the host, so a SQLite
+# tier can be read by any worker that opens it
+
+_BIG_ENDIAN = sys.byteorder == "big"
+# array typecode of a 4-byte unsigned int ("I" on all common platforms)
+_UINT32 = next(code for code in ("I", "L") if array(code).itemsize == 4)
+
+
+def _pack(typecode: str, values) -> bytes:
+    packed = array(typecode, values)
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode: str, payload: bytes) -> list:
+    values = array(typecode)
+    values.frombytes(payload)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values.tolist()
+
+
+def encode_dense(vector: list[float]) -> bytes:
+    return _pack("f", vector)
+
+
+def decode_dense(payload: bytes) -> list[float]:
+    return _unpack("f", payload)
+
+
+def encode_sparse(vector: SparseVector) -> bytes:
+    return (struct.pack("<I", len(vector.indices)) + _pack(_UINT32, vector.indices)
+            + _pack("f", vector.values))
+
+
+def decode_sparse(payload: bytes) -> SparseVector:
+    (count,) = struct.unpack_from("<I", payload)
+    return SparseVector(indices=_unpack(_UINT32, payload[4:4 + 4 * count]),
+                        values=_unpack("f", payload[4 + 4 * count:]))
+
+
+# --- Cache ----------------------------------------------------------------
+
+class EmbeddingCache:
+    """
+    Thread-safe byte-bounded LRU of encoded embeddings, with an optional SQLite tier.
+
+    Args:
+        max_bytes: Memory budget of the LRU tier
+        path: SQLite file for the disk tier (None = memory only)
+        disk_max_entries: Rows kept on disk; the least recently used are trimmed
+        name: Label for the cache metrics
+    """
+
+    def __init__(self, max_bytes: int, path: Optional[str] = None,
+                 disk_max_entries: int = 200_000, name: str = "query_embedding"):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.disk_max_entries = disk_max_entries
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._disk_writes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str, metric: Optional[str] = None) -> Optional[bytes]:
+        metric = metric or self.name
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        if payload is not None:
+            CACHE_REQUESTS.labels(metric, "hit").inc()
+            return payload
+        CACHE_REQUESTS.labels(metric, "miss").inc()
+
+        if self.path:
+            payload = self._disk_get(key)
+            CACHE_REQUESTS.labels(f"{metric}_disk", "hit" if payload is not None else "miss").inc()
+            if payload is not None:
+                self._remember(key, payload)
+        return payload
+
+    def set(self, key: str, payload: bytes) -> None:
+        self._remember(key, payload)
+        if self.path:
+            self._disk_set(key, payload)
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes], metric: Optional[str] = None) -> bytes:
+        payload = self.get(key, metric)
+        if payload is None:
+            payload = compute()
+            self.set(key, payload)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        CACHE_BYTES.labels(self.name).set(0)
+
+    def close(self) -> None:
+        with self._disk_lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    # --- Memory tier ------------------------------------------------------
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        size = len(payload) + len(key) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old) + len(key) + ENTRY_OVERHEAD_BYTES
+            self._entries[key] = payload
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_payload = self._entries.popitem(last=False)
+                self._bytes -= len(old_payload) + len(old_key) + ENTRY_OVERHEAD_BYTES
+            nbytes = self._bytes
+        CACHE_BYTES.labels(self.name).set(nbytes)
+
+    # --- Disk tier --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file on first use (disk lock held)."""
+        if self._disk is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._disk = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            # WAL lets workers on the same host read while one of them writes
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute("PRAGMA synchronous=NORMAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, used REAL NOT NULL)"
+            )
+            self._disk.execute("CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used)")
+        return self._disk
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        try:
+            with self._disk_lock:
+                db = self._connect()
+                row = db.execute("SELECT value FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE embeddings SET used = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+            return bytes(row[0]) if row is not None else None
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding cache read failed ({self.path}): {e}")
+            return None
+
+    def _disk_set(self, key: str, payload: bytes) -> None:
+        try:
+            with self._disk_lock:
+                db = self._connect()
+                db.execute("INSERT OR REPLACE INTO embeddings (key, value, used) VALUES (?, ?, ?)",
+                           (key, payload, time.time()))
+                self._disk_writes += 1
+                if self._disk_writes % DISK_TRIM_EVERY == 0:
+                    db.execute(
+                        "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings "
+                        "ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.disk_max_entries,)
+                    )
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding cache write failed ({self.path}): {e}")
+
+
+# --- Embedder wrappers ----------------------------------------------------
+
+class CachedEmbeddings(Embeddings):
+    """Dense embedder whose embed_query goes through an EmbeddingCache."""
+
+    def __init__(self, inner: Embeddings, model: str, cache: EmbeddingCache):
+        self.inner = inner
+        self.model = model
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        text = normalize_text(text)
+        payload = self.cache.get_or_compute(
+            f"dense\x00{self.model}\x00{text}",
+            lambda: encode_dense(self.inner.embed_query(text)),
+            metric=f"{self.cache.name}_dense",
+        )
+        return decode_dense(payload)
+
+
+class CachedSparseEmbeddings(SparseEmbeddings):
+    """Sparse embedder whose embed_query goes through an EmbeddingCache."""
+
+    def __init__(self, inner: SparseEmbeddings, model: str, cache: EmbeddingCache):
+        self.inner = inner
+        self.model = model
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        text = normalize_text(text)
+        payload = self.cache.get_or_compute(
+            f"sparse\x00{self.model}\x00{text}",
+            lambda: encode_sparse(self.inner.embed_query(text)),
+            metric=f"{self.cache.name}_sparse",
+        )
+        return decode_sparse(payload)
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """The process-wide query embedding cache, built from settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(
+                    max_bytes=settings.EMBED_CACHE_MAX_BYTES,
+                    path=settings.EMBED_CACHE_PATH or None,
+                    disk_max_entries=settings.EMBED_CACHE_DISK_MAX_ENTRIES,
+                )
+    return _cache
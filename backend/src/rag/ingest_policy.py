@@ -0,0 +1,553 @@
+"""
+Ingestion Policy - Decide which repository files get chunked and embedded
+
+Lock files, minified bundles, vendored dependencies and giant fixtures used
+to dominate chunk counts and embedding spend. Each file of a clone is checked
+in this order, and the first rule that matches gives the skip reason:
+- exclude globs                                            -> excluded
+- extension allow-list                                     -> extension
+- .gitattributes binary / -diff / -text                    -> binary
+- .gitignore rules (committed build output, etc.)          -> gitignore
+- linguist-vendored, or a vendored path (node_modules/, vendor/, third_party/, ...)
+                                                           -> vendored
+- linguist-generated, or a generated path (lock files, *.min.js, *_pb2.py, ...)
+                                                           -> generated
+- file size above max_file_bytes                           -> size
+- on the first SAMPLE_BYTES: NUL bytes -> binary, a generated header
+  ("@generated", "DO NOT EDIT", ...) -> generated, a line longer than
+  max_line_length -> long_lines, minifiable files (.js, .css, .json, ...)
+  with an average line above minified_avg_line -> minified
+
+Include globs re-admit files skipped for extension, gitignore, vendored or
+generated; size and content heuristics still apply to them. Repos can opt
+files back in themselves with `linguist-vendored=false` or
+`linguist-generated=false` in .gitattributes, like on GitHub.
+
+Defaults come from the INGEST_* settings. Per-repo overrides are read from
+the JSON file at INGEST_POLICY_FILE:
+    {
+      "default": {"max_file_bytes": 200000},
+      "repos": {"vercel/next.js": {"exclude": ["examples/**"], "include": ["docs/**/*.mdx"]}}
+    }
+Keys are IngestPolicy field names.
+"""
+
+import heapq
+import json
+import os
+import re
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.observability.metrics import INGEST_BYTES, INGEST_FILES
+
+SUPPORTED_EXTENSIONS = (".py", ".md", ".txt", ".json", ".toml", ".js", ".ts", ".html", ".css", ".java")
+
+# Files that minifiers and serializers produce as a few very long lines
+MINIFIABLE_EXTENSIONS = (".js", ".css", ".json", ".html", ".ts", ".svg", ".map")
+
+# Bytes read from the head of a file for the content heuristics
+SAMPLE_BYTES = 64 * 1024
+
+# Files shorter than this are never considered minified
+MINIFIED_MIN_BYTES = 1024
+
+# Lines of the file header searched for a "generated" marker
+HEADER_LINES = 5
+
+# Subset of github-linguist's vendor.yml
+VENDORED_PATHS = re.compile("|".join((
+    r"(^|/)node_modules/",
+    r"(^|/)bower_components/",
+    r"(^|/)jspm_packages/",
+    r"(^|/)vendors?/",
+    r"(^|/)third[-_]?party/",
+    r"(^|/)3rd[-_]?party/",
+    r"(^|/)external/",
+    r"(^|/)extern/",
+    r"^deps/",
+    r"(^|/)dist/",
+    r"(^|/)\.yarn/",
+    r"(^|/)Godeps/_workspace/",
+    r"(^|/)\.?venv/",
+    r"(^|/)site-packages/",
+    r"(^|/)Pods/",
+    r"(^|/)Carthage/",
+    r"(^|/)jquery[^/]*\.js$",
+    r"(^|/)bootstrap[^/]*\.(js|css)$",
+    r"(^|/)(d3|lodash|underscore|moment|react(-dom)?)(\.min)?\.js$",
+)))
+
+# Subset of github-linguist's generated.rb (path based checks)
+GENERATED_PATHS = re.compile("|".join((
+    r"(^|/)package-lock\.json$",
+    r"(^|/)npm-shrinkwrap\.json$",
+    r"(^|/)yarn\.lock$",
+    r"(^|/)pnpm-lock\.yaml$",
+    r"(^|/)bun\.lockb?$",
+    r"(^|/)composer\.lock$",
+    r"(^|/)Gemfile\.lock$",
+    r"(^|/)Cargo\.lock$",
+    r"(^|/)poetry\.lock$",
+    r"(^|/)Pipfile\.lock$",
+    r"(^|/)uv\.lock$",
+    r"(^|/)go\.sum$",
+    r"(^|/)flake\.lock$",
+    r"\.min\.(js|css|json)$",
+    r"[.-]bundle\.js$",
+    r"\.map$",
+    r"_pb2(_grpc)?\.pyi?$",
+    r"\.pb\.(go|cc|h)$",
+    r"\.g\.dart$",
+    r"\.generated\.[^/]+$",
+    r"\.designer\.(cs|vb)$",
+    r"(^|/)__snapshots__/",
+    r"\.snap$",
+    r"(^|/)coverage/",
+    r"(^|/)\.next/",
+    r"(^|/)build/generated/",
+)))
+
+GENERATED_HEADER = re.compile(
+    r"@generated|\bauto-?generated\b|\bdo not (edit|modify)\b|\bcode generated by\b"
+    r"|\bthis file (is|was|has been) (automatically )?generated\b",
+    re.IGNORECASE,
+)
+
+
+def is_vendored(path: str) -> bool:
+    return VENDORED_PATHS.search(path) is not None
+
+
+def is_generated(path: str) -> bool:
+    return GENERATED_PATHS.search(path) is not None
+
+
+# --- Gitignore-style globs ------------------------------------------------
+
+def compile_glob(pattern: str) -> "re.Pattern":
+    """
+    Compile a .gitignore-style glob (without '!' or a trailing '/') to a regex.
+
+    Patterns containing a '/' are anchored to their base directory, the
+    others match a file or directory name at any depth.
+    """
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(("" if anchored else "(?:.*/)?") + "".join(out) + "$")
+
+
+@dataclass(frozen=True, slots=True)
+class _GlobRule:
+    regex: "re.Pattern"
+    negate: bool
+    dir_only: bool
+
+
+class GlobRules:
+    """
+    Ordered .gitignore-style rules, possibly from several files.
+
+    match(path) follows git: the last matching rule wins, rules of deeper
+    directories come after those of their parents, and nothing below an
+    excluded directory can be re-included.
+    """
+
+    def __init__(self):
+        self._groups: List[Tuple[str, List[_GlobRule]]] = []
+
+    @classmethod
+    def from_lines(cls, lines, base: str = "") -> "GlobRules":
+        rules = cls()
+        rules.add(lines, base)
+        return rules
+
+    def __bool__(self) -> bool:
+        return any(rules for _, rules in self._groups)
+
+    def add(self, lines, base: str = "") -> None:
+        """Add the rules of one file whose directory (relative to the repo root) is base."""
+        rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                rules.append(_GlobRule(compile_glob(line), negate, dir_only))
+        if rules:
+            self._groups.append((base.strip("/"), rules))
+            self._groups.sort(key=lambda group: group[0].count("/") + bool(group[0]))
+
+    def match(self, path: str) -> bool:
+        parts = path.split("/")
+        for depth in range(1, len(parts)):
+            if self._last_match("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self._last_match(path, is_dir=False)
+
+    def _last_match(self, path: str, is_dir: bool) -> bool:
+        matched = False
+        for base, rules in self._groups:
+            if base and not path.startswith(base + "/"):
+                continue
+            relative = path[len(base) + 1:] if base else path
+            for rule in rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                if rule.regex.match(relative):
+                    matched = not rule.negate
+        return matched
+
+
+class GitAttributes:
+    """.gitattributes files of a checkout; attributes(path) gives the effective values."""
+
+    def __init__(self):
+        self._rules: List[Tuple[str, "re.Pattern", Dict[str, object]]] = []
+
+    def add(self, lines, base: str = "") -> None:
+        base = base.strip("/")
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith("#") or parts[0].startswith("[attr]"):
+                continue
+            attrs = {}
+            for attr in parts[1:]:
+                if attr.startswith("-"):
+                    attrs[attr[1:]] = False
+                elif attr.startswith("!"):
+                    attrs[attr[1:]] = None
+                elif "=" in attr:
+                    name, value = attr.split("=", 1)
+                    attrs[name] = {"true": True, "false": False}.get(value.lower(), value)
+                else:
+                    attrs[attr] = True
+            if attrs:
+                self._rules.append((base, compile_glob(parts[0].rstrip("/")), attrs))
+        self._rules.sort(key=lambda rule: rule[0].count("/") + bool(rule[0]))
+
+    def attributes(self, path: str) -> Dict[str, object]:
+        result: Dict[str, object] = {}
+        for base, regex, attrs in self._rules:
+            if base and not path.startswith(base + "/"):
+                continue
+            if regex.match(path[len(base) + 1:] if base else path):
+                result.update(attrs)
+        return {name: value for name, value in result.items() if value is not None}
+
+
+class RepoRules:
+    """The .gitignore and .gitattributes files of a checkout, read once per load."""
+
+    def __init__(self, gitignore: Optional[GlobRules] = None, gitattributes: Optional[GitAttributes] = None):
+        self.gitignore = gitignore or GlobRules()
+        self.gitattributes = gitattributes or GitAttributes()
+
+    @classmethod
+    def load(cls, root: str) -> "RepoRules":
+        rules = cls()
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            base = os.path.relpath(directory, root).replace(os.sep, "/")
+            base = "" if base == "." else base
+            for name, target in ((".gitignore", rules.gitignore), (".gitattributes", rules.gitattributes)):
+                if name in filenames:
+                    try:
+                        with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                            target.add(f.readlines(), base)
+                    except OSError:
+                        continue
+        return rules
+
+
+# --- Policy -----------------------------------------------------------------
+
+@dataclass
+class IngestPolicy:
+    """
+    Which files of a repository are worth embedding.
+
+    Args:
+        extensions: File name endings that are ingested
+        max_file_bytes: Larger files are skipped
+        max_line_length: Files with a longer line are skipped (data blobs, minified code)
+        minified_avg_line: Minifiable files with a longer average line are skipped
+        skip_generated: Skip lock files, build output and files with a generated header
+        skip_vendored: Skip third-party code (node_modules/, vendor/, ...)
+        respect_gitignore: Skip committed files that .gitignore rules match
+        respect_gitattributes: Honour linguist-generated/-vendored and binary attributes
+        include: Globs re-admitted despite extension/gitignore/vendored/generated
+        exclude: Globs that are always skipped
+    """
+    extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS
+    max_file_bytes: int = 256 * 1024
+    max_line_length: int = 5000
+    minified_avg_line: int = 300
+    skip_generated: bool = True
+    skip_vendored: bool = True
+    respect_gitignore: bool = True
+    respect_gitattributes: bool = True
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    _include: GlobRules = field(init=False, repr=False, compare=False)
+    _exclude: GlobRules = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.extensions = tuple(self.extensions)
+        self.include, self.exclude = tuple(self.include), tuple(self.exclude)
+        self._include = GlobRules.from_lines(self.include)
+        self._exclude = GlobRules.from_lines(self.exclude)
+
+    def with_overrides(self, overrides: dict) -> "IngestPolicy":
+        known = {f.name for f in fields(self) if f.init}
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"Unknown ingest policy option(s): {', '.join(sorted(unknown))}")
+        return replace(self, **overrides)
+
+    def check(self, path: str, size: Optional[int] = None, rules: Optional[RepoRules] = None,
+              read_sample: Optional[Callable[[], bytes]] = None) -> Optional[str]:
+        """
+        Skip reason for a file, or None to ingest it.
+
+        Args:
+            path: Path relative to the repository root, '/'-separated
+            size: File size in bytes (None = unknown, size cap not applied)
+            rules: .gitignore/.gitattributes of the checkout, if there is one
+            read_sample: Returns the first SAMPLE_BYTES of the file; only
+                called when the cheaper path checks pass
+        """
+        included = bool(self._include) and self._include.match(path)
+        if self._exclude and self._exclude.match(path):
+            return "excluded"
+        if not included and not path.endswith(self.extensions):
+            return "extension"
+
+        attrs = rules.gitattributes.attributes(path) if rules and self.respect_gitattributes else {}
+        if attrs.get("binary") is True or attrs.get("diff") is False or attrs.get("text") is False:
+            return "binary"
+        if not included:
+            if rules and self.respect_gitignore and rules.gitignore.match(path):
+                return "gitignore"
+            if self.skip_vendored and attrs.get("linguist-vendored", is_vendored(path)) is True:
+                return "vendored"
+            if self.skip_generated and attrs.get("linguist-generated", is_generated(path)) is True:
+                return "generated"
+
+        if size is not None and size > self.max_file_bytes:
+            return "size"
+        if read_sample is None:
+            return None
+        check_header = self.skip_generated and not included and attrs.get("linguist-generated") is not False
+        return self._check_content(path, read_sample(), check_header)
+
+    def _check_content(self, path: str, sample: bytes, check_header: bool) -> Optional[str]:
+        if b"\0" in sample:
+            return "binary"
+        text = sample.decode("utf-8", errors="replace")
+        lines = text.splitlines()
+        if len(sample) >= SAMPLE_BYTES and len(lines) > 1:
+            lines.pop()  # cut off mid-line
+        if check_header and GENERATED_HEADER.search("\n".join(lines[:HEADER_LINES])):
+            return "generated"
+        if not lines:
+            return None
+        if max(len(line) for line in lines) > self.max_line_length:
+            return "long_lines"
+        if (path.endswith(MINIFIABLE_EXTENSIONS) and len(sample) >= MINIFIED_MIN_BYTES
+                and sum(len(line) for line in lines) / len(lines) > self.minified_avg_line):
+            return "minified"
+        return None
+
+
+def default_policy() -> IngestPolicy:
+    """The policy from the INGEST_* settings, before per-repo overrides."""
+    return IngestPolicy(
+        max_file_bytes=settings.INGEST_MAX_FILE_BYTES,
+        max_line_length=settings.INGEST_MAX_LINE_LENGTH,
+        minified_avg_line=settings.INGEST_MINIFIED_AVG_LINE,
+        skip_generated=settings.INGEST_SKIP_GENERATED,
+        skip_vendored=settings.INGEST_SKIP_VENDORED,
+        respect_gitignore=settings.INGEST_RESPECT_GITIGNORE,
+        include=tuple(settings.INGEST_INCLUDE),
+        exclude=tuple(settings.INGEST_EXCLUDE),
+    )
+
+
+def get_ingest_policy(repo: Optional[str] = None) -> IngestPolicy:
+    """
+    The policy for one repo: settings, then the "default" and "repos" entries
+    of INGEST_POLICY_FILE (read on every call, so edits apply to the next ingestion).
+    """
+    policy = default_policy()
+    if not settings.INGEST_POLICY_FILE:
+        return policy
+    with open(settings.INGEST_POLICY_FILE, encoding="utf-8") as f:
+        config = json.load(f)
+    policy = policy.with_overrides(config.get("default", {}))
+    if repo:
+        repos = {name.lower(): overrides for name, overrides in config.get("repos", {}).items()}
+        policy = policy.with_overrides(repos.get(repo.lower(), {}))
+    return policy
+
+
+# --- Report -----------------------------------------------------------------
+
+class SkipReport:
+    """
+    What one load kept and skipped, with the bytes saved per reason.
+
+    Args:
+        repo: owner/name, for the log line
+        examples: Number of largest skipped files to keep for the summary
+    """
+
+    def __init__(self, repo: str = "", examples: int = 5):
+        self.repo = repo
+        self.examples = examples
+        self.kept_files = 0
+        self.kept_bytes = 0
+        self.skipped: Dict[str, List[int]] = {}
+        self._largest: List[Tuple[int, str, str]] = []
+
+    def keep(self, path: str, size: int) -> None:
+        self.kept_files += 1
+        self.kept_bytes += size
+        INGEST_FILES.labels("kept").inc()
+        INGEST_BYTES.labels("kept").inc(size)
+
+    def skip(self, path: str, size: int, reason: str) -> None:
+        counts = self.skipped.setdefault(reason, [0, 0])
+        counts[0] += 1
+        counts[1] += size
+        INGEST_FILES.labels(reason).inc()
+        INGEST_BYTES.labels(reason).inc(size)
+        if self.examples:
+            item = (size, path, reason)
+            if len(self._largest) < self.examples:
+                heapq.heappush(self._largest, item)
+            else:
+                heapq.heappushpop(self._largest, item)
+
+    @property
+    def skipped_files(self) -> int:
+        return sum(files for files, _ in self.skipped.values())
+
+    @property
+    def bytes_saved(self) -> int:
+        return sum(nbytes for _, nbytes in self.skipped.values())
+
+    @property
+    def largest_skipped(self) -> List[Tuple[int, str, str]]:
+        return sorted(self._largest, reverse=True)
+
+    def as_dict(self) -> dict:
+        return {
+            "repo": self.repo,
+            "kept_files": self.kept_files,
+            "kept_bytes": self.kept_bytes,
+            "skipped_files": self.skipped_files,
+            "bytes_saved": self.bytes_saved,
+            "by_reason": {reason: {"files": files, "bytes": nbytes}
+                          for reason, (files, nbytes) in sorted(self.skipped.items())},
+            "largest_skipped": [{"path": path, "bytes": size, "reason": reason}
+                                for size, path, reason in self.largest_skipped],
+        }
+
+    def summary(self) -> str:
+        if not self.skipped:
+            return f"🧹 Ingestion policy: kept all {self.kept_files} files of {self.repo or 'repo'}"
+        total = self.kept_bytes + self.bytes_saved
+        share = self.bytes_saved / total * 100 if total else 0.0
+        reasons = ", ".join(f"{files} {reason} ({_mb(nbytes)})"
+                            for reason, (files, nbytes) in sorted(self.skipped.items(), key=lambda kv: -kv[1][1]))
+        lines = [f"🧹 Ingestion policy: kept {self.kept_files} files ({_mb(self.kept_bytes)}), "
+                 f"skipped {self.skipped_files} ({_mb(self.bytes_saved)}, {share:.0f}% of bytes): {reasons}"]
+        lines += [f"   - {path} [{reason}, {_mb(size)}]" for size, path, reason in self.largest_skipped if size]
+        return "\n".join(lines)
+
+
+def _mb(nbytes: int) -> str:
+    return f"{nbytes / 1024 / 1024:.1f} MB" if nbytes >= 100 * 1024 else f"{nbytes / 1024:.1f} KB"
+
+
+class RepoFilter:
+    """
+    GitLoader file_filter applying a policy to the files of a clone.
+
+    The .gitignore/.gitattributes files are read on the first call (after
+    GitLoader has cloned the repo); every decision is recorded in report.
+    Pass a `listing` dict to also collect path -> size of every file of the
+    checkout that .gitignore doesn't match, whatever the policy decides
+    (the repo index builds its file tree from it).
+    """
+
+    def __init__(self, repo_path: str, policy: IngestPolicy, report: SkipReport,
+                 listing: Optional[Dict[str, int]] = None):
+        self.repo_path = repo_path
+        self.policy = policy
+        self.report = report
+        self.listing = listing
+        self._rules: Optional[RepoRules] = None
+
+    def __call__(self, file_path: str) -> bool:
+        if self._rules is None:
+            wants_rules = self.policy.respect_gitignore or self.policy.respect_gitattributes
+            self._rules = RepoRules.load(self.repo_path) if wants_rules else RepoRules()
+        path = os.path.relpath(file_path, self.repo_path).replace(os.sep, "/")
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False
+        if self.listing is not None and not (self.policy.respect_gitignore and self._rules.gitignore.match(path)):
+            self.listing[path] = size
+
+        def read_sample() -> bytes:
+            with open(file_path, "rb") as f:
+                return f.read(SAMPLE_BYTES)
+
+        try:
+            reason = self.policy.check(path, size, self._rules, read_sample)
+        except OSError:
+            return False
+        if reason:
+            self.report.skip(path, size, reason)
+            return False
+        self.report.keep(path, size)
+        return True
@@ -3,22 +3,57 @@ from langchain_community.document_loaders import GitLoader
 
 import shutil
 import os
+import tempfile
 
-def load_repo(url : str):
-    repo_path = "./data/repo"
-    if os.path.exists(repo_path):
-        shutil.rmtree(repo_path)
-        
-    loader = GitLoader(
-        clone_url=url,
-        branch="main",
-        repo_path=repo_path,
-        file_filter=lambda file_path: file_path.endswith((".py", ".md", ".txt", ".json", ".toml" , ".js" , ".ts" , ".html" , ".css" , "java"))
-    )
-    docs = loader.load()
+from src.config.settings import settings
+from .ingest_policy import SUPPORTED_EXTENSIONS, IngestPolicy, RepoFilter, SkipReport, get_ingest_policy
+
+def is_supported_file(file_path: str) -> bool:
+    return file_path.endswith(SUPPORTED_EXTENSIONS)
+
+def load_repo(url : str, repo_path: str | None = None, branch: str = "main",
+              policy: IngestPolicy | None = None, report: SkipReport | None = None,
+              listing: dict | None = None):
+    """
+    Clone a repo and load the files its ingestion policy keeps as Documents.
+
+    Each call clones into its own directory under REPO_CLONE_DIR (removed
+    once the files are loaded), so concurrent ingestions in several
+    threads or workers never share a working tree. Pass repo_path to clone
+    somewhere specific instead (it is replaced, and kept afterwards).
+
+    policy defaults to get_ingest_policy(owner/name); pass a SkipReport to
+    get the skipped files and bytes saved (they are printed either way).
+    Pass a dict as `listing` to get path -> size of every file in the clone
+    that .gitignore doesn't match, including those the policy skips.
+    """
+    repo = url.rstrip("/").removesuffix(".git").split("github.com/")[-1]
+    policy = policy or get_ingest_policy(repo)
+    report = report if report is not None else SkipReport(repo)
+
+    keep = repo_path is not None
+    if keep:
+        if os.path.exists(repo_path):
+            shutil.rmtree(repo_path)
+    else:
+        os.makedirs(settings.REPO_CLONE_DIR, exist_ok=True)
+        repo_path = tempfile.mkdtemp(prefix=f"{repo.replace('/', '__')}-", dir=settings.REPO_CLONE_DIR)
+
+    try:
+        loader = GitLoader(
+            clone_url=url,
+            branch=branch,
+            repo_path=repo_path,
+            file_filter=RepoFilter(repo_path, policy, report, listing)
+        )
+        docs = loader.load()
+    finally:
+        if not keep:
+            shutil.rmtree(repo_path, ignore_errors=True)
     print(f"Loaded {len(docs)} documents from {url}")
     for doc in docs:
         print(f"   - {doc.metadata.get('source', 'Unknown')}")
+    print(report.summary())
     return docs
 
 
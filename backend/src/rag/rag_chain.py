@@ -2,7 +2,10 @@ import os
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from .context import pack_context
+from src.observability.callbacks import TokenUsageCallback
+from src.observability.tracing import stage_span
 
 
 def format_docs(docs):
@@ -14,14 +17,31 @@ def format_docs(docs):
         print(f"   Content Snippet: {doc.page_content[:100]}...\n")
     print("-------------------------------------------\n")
 
-    return "\n\n".join(doc.page_content for doc in docs)
+    return pack_context(docs)
+
+# One LLM client shared by all RAG chains, built on first use
+_llm = None
+
+
+def get_rag_llm():
+    global _llm
+    if _llm is None:
+        _llm = ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            temperature=0,
+            google_api_key=os.getenv("GEMINI_API_KEY")
+        )
+    return _llm
+
+
+def set_rag_llm(llm) -> None:
+    """Replace the shared RAG LLM (e.g. a fake one for load tests); None resets it."""
+    global _llm
+    _llm = llm
+
 
 def get_rag_chain(retriever):
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0,
-        google_api_key=os.getenv("GEMINI_API_KEY")
-    )
+    llm = get_rag_llm()
 
     template = """You are a technical assistant for GitHub repositories.
     Use the following pieces of context to answer the question at the end.
@@ -36,11 +56,22 @@ def get_rag_chain(retriever):
     Answer:"""
     
     prompt = ChatPromptTemplate.from_template(template)
+    llm = llm.with_config(callbacks=[TokenUsageCallback("rag")])
+
+    def retrieve(question):
+        with stage_span("retrieve", action="hybrid") as span:
+            docs = retriever.invoke(question)
+            span.set_attribute("documents", len(docs))
+        return docs
+
+    def generate(prompt_value):
+        with stage_span("llm", action="rag"):
+            return llm.invoke(prompt_value)
 
     rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
+        {"context": RunnableLambda(retrieve) | format_docs, "question": RunnablePassthrough()}
         | prompt
-        | llm
+        | RunnableLambda(generate)
         | StrOutputParser()
     )
     
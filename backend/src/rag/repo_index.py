@@ -0,0 +1,475 @@
+"""
+Repository Index - File tree and top-level symbols of each ingested repo
+
+Built next to the vectors during ingestion (and kept current by webhook /
+warmer re-indexes), so structural questions don't go through vector search
+over 800-character chunks:
+- "Explain the folder structure of vercel/next.js" -> RepoTree
+- "Where is QueryClassifier defined?"               -> SymbolMatches
+
+The tree covers every file of the clone that .gitignore doesn't match, so
+file counts, sizes and languages describe the whole repo rather than only
+the files the ingestion policy embeds. Per file the index keeps path, size,
+line count, language and top-level symbols: classes, functions, methods,
+constants (Python via `ast`; JS/TS, Java and Markdown headings via line
+patterns). Symbols and line counts come from the loaded Documents only. The whole index is stored
+zlib-compressed JSON in the shared state backend under `repo_index:{repo}`,
+so every worker sees it; each process keeps the decoded indexes of recently
+asked repos in memory.
+
+answer_structural_query() is what the router calls before RAG retrieval; it
+returns None when the question isn't structural or the index can't answer
+it, and the question goes to the RAG chain as before.
+"""
+
+import ast
+import json
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.observability.tracing import stage_span
+from src.state import SharedDict, get_state
+from src.tools.results import RepoTree, SymbolLocation, SymbolMatches, TreeEntry
+
+INDEX_FORMAT = 1
+
+# Version (build time) of each repo's stored index; lets workers notice rebuilds
+index_versions = SharedDict("repo_index_versions")
+
+LANGUAGES = {
+    ".py": "Python", ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".java": "Java", ".md": "Markdown", ".mdx": "Markdown",
+    ".json": "JSON", ".toml": "TOML", ".html": "HTML", ".css": "CSS", ".txt": "Text",
+    # Listed in the tree, though the default policy doesn't embed them
+    ".go": "Go", ".rs": "Rust", ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".hpp": "C++",
+    ".cs": "C#", ".kt": "Kotlin", ".swift": "Swift", ".rb": "Ruby", ".php": "PHP", ".scss": "SCSS",
+    ".sh": "Shell", ".yml": "YAML", ".yaml": "YAML",
+}
+
+# Symbols kept per file (generated-looking files can define thousands)
+MAX_SYMBOLS_PER_FILE = 200
+# Symbols listed per file in tree answers
+TREE_SYMBOLS_PER_FILE = 5
+# Files listed per directory in tree answers; bigger directories are summarized
+TREE_FILES_PER_DIR = 15
+TREE_MAX_ENTRIES = 120
+TREE_DEPTH = 2
+SYMBOL_MAX_MATCHES = 10
+
+_JS_SYMBOL = re.compile(
+    r"^(?:export\s+(?:default\s+)?)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?"
+    r"(function\*?|class|interface|type|enum|const|let|var|namespace)\s+([A-Za-z_$][\w$]*)"
+)
+_JAVA_TYPE = re.compile(
+    r"^\s*(?:(?:public|protected|private|static|final|abstract|sealed|non-sealed|strictfp)\s+)*"
+    r"(class|interface|enum|record|@interface)\s+([A-Za-z_]\w*)"
+)
+_JAVA_METHOD = re.compile(
+    r"^(?: {4}|\t)(?:(?:public|protected|private|static|final|abstract|synchronized|native|default)\s+)+"
+    r"(?:<[^>]+>\s+)?[\w<>\[\],.? ]+?\s+([A-Za-z_]\w*)\s*\("
+)
+_MD_HEADING = re.compile(r"^(#{1,2})\s+(.+?)\s*#*\s*$")
+_JS_KINDS = {"function*": "function", "const": "variable", "let": "variable", "var": "variable"}
+
+
+def language_of(path: str) -> Optional[str]:
+    dot = path.rfind(".")
+    return LANGUAGES.get(path[dot:].lower()) if dot > path.rfind("/") else None
+
+
+# --- Symbol extraction --------------------------------------------------------
+
+def _python_symbols(text: str) -> List[Tuple[str, str, int]]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            symbols.append((node.name, "class", node.lineno))
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.append((f"{node.name}.{item.name}", "method", item.lineno))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append((node.name, "function", node.lineno))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    symbols.append((target.id, "variable", node.lineno))
+    return symbols
+
+
+def _line_symbols(text: str, language: str) -> List[Tuple[str, str, int]]:
+    symbols = []
+    current_class = None
+    in_fence = False
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if language in ("JavaScript", "TypeScript"):
+            m = _JS_SYMBOL.match(line)
+            if m:
+                symbols.append((m.group(2), _JS_KINDS.get(m.group(1), m.group(1)), lineno))
+        elif language == "Java":
+            m = _JAVA_TYPE.match(line)
+            if m:
+                if not line[:1].isspace():
+                    current_class = m.group(2)
+                symbols.append((m.group(2), "interface" if m.group(1) == "@interface" else m.group(1), lineno))
+                continue
+            m = _JAVA_METHOD.match(line)
+            if m and current_class and m.group(1) not in ("if", "for", "while", "switch", "return", "new"):
+                symbols.append((f"{current_class}.{m.group(1)}", "method", lineno))
+        elif language == "Markdown":
+            if line.lstrip().startswith(("```", "~~~")):
+                in_fence = not in_fence
+                continue
+            m = None if in_fence else _MD_HEADING.match(line)
+            if m:
+                symbols.append((m.group(2), "heading", lineno))
+        if len(symbols) >= MAX_SYMBOLS_PER_FILE:
+            break
+    return symbols
+
+
+def extract_symbols(path: str, text: str) -> List[Tuple[str, str, int]]:
+    """Top-level (name, kind, line) definitions of a file; [] for languages without a parser."""
+    language = language_of(path)
+    if language == "Python":
+        return _python_symbols(text)[:MAX_SYMBOLS_PER_FILE]
+    if language in ("JavaScript", "TypeScript", "Java", "Markdown"):
+        return _line_symbols(text, language)
+    return []
+
+
+# --- Index --------------------------------------------------------------------
+
+class RepoIndex:
+    """
+    Files and symbols of one repo.
+
+    files maps path -> [size, lines, language, [[name, kind, line], ...]]
+    (the stored JSON form, kept as is to make loading cheap). Files that
+    are listed but weren't loaded have lines None and no symbols.
+    """
+
+    def __init__(self, repo: str, files: Optional[Dict[str, list]] = None, built_at: Optional[float] = None):
+        self.repo = repo
+        self.files = files or {}
+        self.built_at = built_at or time.time()
+        self._tree = None
+        self._symbols = None
+
+    @classmethod
+    def from_documents(cls, repo: str, docs: Iterable, listing: Optional[Dict[str, int]] = None) -> "RepoIndex":
+        """Index the loaded Documents; `listing` (path -> size) adds the files that weren't loaded."""
+        index = cls(repo)
+        index.update(docs, listed=listing or {})
+        return index
+
+    def update(self, docs: Iterable = (), removed: Iterable[str] = (),
+               listed: Iterable[str] | Dict[str, int] = ()) -> None:
+        """
+        Add or replace the files of these Documents and drop removed paths.
+
+        Args:
+            docs: Loaded Documents (size, lines and symbols come from them)
+            removed: Paths to drop
+            listed: Paths that exist but weren't loaded (a path -> size dict,
+                    or paths whose last known size is kept, 0 when new)
+        """
+        for path in removed:
+            self.files.pop(path, None)
+        sizes = listed if isinstance(listed, dict) else {}
+        for path in listed:
+            known = self.files.get(path)
+            size = sizes.get(path, known[0] if known else 0)
+            self.files[path] = [size, None, language_of(path), []]
+        for doc in docs:
+            path = doc.metadata.get("source") or doc.metadata.get("file_path")
+            text = doc.page_content
+            self.files[path] = [len(text.encode("utf-8")), text.count("\n") + 1, language_of(path),
+                                [list(s) for s in extract_symbols(path, text)]]
+        self._tree = self._symbols = None
+
+    # --- Storage ----------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        payload = {"format": INDEX_FORMAT, "repo": self.repo, "built_at": self.built_at, "files": self.files}
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional["RepoIndex"]:
+        payload = json.loads(zlib.decompress(data))
+        if payload.get("format") != INDEX_FORMAT:
+            return None
+        return cls(payload["repo"], payload["files"], payload["built_at"])
+
+    # --- Tree -------------------------------------------------------------
+
+    def _node(self) -> dict:
+        """Nested {dirs, files, count, bytes, languages} built on first use."""
+        if self._tree is None:
+            root = _new_node()
+            for path, (size, _, language, _) in self.files.items():
+                node = root
+                parts = path.split("/")
+                for part in parts[:-1]:
+                    _add(node, size, language)
+                    node = node["dirs"].setdefault(part, _new_node())
+                _add(node, size, language)
+                node["files"].append(path)
+            self._tree = root
+        return self._tree
+
+    def has_dir(self, path: str) -> bool:
+        return self._find_dir(path) is not None
+
+    def _find_dir(self, path: str) -> Optional[dict]:
+        node = self._node()
+        for part in [p for p in path.strip("/").split("/") if p]:
+            node = node["dirs"].get(part)
+            if node is None:
+                return None
+        return node
+
+    def tree(self, root: str = "", depth: int = TREE_DEPTH) -> Optional[RepoTree]:
+        """Directories (and files of small directories) up to `depth` levels below root."""
+        root = root.strip("/")
+        node = self._find_dir(root)
+        if node is None:
+            return None
+        prefix = f"{root}/" if root else ""
+        entries: List[TreeEntry] = []
+        omitted = self._walk(node, prefix, 0, depth, entries)
+        return RepoTree(
+            repo=self.repo,
+            root=prefix,
+            files=node["count"],
+            bytes=node["bytes"],
+            languages=tuple(node["languages"].most_common()),
+            entries=tuple(entries),
+            truncated=omitted,
+        )
+
+    def _walk(self, node: dict, prefix: str, level: int, depth: int, entries: List[TreeEntry]) -> int:
+        omitted = 0
+        for name in sorted(node["dirs"]):
+            child = node["dirs"][name]
+            if len(entries) >= TREE_MAX_ENTRIES:
+                omitted += 1
+                continue
+            language = child["languages"].most_common(1)[0][0] if child["languages"] else None
+            entries.append(TreeEntry(f"{prefix}{name}/", child["count"], child["bytes"], language))
+            if level + 1 < depth:
+                omitted += self._walk(child, f"{prefix}{name}/", level + 1, depth, entries)
+        files = sorted(node["files"])
+        for i, path in enumerate(files):
+            if i >= TREE_FILES_PER_DIR or len(entries) >= TREE_MAX_ENTRIES:
+                omitted += len(files) - i
+                break
+            size, _, language, symbols = self.files[path]
+            public = [(name, kind) for name, kind, _ in symbols if kind != "method" and not name.startswith("_")]
+            public.sort(key=lambda symbol: _KIND_RANK.get(symbol[1], 3))
+            names = tuple(name for name, _ in public[:TREE_SYMBOLS_PER_FILE])
+            entries.append(TreeEntry(path, 1, size, language, names))
+        return omitted
+
+    # --- Symbols ----------------------------------------------------------
+
+    def _symbol_map(self) -> Dict[str, List[SymbolLocation]]:
+        """lower-cased name (and last part of qualified names) -> locations."""
+        if self._symbols is None:
+            symbols: Dict[str, List[SymbolLocation]] = {}
+            for path, (_, _, _, defs) in self.files.items():
+                for name, kind, line in defs:
+                    location = SymbolLocation(name, kind, path, line)
+                    keys = {name.lower(), name.rsplit(".", 1)[-1].lower()}
+                    for key in keys:
+                        symbols.setdefault(key, []).append(location)
+            self._symbols = symbols
+        return self._symbols
+
+    def find_symbol(self, name: str, limit: int = SYMBOL_MAX_MATCHES) -> SymbolMatches:
+        name = name.strip("`'\"()")
+        matches = list(self._symbol_map().get(name.lower(), []))
+        matches.sort(key=lambda m: _rank(m, name))
+        return SymbolMatches(repo=self.repo, symbol=name, matches=tuple(matches[:limit]), total=len(matches))
+
+
+_KIND_RANK = {"class": 0, "interface": 0, "type": 1, "enum": 1, "function": 1, "method": 2, "variable": 3,
+              "heading": 4}
+
+
+def _rank(match: SymbolLocation, name: str) -> tuple:
+    is_test = "test" in match.path.lower() or "example" in match.path.lower()
+    exact = match.name == name or match.name.rsplit(".", 1)[-1] == name
+    return (not exact, is_test, _KIND_RANK.get(match.kind, 3), match.path.count("/"), match.path, match.line)
+
+
+def _new_node() -> dict:
+    return {"dirs": {}, "files": [], "count": 0, "bytes": 0, "languages": Counter()}
+
+
+def _add(node: dict, size: int, language: Optional[str]) -> None:
+    node["count"] += 1
+    node["bytes"] += size
+    if language:
+        node["languages"][language] += size
+
+
+# --- Shared storage -------------------------------------------------------------
+
+_cache: "OrderedDict[str, Tuple[str, RepoIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+# Decoded indexes kept per process
+CACHE_MAX_REPOS = 32
+
+
+def _key(repo: str) -> str:
+    return f"repo_index:{repo}"
+
+
+def save_index(index: RepoIndex) -> None:
+    version = f"{index.built_at:.6f}"
+    get_state().set(_key(index.repo), index.to_bytes())
+    index_versions[index.repo] = version
+    with _cache_lock:
+        _cache[index.repo] = (version, index)
+        _cache.move_to_end(index.repo)
+        while len(_cache) > CACHE_MAX_REPOS:
+            _cache.popitem(last=False)
+
+
+def load_index(repo: str) -> Optional[RepoIndex]:
+    """The repo's index (None if it was never built), decoded once per version per process."""
+    version = index_versions.get(repo)
+    if version is None:
+        return None
+    with _cache_lock:
+        cached = _cache.get(repo)
+        if cached is not None and cached[0] == version:
+            _cache.move_to_end(repo)
+            return cached[1]
+    data = get_state().get(_key(repo))
+    index = RepoIndex.from_bytes(data) if data else None
+    if index is None:
+        return None
+    with _cache_lock:
+        _cache[repo] = (version, index)
+        _cache.move_to_end(repo)
+        while len(_cache) > CACHE_MAX_REPOS:
+            _cache.popitem(last=False)
+    return index
+
+
+def build_repo_index(repo: str, docs: Iterable, listing: Optional[Dict[str, int]] = None) -> RepoIndex:
+    """Index a repo's file listing and loaded Documents and store the result (replacing any older index)."""
+    with stage_span("ingest", action="repo_index"):
+        index = RepoIndex.from_documents(repo, docs, listing)
+        save_index(index)
+    symbols = sum(len(entry[3]) for entry in index.files.values())
+    print(f"🗂️ Indexed structure of {repo}: {len(index.files)} files, {symbols} symbols")
+    return index
+
+
+def update_repo_index(repo: str, docs: Iterable, removed: Iterable[str], changed: Iterable[str] = ()) -> None:
+    """
+    Apply a re-index to the stored index, if there is one.
+
+    Changed paths without a Document (skipped by the ingestion policy) stay
+    in the tree with their last known size; there is no checkout to measure
+    them or to match them against .gitignore.
+    """
+    index = load_index(repo)
+    if index is None:
+        return
+    # Copy so readers holding the cached object never see a half-applied update
+    index = RepoIndex(repo, dict(index.files))
+    index.update(docs, removed, listed=changed)
+    save_index(index)
+
+
+# --- Questions ------------------------------------------------------------------
+
+_SYMBOL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"where (?:is|are|'s) (?:the )?(?:class |function |method |def |interface |type |constant |variable |symbol )?"
+    r"`?([A-Za-z_$][\w$.]*)`?(?:\(\))? (?:class |function |method )?(?:defined|declared|implemented|located)",
+    r"(?:which|what) files? (?:defines?|declares?|implements?|contains? the definition of) "
+    r"(?:the )?(?:class |function |method |interface |type )?`?([A-Za-z_$][\w$.]*)`?",
+    r"(?:find|locate|show me) (?:the )?(?:definition|declaration) of (?:the )?(?:class |function |method )?"
+    r"`?([A-Za-z_$][\w$.]*)`?",
+    r"(?:go to|jump to) (?:the )?definition of `?([A-Za-z_$][\w$.]*)`?",
+)]
+
+_TREE_PATTERN = re.compile(
+    r"\b(?:folder|directory|dir|file|project|repo|repository|code ?base|source)\s+"
+    r"(?:structure|layout|tree|organi[sz]ation|hierarchy)\b"
+    r"|\bstructure of (?:the )?(?:repo|repository|project|code ?base|folders?|director(?:y|ies))\b"
+    r"|\bhow is (?:the )?(?:repo|repository|project|code ?base|code) (?:structured|organi[sz]ed|laid out)\b"
+    r"|\bwhat(?:'s| is) in (?:the )?`?[\w.\-/]+/?`? (?:folder|directory|dir)\b"
+    # Listing requests only when they name a directory: "show me the contents of
+    # the README" or "list the files that handle auth" are questions for RAG
+    r"|\b(?:list|show)(?: me)? (?:all )?(?:the )?(?:files|folders|(?:sub)?directories|contents)"
+    r" (?:in|of|under|inside) (?:the )?(?:"
+    r"`?(?:[\w.\-]+/)+(?:[\w\-]+/?)?`?(?![\w.\-/])"
+    r"|`?[\w.\-/]+`? (?:folder|directory|dir)\b"
+    r"|(?:folder|directory|dir) `?[\w.\-/]+`?"
+    r"|(?:repo|repository|project) root\b|root (?:folder|directory)\b|top[- ]level\b)",
+    re.IGNORECASE,
+)
+_BACKTICKED = re.compile(r"`([^`]+)`")
+_PATH_LIKE = re.compile(r"[\w.\-]+(?:/[\w.\-]+)+/?|[\w.\-]+/")
+_DIR_WORD = re.compile(r"([\w.\-]+)/?`? (?:folder|directory|dir|package)\b", re.IGNORECASE)
+
+
+def parse_structural_query(query: str, repo: str = "") -> Optional[Tuple[str, str]]:
+    """("symbol", name) or ("tree", "") for questions the index can answer, else None."""
+    text = query.replace(repo, " ") if repo else query
+    for pattern in _SYMBOL_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            return ("symbol", m.group(1).rstrip("."))
+    if _TREE_PATTERN.search(text):
+        return ("tree", text)
+    return None
+
+
+def _tree_root(index: RepoIndex, text: str) -> str:
+    """The deepest directory of the index that the question mentions, or the root."""
+    candidates = _BACKTICKED.findall(text) + _PATH_LIKE.findall(text) + _DIR_WORD.findall(text)
+    found = [c.strip().removeprefix("./").strip("/") for c in candidates]
+    found = [c for c in found if c and index.has_dir(c)]
+    return max(found, key=lambda c: c.count("/"), default="")
+
+
+def answer_structural_query(query: str, repo: str):
+    """
+    RepoTree or SymbolMatches for a structural question about an indexed repo.
+
+    None when the question isn't structural, the repo has no index, or no
+    symbol of that name is indexed (vector search may still find it).
+    """
+    if not settings.REPO_INDEX_ENABLED:
+        return None
+    parsed = parse_structural_query(query, repo)
+    if parsed is None:
+        return None
+    kind, arg = parsed
+    with stage_span("repo_index", action=kind):
+        index = load_index(repo)
+        if index is None:
+            return None
+        if kind == "symbol":
+            result = index.find_symbol(arg)
+            if not result.matches:
+                return None
+        else:
+            result = index.tree(_tree_root(index, arg))
+    print(f"🗂️ Answered from the repo index ({kind})")
+    return result
@@ -1,41 +1,119 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
+from langchain_core.documents import Document
 from .loader import load_repo
-from .embedding import get_dense_vector, get_sparse_vector
+from .ingest_policy import SAMPLE_BYTES, SkipReport, get_ingest_policy
+from .repo_index import build_repo_index, update_repo_index
+from .embedding import get_dense_vector, get_sparse_vector, get_query_embeddings
 from langchain_qdrant import QdrantVectorStore, RetrievalMode
+from src.config.settings import settings
+from src.observability.tracing import stage_span
 import os
+import uuid
+
+# Vector names used by langchain-qdrant for hybrid collections
+DENSE_VECTOR_NAME = ""
+SPARSE_VECTOR_NAME = "langchain-sparse"
+
+_client = None
+# Collections whose config connect_to_vector_store already checked
+_validated_collections = set()
 
 def chunk_docs(docs):
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=800,
-        chunk_overlap=150
+        chunk_overlap=150,
+        add_start_index=True  # lets the context packer merge overlapping chunks
     )
     return splitter.split_documents(docs)
 
 def get_qdrant_client():
-    return QdrantClient(
-        url=os.getenv("QDRANT_URL"),
-        api_key=os.getenv("QDRANT_API_KEY")
-    )
+    """
+    Returns the shared Qdrant client for the configured QDRANT_MODE.
+
+    The client is created once per process: an in-memory store only exists
+    inside its client, and an on-disk local store can only be opened once.
+    """
+    global _client
+    if _client is None:
+        if settings.QDRANT_MODE == "memory":
+            _client = QdrantClient(location=":memory:")
+        elif settings.QDRANT_MODE == "local":
+            _client = QdrantClient(path=settings.QDRANT_PATH)
+        else:
+            _client = QdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY
+            )
+    return _client
 
-def ingest_repo_to_vectorstore(url, collection_name="github-repo-data"):
-    docs = load_repo(url)
-    chunks = chunk_docs(docs)
+def _ensure_collection(client, collection_name, dense):
+    """Create the hybrid (dense + sparse) collection if it does not exist yet."""
+    if client.collection_exists(collection_name):
+        return
+    vector_size = len(dense.embed_query("dimension probe"))
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config={
+            DENSE_VECTOR_NAME: models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+        },
+        sparse_vectors_config={
+            SPARSE_VECTOR_NAME: models.SparseVectorParams(index=models.SparseIndexParams(on_disk=False))
+        }
+    )
+    # Per-repo / per-file updates filter on these (payload indexes are a no-op in local mode)
+    if settings.QDRANT_MODE == "server":
+        for field in ("metadata.repo", "metadata.source"):
+            client.create_payload_index(collection_name, field, models.PayloadSchemaType.KEYWORD)
 
-    dense = get_dense_vector()
-    sparse = get_sparse_vector()
-    client = get_qdrant_client()  # Use cloud client
+def index_chunks(chunks, collection_name="github-repo-data", dense=None, sparse=None):
+    """Embed chunks and upsert them into the (hybrid) collection."""
+    dense = dense or get_dense_vector()
+    sparse = sparse or get_sparse_vector()
+    client = get_qdrant_client()
 
-    vector_store = QdrantVectorStore.from_documents(
-        documents=chunks,
+    _ensure_collection(client, collection_name, dense)
+    vector_store = QdrantVectorStore(
+        client=client,
         embedding=dense,
         collection_name=collection_name,
         sparse_embedding=sparse,
-        retrieval_mode=RetrievalMode.HYBRID,
-        url=os.getenv("QDRANT_URL"),  # Fix: Use cloud URL, not localhost
-        api_key=os.getenv("QDRANT_API_KEY")  # Add API key
+        retrieval_mode=RetrievalMode.HYBRID
     )
-    
+    vector_store.add_documents(chunks)
+    return vector_store
+
+def _repo_from_url(url):
+    return url.rstrip("/").removesuffix(".git").split("github.com/")[-1]
+
+def ingest_repo_to_vectorstore(url, collection_name="github-repo-data", repo=None, replace=False):
+    """
+    Clone, chunk and index a repo.
+
+    With replace=True the repo was ingested before: the new chunks are tagged
+    with a fresh ingest_id and the previous points are only deleted once they
+    are indexed, so retrieval never sees the repo empty during a rebuild.
+    """
+    repo = repo or _repo_from_url(url)
+    ingest_id = uuid.uuid4().hex if replace else None
+    listing = {}
+    with stage_span("ingest", action="load"):
+        docs = load_repo(url, listing=listing)
+        # Tag chunks with their repo so they can be updated/deleted per repo later
+        for doc in docs:
+            doc.metadata["repo"] = repo
+            if ingest_id:
+                doc.metadata["ingest_id"] = ingest_id
+    if settings.REPO_INDEX_ENABLED:
+        build_repo_index(repo, docs, listing)
+    with stage_span("ingest", action="chunk"):
+        chunks = chunk_docs(docs)
+    with stage_span("ingest", action="index"):
+        vector_store = index_chunks(chunks, collection_name)
+    if ingest_id:
+        with stage_span("ingest", action="swap"):
+            delete_repo_points(repo, collection_name, keep_ingest_id=ingest_id)
+
     # Wait for indexing
     import time
     print(f"Waiting for {collection_name} to be indexed...")
@@ -47,19 +125,100 @@ def ingest_repo_to_vectorstore(url, collection_name="github-repo-data"):
         time.sleep(1)
     else:
         print("⚠️ Warning: Indexing might not be complete yet.")
-        
+
     return vector_store
 
+def delete_repo_points(repo, collection_name="github-repo-data", sources=None, keep_ingest_id=None):
+    """
+    Delete all indexed chunks of a repo, or only those of the given source paths.
+
+    keep_ingest_id spares the chunks written by that ingestion run.
+    """
+    client = get_qdrant_client()
+    if not client.collection_exists(collection_name):
+        return
+    conditions = [models.FieldCondition(key="metadata.repo", match=models.MatchValue(value=repo))]
+    if sources is not None:
+        conditions.append(models.FieldCondition(key="metadata.source", match=models.MatchAny(any=list(sources))))
+    must_not = []
+    if keep_ingest_id is not None:
+        must_not.append(models.FieldCondition(key="metadata.ingest_id", match=models.MatchValue(value=keep_ingest_id)))
+    client.delete(
+        collection_name=collection_name,
+        points_selector=models.FilterSelector(filter=models.Filter(must=conditions, must_not=must_not))
+    )
+
+def update_repo_files(repo, ref, changed_paths, removed_paths, collection_name="github-repo-data"):
+    """
+    Incrementally re-index files of an already ingested repo.
+
+    Deletes the points of every changed or removed file, then fetches the
+    changed files at `ref` from the GitHub API and indexes them again.
+    """
+    from src.tools.github_api import get_file_content
+
+    stale = sorted(set(changed_paths) | set(removed_paths))
+    if stale:
+        delete_repo_points(repo, collection_name, sources=stale)
+
+    # No checkout here: .gitignore/.gitattributes rules don't apply, the rest does
+    policy = get_ingest_policy(repo)
+    report = SkipReport(repo)
+    docs = []
+    with stage_span("ingest", action="fetch_changed"):
+        for path in changed_paths:
+            reason = policy.check(path)
+            if reason:
+                report.skip(path, 0, reason)
+                continue
+            content = get_file_content(repo, path, ref)
+            if content is None:
+                continue
+            data = content.encode("utf-8")
+            reason = policy.check(path, len(data), read_sample=lambda: data[:SAMPLE_BYTES])
+            if reason:
+                report.skip(path, len(data), reason)
+                continue
+            report.keep(path, len(data))
+            name = path.rsplit("/", 1)[-1]
+            docs.append(Document(page_content=content, metadata={
+                "source": path,
+                "file_path": path,
+                "file_name": name,
+                "file_type": os.path.splitext(name)[1],
+                "repo": repo,
+            }))
+
+    if docs:
+        with stage_span("ingest", action="chunk"):
+            chunks = chunk_docs(docs)
+        with stage_span("ingest", action="index"):
+            index_chunks(chunks, collection_name)
+    if settings.REPO_INDEX_ENABLED:
+        update_repo_index(repo, docs, removed_paths, changed_paths)
+    print(f"🔄 Re-indexed {repo}@{ref[:7]}: {len(docs)} files updated, {len(removed_paths)} removed")
+    if report.skipped:
+        print(report.summary())
+    return len(docs)
+
 def connect_to_vector_store(collection_name="github-repo-data"):
+    """
+    Hybrid vector store for retrieval, using the cached query embedders.
+
+    The collection config is validated on the first connect only:
+    langchain-qdrant's check embeds a probe text and fetches the collection,
+    i.e. a remote round trip on every RAG question otherwise.
+    """
     client = get_qdrant_client()
-    dense = get_dense_vector()
-    sparse = get_sparse_vector()
+    dense, sparse = get_query_embeddings()
 
     vector_store = QdrantVectorStore(
         client=client,
         embedding=dense,
         collection_name=collection_name,
         sparse_embedding=sparse,
-        retrieval_mode=RetrievalMode.HYBRID
+        retrieval_mode=RetrievalMode.HYBRID,
+        validate_collection_config=collection_name not in _validated_collections
     )
-    return vector_store
\ No newline at end of file
+    _validated_collections.add(collection_name)
+    return vector_store
@@ -0,0 +1,165 @@
+"""
+Background Warmer - Keeps a watchlist of hot repositories warm
+
+Most traffic is about a small set of repos, yet the first user after a quiet
+period pays the cold path. The warmer runs in a background thread and, for
+each repo on the watchlist:
+- Refreshes the overview, stats, PR, issue and release tool results
+- Keeps the repo's RAG index at the default branch HEAD (diff-based re-index),
+  if the repo has been ingested
+
+The watchlist is WARM_WATCHLIST plus the WARM_AUTO_TOP most asked-about repos.
+Refreshes are spread over WARM_INTERVAL with random jitter so they never
+arrive as a burst, and a repo is skipped when the GitHub rate-limit budget
+can't cover it. With several workers or replicas, each repo is claimed in
+the shared state backend, so only one of them refreshes it per interval.
+"""
+
+import random
+import threading
+from typing import Optional
+
+from src.agents.router import (
+    decay_repo_query_counts,
+    hot_repos,
+    indexed_heads,
+    ingested_repos,
+    rebuild_index,
+    repo_key,
+    run_github_action,
+)
+from src.config.settings import settings
+from src.observability.tracing import stage_span, is_error_result
+from src.state import get_state
+from src.tools import github_api
+
+# Tool results kept warm for every watched repo
+WARM_ACTIONS = ["GITHUB_OVERVIEW", "GITHUB_STATS", "GITHUB_PR_COUNT", "GITHUB_ISSUES", "GITHUB_RELEASES"]
+
+# Rough number of GitHub requests one repo refresh costs (tools + HEAD check)
+REQUESTS_PER_REFRESH = 12
+
+
+class RepoWarmer:
+    """
+    Periodically refreshes tool results and RAG indexes for watched repos.
+
+    Args:
+        watchlist: Repos that are always kept warm ('owner/repo')
+        interval: Seconds one full pass over the watchlist is spread across
+        max_repos: Upper bound on the watchlist size
+        auto_top: How many of the most asked-about repos to add (0 = off)
+        warm_rag: Also keep RAG indexes at HEAD
+    """
+
+    def __init__(self, watchlist: Optional[list[str]] = None, interval: Optional[float] = None,
+                 max_repos: Optional[int] = None, auto_top: Optional[int] = None,
+                 warm_rag: Optional[bool] = None):
+        self.static_watchlist = list(watchlist if watchlist is not None else settings.WARM_WATCHLIST)
+        self.interval = interval or settings.WARM_INTERVAL
+        self.max_repos = max_repos or settings.WARM_MAX_REPOS
+        self.auto_top = settings.WARM_AUTO_TOP if auto_top is None else auto_top
+        self.warm_rag = settings.WARM_RAG if warm_rag is None else warm_rag
+        # Warmed results must outlive the gap until the next pass refreshes them
+        self.cache_ttl = max(settings.TOOL_CACHE_TTL, self.interval * 1.5)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watchlist(self) -> list[str]:
+        repos = self.static_watchlist + (hot_repos(self.auto_top) if self.auto_top else [])
+        return list(dict.fromkeys(repos))[:self.max_repos]
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="repo-warmer", daemon=True)
+        self._thread.start()
+        print(f"🔥 Warmer started: {len(self.watchlist())} repos every {self.interval:.0f}s")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        # Random start offset so several replicas don't refresh in lockstep
+        if self._stop.wait(random.uniform(0, min(self.interval, 60))):
+            return
+        while not self._stop.is_set():
+            self.run_pass()
+            # Older queries count for less each pass, so the hot list follows current traffic
+            decay_repo_query_counts()
+
+    def run_pass(self) -> None:
+        """Refresh every watched repo once, spread over `interval` with jitter."""
+        repos = self.watchlist()
+        if not repos:
+            self._stop.wait(self.interval)
+            return
+
+        random.shuffle(repos)
+        slot = self.interval / len(repos)
+        for repo in repos:
+            if self._stop.wait(slot * random.uniform(0.5, 1.5)):
+                return
+            try:
+                self.refresh(repo)
+            except Exception as e:
+                print(f"❌ Warming {repo} failed: {e}")
+
+    def refresh(self, repo: str) -> None:
+        with stage_span("warm", action="refresh", repo=repo) as span:
+            # Another worker/replica already refreshed it during this interval
+            if not get_state().set(f"warm:{repo}", b"1", ttl=self.interval / 2, only_if_absent=True):
+                span.outcome = "skipped"
+                return
+
+            budget = github_api._remaining_request_budget()
+            if budget is not None and budget < REQUESTS_PER_REFRESH:
+                span.outcome = "skipped"
+                print(f"⏸️ Skipping warm-up of {repo}: rate-limit budget is down to {budget}")
+                return
+
+            errors = 0
+            for action in WARM_ACTIONS:
+                result = run_github_action(action, repo, refresh=True, ttl=self.cache_ttl)
+                errors += is_error_result(result)
+            if errors:
+                span.outcome = "error"
+
+        if self.warm_rag:
+            self.refresh_index(repo)
+
+    def refresh_index(self, repo: str) -> None:
+        """Bring the repo's RAG index to the default branch HEAD (only for repos already ingested)."""
+        repo = repo_key(repo)
+        if repo not in ingested_repos:
+            # Never asked a code question (e.g. a hot repo with only stats traffic): nothing to keep at HEAD
+            return
+
+        head = github_api.get_head_sha(repo)
+        indexed = indexed_heads.get(repo)
+        if head is None or head == indexed:
+            return
+
+        from src.rag.vectorstore import update_repo_files
+        with stage_span("warm", action="reindex", repo=repo):
+            # Serialized with webhook re-indexes of the same repo on any worker.
+            # The base is re-read under the lock: a webhook may have moved it.
+            with get_state().lock(f"index:{repo}", ttl=settings.INGEST_LOCK_TTL,
+                                  timeout=settings.INGEST_LOCK_TTL):
+                indexed = indexed_heads.get(repo)
+                if indexed == head:
+                    return
+                diff = github_api.get_changed_files(repo, indexed, head) if indexed else None
+                if diff is not None:
+                    update_repo_files(repo, head, *diff)
+                    indexed_heads[repo] = head
+                    return
+            # Unknown base or too many changes for the compare API: rebuild
+            # from scratch (rebuild_index takes the index lock itself)
+            rebuild_index(repo, head)
+
+warmer = RepoWarmer()
@@ -0,0 +1,127 @@
+"""
+GitHub Webhook Receiver - Push-driven cache invalidation and re-indexing
+
+POST /webhooks/github accepts push, pull_request, issues and release events
+(signed with GITHUB_WEBHOOK_SECRET). Each event drops the cached tool results
+it makes stale for that repo. A push to the default branch of an ingested
+repo also queues a re-index: of the files changed between the indexed commit
+and the pushed one (compare API), or of the whole repo after a force push or
+when the comparison is too large to list.
+"""
+
+import hashlib
+import hmac
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.state import get_state
+from src.tools import github_api
+from src.tools.cache import tool_cache
+
+router = APIRouter()
+
+# Which cached tool results each event makes stale
+EVENT_ACTIONS = {
+    "push": ["GITHUB_COMMITS", "GITHUB_COMMIT_ACTIVITY", "GITHUB_CONTRIBUTORS", "GITHUB_LANGUAGES", "GITHUB_STATS", "GITHUB_OVERVIEW"],
+    "pull_request": ["GITHUB_PR_COUNT", "GITHUB_STATS", "GITHUB_OVERVIEW"],
+    "issues": ["GITHUB_ISSUES", "GITHUB_STATS", "GITHUB_OVERVIEW"],
+    "release": ["GITHUB_RELEASES"],
+}
+
+# Single worker: re-index jobs run one at a time, in the order pushes arrive
+_reindex_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reindex")
+
+
+def verify_signature(body: bytes, signature: str | None, secret: str) -> bool:
+    """Check GitHub's X-Hub-Signature-256 header (HMAC-SHA256 of the raw body)."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _reindex(repo: str, before: str, after: str, forced: bool) -> None:
+    """
+    Bring the repo's index from its indexed commit to `after`.
+
+    The changed files come from the compare API rather than the payload's
+    `commits`, which GitHub truncates at 20 and which says nothing useful
+    about a force push. A force push, or a comparison too large for the
+    compare API, rebuilds the whole index instead.
+    """
+    from src.agents.router import indexed_heads, rebuild_index
+    from src.rag.vectorstore import update_repo_files
+    try:
+        # Serialized with warmer re-indexes of the same repo on any worker
+        with get_state().lock(f"index:{repo}", ttl=settings.INGEST_LOCK_TTL,
+                              timeout=settings.INGEST_LOCK_TTL):
+            # Diffing from the indexed commit also covers missed webhooks
+            base = indexed_heads.get(repo) or before
+            if base == after:
+                return
+            diff = None if forced else github_api.get_changed_files(repo, base, after)
+            if diff is not None:
+                update_repo_files(repo, after, *diff)
+                indexed_heads[repo] = after
+                return
+        # rebuild_index takes the index lock itself
+        rebuild_index(repo, after)
+    except Exception as e:
+        print(f"❌ Re-index of {repo} failed: {e}")
+
+
+def handle_event(event: str, payload: dict) -> dict:
+    """Apply one webhook event; returns a summary of what was done."""
+    repo = payload.get("repository", {}).get("full_name")
+    if not repo:
+        raise HTTPException(status_code=400, detail="Payload has no repository.full_name")
+
+    invalidated = tool_cache.invalidate(repo, EVENT_ACTIONS[event])
+    summary = {"event": event, "repo": repo, "invalidated": invalidated, "reindex_queued": False}
+
+    if event == "push":
+        from src.agents.router import ingested_repos, repo_key
+
+        default_branch = payload["repository"].get("default_branch", "main")
+        on_default = payload.get("ref") == f"refs/heads/{default_branch}"
+        if on_default and repo_key(repo) in ingested_repos and not payload.get("deleted"):
+            forced = bool(payload.get("forced"))
+            _reindex_queue.submit(_reindex, repo_key(repo), payload.get("before"), payload["after"], forced)
+            summary.update(reindex_queued=True, full_reindex=forced)
+
+    print(f"🪝 {event} for {repo}: {invalidated} cached results invalidated"
+          f"{', re-index queued' if summary['reindex_queued'] else ''}")
+    return summary
+
+
+@router.post("/webhooks/github")
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(...),
+    x_hub_signature_256: str | None = Header(None),
+):
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="GITHUB_WEBHOOK_SECRET is not configured")
+
+    body = await request.body()
+    if not verify_signature(body, x_hub_signature_256, settings.GITHUB_WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    if x_github_event == "ping":
+        return {"status": "pong"}
+    if x_github_event not in EVENT_ACTIONS:
+        return {"status": "ignored", "event": x_github_event}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body is not valid JSON")
+
+    # Cache invalidation and the ingested check are shared-state round trips:
+    # keep them off the event loop
+    summary = await run_in_threadpool(handle_event, x_github_event, payload)
+    return {"status": "ok", **summary}
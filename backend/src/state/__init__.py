@@ -0,0 +1,30 @@
+"""
+Shared State - What several workers or pods must agree on
+
+With `uvicorn --workers N` or several replicas, module-level sets and
+globals are per process. Everything that has to be shared goes through a
+StateBackend instead:
+- the ingestion registry (which repos are indexed, at which commit)
+- locks around ingestion, so a repo is cloned and indexed once
+- the GitHub rate-limit budget
+- the tool result and web search caches
+
+STATE_BACKEND=memory keeps it in-process (single worker);
+STATE_BACKEND=redis shares it through REDIS_URL.
+"""
+
+from src.state.base import LockTimeout, StateBackend, StateLock
+from src.state.factory import get_state, set_state
+from src.state.memory import MemoryState
+from src.state.shared import SharedDict, SharedSet
+
+__all__ = [
+    "LockTimeout",
+    "MemoryState",
+    "SharedDict",
+    "SharedSet",
+    "StateBackend",
+    "StateLock",
+    "get_state",
+    "set_state",
+]
@@ -0,0 +1,157 @@
+"""
+State Backend Interface - Key/value, set and hash operations plus locks
+
+A small, Redis-shaped subset of operations. Everything the app shares
+between workers (ingestion registry, rate-limit budget, tool result cache,
+ingestion locks) is expressed with these, so a backend only has to
+implement the primitives below. Keys and members are str, values are bytes.
+"""
+
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a StateLock can't be acquired within its timeout."""
+
+
+class StateBackend(ABC):
+    """Base class of shared-state backends (memory, redis); every primitive is abstract."""
+
+    name = "base"
+
+    # --- Keys -------------------------------------------------------------
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_absent: bool = False) -> bool:
+        """Store a value (expiring after `ttl` seconds). Returns False if only_if_absent and the key exists."""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> int:
+        ...
+
+    @abstractmethod
+    def expire(self, key: str, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    def compare_and_delete(self, key: str, value: bytes) -> bool:
+        """Atomically delete `key` only if it still holds `value`."""
+
+    @abstractmethod
+    def lower_budget(self, key: str, remaining: int, window: int, ttl: float) -> bool:
+        """
+        Atomically store b"<remaining>:<window>" in `key` (expiring after `ttl`
+        seconds), unless it already holds a lower remaining count for the same
+        window. Returns whether the value was stored.
+        """
+
+    # --- Sets -------------------------------------------------------------
+
+    @abstractmethod
+    def sadd(self, name: str, *members: str) -> int:
+        ...
+
+    @abstractmethod
+    def srem(self, name: str, *members: str) -> int:
+        ...
+
+    @abstractmethod
+    def sismember(self, name: str, member: str) -> bool:
+        ...
+
+    @abstractmethod
+    def smembers(self, name: str) -> Set[str]:
+        ...
+
+    # --- Hashes -----------------------------------------------------------
+
+    @abstractmethod
+    def hget(self, name: str, field: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def hset(self, name: str, field: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    def hdel(self, name: str, *fields: str) -> int:
+        ...
+
+    @abstractmethod
+    def hgetall(self, name: str) -> Dict[str, str]:
+        ...
+
+    # --- Locks ------------------------------------------------------------
+
+    def lock(self, name: str, ttl: float, timeout: Optional[float] = None) -> "StateLock":
+        """A lock shared by every process using this backend (see StateLock)."""
+        return StateLock(self, name, ttl, timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class StateLock:
+    """
+    Mutual exclusion across workers: SET lock:<name> <token> NX with a TTL.
+
+    The TTL frees the lock if its holder dies, so it must exceed the longest
+    critical section (e.g. INGEST_LOCK_TTL for an ingestion). Release only
+    deletes the key while it still holds our token, so a holder whose lock
+    already expired can't release someone else's.
+
+    Usage:
+        with state.lock(f"ingest:{repo}", ttl=1800, timeout=1800):
+            ...
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, backend: StateBackend, name: str, ttl: float, timeout: Optional[float] = None):
+        self.backend = backend
+        self.key = f"lock:{name}"
+        self.ttl = ttl
+        self.timeout = timeout
+        self.token: Optional[bytes] = None
+        # Guards the token when the same lock object is shared between threads
+        self._local = threading.Lock()
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        token = uuid.uuid4().hex.encode()
+        while True:
+            if self.backend.set(self.key, token, ttl=self.ttl, only_if_absent=True):
+                with self._local:
+                    self.token = token
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self) -> bool:
+        with self._local:
+            token, self.token = self.token, None
+        if token is None:
+            return False
+        return self.backend.compare_and_delete(self.key, token)
+
+    @property
+    def locked(self) -> bool:
+        return self.backend.get(self.key) is not None
+
+    def __enter__(self) -> "StateLock":
+        if not self.acquire():
+            raise LockTimeout(f"Timed out after {self.timeout}s waiting for {self.key}")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
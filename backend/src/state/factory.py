@@ -0,0 +1,43 @@
+"""
+State Backend Factory - One backend per process, chosen by STATE_BACKEND
+
+- memory (default): in-process, for a single worker
+- redis: REDIS_URL, shared by all workers and pods
+"""
+
+import threading
+from typing import Optional
+
+from src.config.settings import settings
+from src.state.base import StateBackend
+
+_state: Optional[StateBackend] = None
+_state_lock = threading.Lock()
+
+
+def _build() -> StateBackend:
+    if settings.STATE_BACKEND == "redis":
+        from src.state.redis_backend import RedisState
+        print(f"🔗 Shared state: redis at {settings.REDIS_URL}")
+        return RedisState(settings.REDIS_URL, prefix=settings.STATE_KEY_PREFIX)
+    from src.state.memory import MemoryState
+    return MemoryState()
+
+
+def get_state() -> StateBackend:
+    """Return the process-wide state backend, creating it on first use."""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = _build()
+    return _state
+
+
+def set_state(backend: Optional[StateBackend]) -> None:
+    """Swap the backend (benchmarks, stand-in servers). None rebuilds it from settings on next use."""
+    global _state
+    with _state_lock:
+        if _state is not None and _state is not backend:
+            _state.close()
+        _state = backend
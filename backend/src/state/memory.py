@@ -0,0 +1,162 @@
+"""
+In-Process State Backend - Dicts behind one lock
+
+The default (STATE_BACKEND=memory): shared by the threads of one process
+only, which is exactly the behaviour of the module-level sets and dicts it
+replaces. Also the storage of the local RESP stand-in server
+(scripts/resp_server.py).
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from src.state.base import StateBackend
+
+
+class MemoryState(StateBackend):
+    """Thread-safe in-memory backend with lazily enforced TTLs."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        self._expires: Dict[str, float] = {}
+
+    def _live(self, key: str):
+        """Value of key, dropping it first if it has expired (lock held)."""
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return self._data.get(key)
+
+    def _typed(self, key: str, kind: type):
+        value = self._live(key)
+        if value is not None and not isinstance(value, kind):
+            raise TypeError(f"Key '{key}' holds a {type(value).__name__}, not a {kind.__name__}")
+        return value
+
+    # --- Keys -------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._typed(key, bytes)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_absent: bool = False) -> bool:
+        with self._lock:
+            if only_if_absent and self._live(key) is not None:
+                return False
+            self._data[key] = bytes(value)
+            if ttl:
+                self._expires[key] = time.monotonic() + ttl
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._live(key) is not None
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def expire(self, key: str, ttl: float) -> bool:
+        with self._lock:
+            if self._live(key) is None:
+                return False
+            self._expires[key] = time.monotonic() + ttl
+            return True
+
+    def ttl(self, key: str) -> Optional[float]:
+        """Seconds until key expires (None if it has no TTL or doesn't exist)."""
+        with self._lock:
+            if self._live(key) is None or key not in self._expires:
+                return None
+            return self._expires[key] - time.monotonic()
+
+    def compare_and_delete(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            if self._live(key) != value:
+                return False
+            del self._data[key]
+            self._expires.pop(key, None)
+            return True
+
+    def lower_budget(self, key: str, remaining: int, window: int, ttl: float) -> bool:
+        with self._lock:
+            current = self._typed(key, bytes)
+            if current is not None:
+                seen_remaining, seen_window = current.decode().split(":")
+                if int(seen_window) == window and int(seen_remaining) < remaining:
+                    return False
+            self._data[key] = f"{remaining}:{window}".encode()
+            self._expires[key] = time.monotonic() + ttl
+            return True
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [key for key in list(self._data) if self._live(key) is not None]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+
+    # --- Sets -------------------------------------------------------------
+
+    def sadd(self, name: str, *members: str) -> int:
+        with self._lock:
+            current = self._typed(name, set)
+            if current is None:
+                current = self._data[name] = set()
+            before = len(current)
+            current.update(members)
+            return len(current) - before
+
+    def srem(self, name: str, *members: str) -> int:
+        with self._lock:
+            current = self._typed(name, set) or set()
+            before = len(current)
+            current.difference_update(members)
+            if not current:
+                self._data.pop(name, None)
+                self._expires.pop(name, None)
+            return before - len(current)
+
+    def sismember(self, name: str, member: str) -> bool:
+        with self._lock:
+            return member in (self._typed(name, set) or ())
+
+    def smembers(self, name: str) -> Set[str]:
+        with self._lock:
+            return set(self._typed(name, set) or ())
+
+    # --- Hashes -----------------------------------------------------------
+
+    def hget(self, name: str, field: str) -> Optional[str]:
+        with self._lock:
+            return (self._typed(name, dict) or {}).get(field)
+
+    def hset(self, name: str, field: str, value: str) -> None:
+        with self._lock:
+            current = self._typed(name, dict)
+            if current is None:
+                current = self._data[name] = {}
+            current[field] = value
+
+    def hdel(self, name: str, *fields: str) -> int:
+        with self._lock:
+            current = self._typed(name, dict) or {}
+            removed = sum(current.pop(field, None) is not None for field in fields)
+            if not current:
+                self._data.pop(name, None)
+                self._expires.pop(name, None)
+            return removed
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._typed(name, dict) or {})
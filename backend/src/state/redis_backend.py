@@ -0,0 +1,118 @@
+"""
+Redis State Backend - Shared state over the Redis protocol (RESP)
+
+Used with STATE_BACKEND=redis so that every uvicorn worker and every pod
+sees the same ingestion registry, locks, rate-limit budget and tool cache.
+Works against Redis, Valkey, KeyDB, or the stand-in server in
+scripts/resp_server.py.
+
+Requires the optional `redis` package (pip install redis).
+All keys are prefixed with STATE_KEY_PREFIX so deployments can share a server.
+"""
+
+from typing import Dict, Optional, Set
+
+from src.state.base import StateBackend
+
+# Delete the key only while it still holds our value (lock release)
+COMPARE_AND_DELETE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Store "<remaining>:<window>" unless the key holds a lower remaining for the same window
+LOWER_BUDGET = """
+local current = redis.call('get', KEYS[1])
+if current then
+    local sep = string.find(current, ':', 1, true)
+    if string.sub(current, sep + 1) == ARGV[2]
+            and tonumber(string.sub(current, 1, sep - 1)) < tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call('set', KEYS[1], ARGV[1] .. ':' .. ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+
+class RedisState(StateBackend):
+    """
+    Args:
+        url: redis:// URL of the server
+        prefix: Prepended to every key
+        socket_timeout: Seconds before a command to the server fails
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "", socket_timeout: float = 5.0):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("STATE_BACKEND=redis needs the redis package: pip install redis") from e
+        self.url = url
+        self.prefix = prefix
+        # One pooled client per process; redis-py clients are thread-safe.
+        # RESP2 is understood by every Redis-compatible server (and the stand-in).
+        self._client = redis.Redis.from_url(url, protocol=2, socket_timeout=socket_timeout,
+                                            socket_connect_timeout=socket_timeout)
+
+    def _k(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    # --- Keys -------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._k(key))
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_absent: bool = False) -> bool:
+        px = int(ttl * 1000) if ttl else None
+        return bool(self._client.set(self._k(key), value, px=px, nx=only_if_absent))
+
+    def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return self._client.delete(*(self._k(key) for key in keys))
+
+    def expire(self, key: str, ttl: float) -> bool:
+        return bool(self._client.pexpire(self._k(key), int(ttl * 1000)))
+
+    def compare_and_delete(self, key: str, value: bytes) -> bool:
+        return bool(self._client.eval(COMPARE_AND_DELETE, 1, self._k(key), value))
+
+    def lower_budget(self, key: str, remaining: int, window: int, ttl: float) -> bool:
+        return bool(self._client.eval(LOWER_BUDGET, 1, self._k(key), remaining, window, int(ttl * 1000)))
+
+    # --- Sets -------------------------------------------------------------
+
+    def sadd(self, name: str, *members: str) -> int:
+        return self._client.sadd(self._k(name), *members) if members else 0
+
+    def srem(self, name: str, *members: str) -> int:
+        return self._client.srem(self._k(name), *members) if members else 0
+
+    def sismember(self, name: str, member: str) -> bool:
+        return bool(self._client.sismember(self._k(name), member))
+
+    def smembers(self, name: str) -> Set[str]:
+        return {m.decode() for m in self._client.smembers(self._k(name))}
+
+    # --- Hashes -----------------------------------------------------------
+
+    def hget(self, name: str, field: str) -> Optional[str]:
+        value = self._client.hget(self._k(name), field)
+        return value.decode() if value is not None else None
+
+    def hset(self, name: str, field: str, value: str) -> None:
+        self._client.hset(self._k(name), field, value)
+
+    def hdel(self, name: str, *fields: str) -> int:
+        return self._client.hdel(self._k(name), *fields) if fields else 0
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        return {k.decode(): v.decode() for k, v in self._client.hgetall(self._k(name)).items()}
+
+    def close(self) -> None:
+        self._client.close()
@@ -0,0 +1,66 @@
+"""
+Shared Collections - set/dict-like views over the shared state backend
+
+Drop-in replacements for the module-level `set()` / `{}` registries, so
+call sites keep using `repo in ingested_repos`, `.add()`, `.discard()`,
+`indexed_heads.get(repo)` and `indexed_heads[repo] = sha`. The backend is
+resolved on every operation, so tests and benchmarks can swap it with
+set_state().
+"""
+
+from typing import Iterator, Optional
+
+from src.state.factory import get_state
+
+
+class SharedSet:
+    """A named set of strings in the shared state backend."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __contains__(self, member: str) -> bool:
+        return get_state().sismember(self.name, member)
+
+    def add(self, member: str) -> None:
+        get_state().sadd(self.name, member)
+
+    def discard(self, member: str) -> None:
+        get_state().srem(self.name, member)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(get_state().smembers(self.name)))
+
+    def __len__(self) -> int:
+        return len(get_state().smembers(self.name))
+
+
+class SharedDict:
+    """A named str -> str mapping (a hash) in the shared state backend."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        value = get_state().hget(self.name, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: str) -> None:
+        get_state().hset(self.name, key, value)
+
+    def pop(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.get(key)
+        get_state().hdel(self.name, key)
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def items(self):
+        return get_state().hgetall(self.name).items()
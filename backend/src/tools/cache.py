@@ -0,0 +1,159 @@
+"""
+Tool Result Cache - TTL + LRU cache for GitHub tool results
+
+Results are keyed by (action, repo) so they can be invalidated per repository
+(e.g. by the GitHub webhook receiver) without touching other repos. Actions
+run with parameters are keyed like GITHUB_CONTRIBUTORS?limit=50; invalidating
+an action drops all of its parameterized entries too.
+
+- ToolResultCache: in-process (STATE_BACKEND=memory)
+- SharedResultCache: in the shared state backend (STATE_BACKEND=redis), so
+  all workers share hits and a webhook invalidation reaches every worker
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+
+from src.config.settings import settings
+from src.observability.metrics import CACHE_REQUESTS
+from src.state import get_state
+
+
+def _base_action(action: str) -> str:
+    return action.partition("?")[0]
+
+
+class ToolResultCache:
+    """
+    Thread-safe TTL cache with LRU eviction.
+
+    Args:
+        ttl: Seconds a result stays fresh
+        max_entries: Max cached results before the least recently used is evicted
+        name: Label for the cache hit/miss metric
+    """
+
+    def __init__(self, ttl: float, max_entries: int, name: str = "tool_result"):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, action: str, repo: str) -> Optional[Any]:
+        key = (action, repo.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.labels(self.name, "hit").inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return None
+
+    def set(self, action: str, repo: str, result: Any, ttl: Optional[float] = None) -> None:
+        """Store a result; `ttl` overrides the default freshness (e.g. for pre-warmed entries)."""
+        key = (action, repo.lower())
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, repo: str, actions: Optional[Iterable[str]] = None) -> int:
+        """Drop cached results for a repo (all actions, or only `actions`). Returns the count removed."""
+        repo = repo.lower()
+        actions = set(actions) if actions is not None else None
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key[1] == repo and (actions is None or _base_action(key[0]) in actions)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedResultCache:
+    """
+    Same interface as ToolResultCache, stored in the shared state backend.
+
+    Results are pickled under cache:<name>:<repo>:<action> with a TTL; a
+    per-repo index set of cached actions makes invalidate() work without
+    scanning keys. Size is bounded by the server's eviction policy
+    (e.g. Redis maxmemory-policy allkeys-lru) instead of max_entries.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 0, name: str = "tool_result"):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+
+    def _key(self, action: str, repo: str) -> str:
+        return f"cache:{self.name}:{repo}:{action}"
+
+    def _index(self, repo: str) -> str:
+        return f"cache:{self.name}:index:{repo}"
+
+    def get(self, action: str, repo: str) -> Optional[Any]:
+        payload = get_state().get(self._key(action, repo.lower()))
+        if payload is not None:
+            CACHE_REQUESTS.labels(self.name, "hit").inc()
+            return pickle.loads(payload)
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return None
+
+    def set(self, action: str, repo: str, result: Any, ttl: Optional[float] = None) -> None:
+        """Store a result; `ttl` overrides the default freshness (e.g. for pre-warmed entries)."""
+        repo = repo.lower()
+        ttl = ttl or self.ttl
+        state = get_state()
+        state.set(self._key(action, repo), pickle.dumps(result), ttl=ttl)
+        state.sadd(self._index(repo), action)
+        state.sadd(f"cache:{self.name}:repos", repo)
+        # Indexes outlive their entries a little; stale members only cost a no-op delete
+        state.expire(self._index(repo), max(ttl, self.ttl) * 2)
+        state.expire(f"cache:{self.name}:repos", max(ttl, self.ttl) * 2)
+
+    def invalidate(self, repo: str, actions: Optional[Iterable[str]] = None) -> int:
+        """Drop cached results for a repo (all actions, or only `actions`). Returns the count removed."""
+        repo = repo.lower()
+        state = get_state()
+        cached = state.smembers(self._index(repo))
+        if actions is not None:
+            wanted = set(actions)
+            cached = [action for action in cached if _base_action(action) in wanted]
+        actions = list(cached)
+        if not actions:
+            return 0
+        removed = state.delete(*(self._key(action, repo) for action in actions))
+        state.srem(self._index(repo), *actions)
+        return removed
+
+    def clear(self) -> None:
+        state = get_state()
+        for repo in state.smembers(f"cache:{self.name}:repos"):
+            self.invalidate(repo)
+        state.delete(f"cache:{self.name}:repos")
+
+
+def make_result_cache(ttl: float, max_entries: int, name: str = "tool_result"):
+    """The result cache matching STATE_BACKEND: in-process, or shared by all workers."""
+    if settings.STATE_BACKEND == "redis":
+        return SharedResultCache(ttl=ttl, max_entries=max_entries, name=name)
+    return ToolResultCache(ttl=ttl, max_entries=max_entries, name=name)
+
+
+tool_cache = make_result_cache(
+    ttl=settings.TOOL_CACHE_TTL,
+    max_entries=settings.TOOL_CACHE_MAX_ENTRIES
+)
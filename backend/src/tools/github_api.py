@@ -4,24 +4,185 @@ GitHub API Module - Comprehensive GitHub Data Fetching
 This module provides functions to fetch various data from the GitHub API including:
 - Pull request counts (with proper pagination)
 - Repository statistics
-- Contributors analysis
-- Commit history
+- Contributors analysis (concurrent full pagination)
+- Commit history and commit activity over a time window
 - Issue statistics
 - Language breakdown
 - Release information
+
+Tools return typed results (src/tools/results.py); render them with
+src/tools/render.py (markdown for people, to_prompt for the LLM).
 """
 
-from typing import Optional, Dict, Any, List
-import httpx
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, AsyncIterator
+from collections import Counter
+import httpx
 from src.config import settings
+from src.tools.pagination import paginate, parse_link_header as _parse_link_header
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
+from src.utils.aio import run_sync as _run_sync
+from src.state import get_state
+from src.tools.results import (
+    ToolError, EmptyResult, PullRequestStats, RepoStats, Contributor, ContributorList,
+    Commit, CommitList, CommitActivity, IssueStats, LanguageBreakdown, Release, RepoOverview,
+)
 
 TOKEN = settings.Settings.GITHUB_TOKEN
 GITHUB_BASE_URL = "https://api.github.com"
 
-# Rate limit tracking
-_rate_limit_remaining = None
-_rate_limit_reset = None
+# Rate limit tracking: "<remaining>:<reset epoch>" in the shared state backend,
+# so all workers spend one budget (they share the token, and so its limit)
+RATE_LIMIT_KEY = "github:rate_limit"
+
+# Shared HTTP clients (connection pooling across tool calls). The async one
+# lives on the shared event loop of src.utils.aio, where all pagination runs.
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[httpx.BaseTransport] = None
+
+# Identical concurrent GET requests share one round trip (sync calls and pages)
+_http_flight = SingleFlight("github_http")
+_page_flight = AsyncSingleFlight("github_http")
+
+# Rate-limit reads/updates made while paginating run here, so a shared-state
+# round trip (Redis) never blocks the event loop all page requests share
+_state_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="github_state")
+
+
+def set_transport(transport: Optional[httpx.BaseTransport]) -> None:
+    """
+    Route all GitHub API calls through a custom httpx transport.
+
+    Used by benchmarks to replay recorded responses (httpx.MockTransport).
+    The transport is shared by the sync client and the async pagination
+    client, so it must support both (MockTransport does).
+    Pass None to go back to the real network.
+    """
+    global _client, _async_client, _transport
+    if _client is not None:
+        _client.close()
+    if _async_client is not None:
+        _run_sync(_async_client.aclose())
+    _client = _async_client = None
+    _transport = transport
+
+
+def _get_client() -> httpx.Client:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(transport=_transport)
+    return _client
+
+
+def _http_get(url: str, headers: dict, params: Optional[dict] = None) -> httpx.Response:
+    """Send a GET request to the GitHub API through the shared client."""
+    key = (url, tuple(sorted((params or {}).items())))
+    return _http_flight.do(key, _get_client().get, url, headers=headers, params=params)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client (only use it on the shared event loop)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(transport=_transport)
+    return _async_client
+
+
+class _PageClient:
+    """The client paginate() sends page requests with: shared, pooled and single-flight."""
+
+    async def get(self, url: str, headers: dict, params: Optional[dict] = None) -> httpx.Response:
+        key = (url, tuple(sorted((params or {}).items())))
+        return await _page_flight.do(key, _get_async_client().get, url, headers=headers, params=params)
+
+
+def _remaining_request_budget() -> Optional[int]:
+    """Requests we may still spend before hitting the rate-limit reserve (None = unknown)."""
+    remaining, _ = _shared_rate_limit()
+    if remaining is None:
+        return None
+    return remaining - settings.Settings.GITHUB_RATE_LIMIT_RESERVE
+
+
+def _shared_rate_limit() -> tuple[Optional[int], Optional[int]]:
+    """(remaining, reset epoch) last seen by any worker, or (None, None)."""
+    value = get_state().get(RATE_LIMIT_KEY)
+    if value is None:
+        return None, None
+    remaining, reset = value.decode().split(":")
+    return int(remaining), int(reset)
+
+
+async def _track_rate_limit(response: httpx.Response) -> None:
+    await asyncio.get_running_loop().run_in_executor(_state_executor, _check_rate_limit, response)
+
+
+async def _request_budget() -> Optional[int]:
+    return await asyncio.get_running_loop().run_in_executor(_state_executor, _remaining_request_budget)
+
+
+async def iter_paginated(path: str, params: Optional[dict] = None,
+                         max_items: Optional[int] = None) -> AsyncIterator[Any]:
+    """
+    Streams all items of a GitHub list endpoint, fetching pages concurrently.
+
+    Args:
+        path: API path, e.g. '/repos/vercel/next.js/contributors'
+        params: Extra query params (e.g. since/until for commits)
+        max_items: Stop after this many items
+
+    Must run on the shared event loop (src.utils.aio); the sync tools get
+    there through run_sync.
+
+    Raises:
+        httpx.HTTPStatusError: If GitHub returns a non-2xx status
+    """
+    async for item in paginate(
+        _PageClient(),
+        f"{GITHUB_BASE_URL}{path}",
+        headers=_get_headers(),
+        params=params,
+        per_page=min(max_items or 100, 100),
+        max_items=max_items,
+        concurrency=settings.Settings.GITHUB_PAGE_CONCURRENCY,
+        on_response=_track_rate_limit,
+        request_budget=_request_budget,
+    ):
+        yield item
+
+
+def _collect(path: str, params: Optional[dict] = None, max_items: Optional[int] = None) -> list:
+    """Fetch up to max_items items of a list endpoint into a list."""
+    async def collect():
+        return [item async for item in iter_paginated(path, params, max_items)]
+    return _run_sync(collect())
+
+
+def _error_message(repo: str, error: httpx.HTTPStatusError) -> ToolError:
+    """Map a failed list request to the same errors the tools use."""
+    if error.response.status_code == 404:
+        return _not_found(repo)
+    try:
+        message = error.response.json().get("message", "Unknown error")
+    except ValueError:
+        message = "Unknown error"
+    return _api_error(message)
+
+
+def _not_found(repo: str) -> ToolError:
+    return ToolError(f"Repository '{repo}' not found.", kind="not_found")
+
+
+def _api_error(message: str) -> ToolError:
+    return ToolError(f"GitHub API error: {message}", kind="api")
+
+
+def _network_error(error: httpx.RequestError) -> ToolError:
+    return ToolError(f"Network error: {str(error)}", kind="network")
 
 
 def _get_headers() -> dict:
@@ -36,39 +197,20 @@ def _get_headers() -> dict:
 
 
 def _check_rate_limit(response: httpx.Response) -> None:
-    """Track rate limit from response headers."""
-    global _rate_limit_remaining, _rate_limit_reset
-    _rate_limit_remaining = response.headers.get("X-RateLimit-Remaining")
-    _rate_limit_reset = response.headers.get("X-RateLimit-Reset")
-
-
-def _format_number(num: int) -> str:
-    """Format large numbers with K/M suffix for readability."""
-    if num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.1f}K"
-    return str(num)
-
-
-def _parse_link_header(link_header: str) -> Dict[str, str]:
-    """Parse GitHub Link header for pagination info."""
-    links = {}
-    if not link_header:
-        return links
-    
-    parts = link_header.split(", ")
-    for part in parts:
-        url_part, rel_part = part.split("; ")
-        url = url_part.strip("<>")
-        rel = rel_part.replace('rel="', '').replace('"', '')
-        links[rel] = url
-    return links
-
-
-
-
-def get_open_pull_requests(repo: str) -> str:
+    """Track rate limit from response headers (shared by all workers)."""
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    remaining, reset = int(remaining), int(reset)
+    # Responses of other workers may arrive out of order: within one window the
+    # stored budget only goes down (compared and set atomically by the backend).
+    # It is forgotten once GitHub resets the window.
+    ttl = max(reset - time.time(), 1)
+    get_state().lower_budget(RATE_LIMIT_KEY, remaining, reset, ttl)
+
+
+def get_open_pull_requests(repo: str) -> PullRequestStats | ToolError:
     """
     Fetches the ACCURATE count of open PRs for a given repository.
     Uses GitHub's Search API which returns total_count for accurate results.
@@ -77,7 +219,7 @@ def get_open_pull_requests(repo: str) -> str:
         repo: Repository in 'owner/repo' format (e.g., 'vercel/next.js')
     
     Returns:
-        Formatted string with PR count information
+        Open, closed and merged PR counts
     """
     headers = _get_headers()
     
@@ -90,15 +232,16 @@ def get_open_pull_requests(repo: str) -> str:
     }
     
     try:
-        response = httpx.get(url, headers=headers, params=params)
+        response = _http_get(url, headers=headers, params=params)
         _check_rate_limit(response)
         
         if response.status_code == 422:
-            return f"❌ Repository '{repo}' not found or invalid. Please check the repository name."
+            return ToolError(f"Repository '{repo}' not found or invalid. Please check the repository name.",
+                             kind="not_found")
         if response.status_code == 403:
-            return "⚠️ API rate limit exceeded. Please try again later."
+            return ToolError("API rate limit exceeded. Please try again later.", kind="rate_limit")
         if response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
+            return _api_error(response.json().get('message', 'Unknown error'))
         
         data = response.json()
         total_count = data.get("total_count", 0)
@@ -108,7 +251,7 @@ def get_open_pull_requests(repo: str) -> str:
             "q": f"repo:{repo} is:pr is:closed",
             "per_page": 1
         }
-        closed_response = httpx.get(url, headers=headers, params=closed_params)
+        closed_response = _http_get(url, headers=headers, params=closed_params)
         closed_count = 0
         if closed_response.status_code == 200:
             closed_count = closed_response.json().get("total_count", 0)
@@ -117,31 +260,20 @@ def get_open_pull_requests(repo: str) -> str:
             "q": f"repo:{repo} is:pr is:merged",
             "per_page": 1
         }
-        merged_response = httpx.get(url, headers=headers, params=merged_params)
+        merged_response = _http_get(url, headers=headers, params=merged_params)
         merged_count = 0
         if merged_response.status_code == 200:
             merged_count = merged_response.json().get("total_count", 0)
         
-        total_prs = total_count + closed_count
-        merge_rate = (merged_count / closed_count * 100) if closed_count > 0 else 0
-        
-        return f"""📊 **Pull Request Stats for {repo}**
-
-**Open PRs:** {_format_number(total_count)} ({total_count:,})
-**Closed PRs:** {_format_number(closed_count)} ({closed_count:,})
-**Merged PRs:** {_format_number(merged_count)} ({merged_count:,})
-**Total PRs:** {_format_number(total_prs)} ({total_prs:,})
-
-**Merge Rate:** {merge_rate:.1f}% of closed PRs were merged
-"""
+        return PullRequestStats(repo=repo, open=total_count, closed=closed_count, merged=merged_count)
         
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
 
-def get_repository_stats(repo: str) -> str:
+def get_repository_stats(repo: str) -> RepoStats | ToolError:
     """
     Fetches comprehensive repository statistics.
     
@@ -149,170 +281,181 @@ def get_repository_stats(repo: str) -> str:
         repo: Repository in 'owner/repo' format
     
     Returns:
-        Formatted string with repository statistics
+        Repository statistics
     """
     headers = _get_headers()
     url = f"{GITHUB_BASE_URL}/repos/{repo}"
     
     try:
-        response = httpx.get(url, headers=headers)
+        response = _http_get(url, headers=headers)
         _check_rate_limit(response)
         
         if response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
+            return _not_found(repo)
         if response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
+            return _api_error(response.json().get('message', 'Unknown error'))
         
         data = response.json()
         
-        stats = {
-            "name": data.get("full_name"),
-            "description": data.get("description", "No description"),
-            "stars": data.get("stargazers_count", 0),
-            "forks": data.get("forks_count", 0),
-            "watchers": data.get("subscribers_count", 0),
-            "open_issues": data.get("open_issues_count", 0),
-            "language": data.get("language", "Not specified"),
-            "license": data.get("license", {}).get("name", "No license") if data.get("license") else "No license",
-            "created": data.get("created_at", "")[:10],
-            "updated": data.get("updated_at", "")[:10],
-            "topics": data.get("topics", [])[:5],
-            "default_branch": data.get("default_branch", "main"),
-            "is_fork": data.get("fork", False),
-            "archived": data.get("archived", False),
-            "size_kb": data.get("size", 0)
-        }
-        
-        result = f"""📊 **Repository Stats for {stats['name']}**
-
-📝 **Description:** {stats['description']}
-
-⭐ **Stars:** {_format_number(stats['stars'])} ({stats['stars']:,})
-🍴 **Forks:** {_format_number(stats['forks'])} ({stats['forks']:,})
-👀 **Watchers:** {_format_number(stats['watchers'])} ({stats['watchers']:,})
-🐛 **Open Issues:** {_format_number(stats['open_issues'])} ({stats['open_issues']:,})
-
-💻 **Language:** {stats['language']}
-📜 **License:** {stats['license']}
-📁 **Size:** {stats['size_kb']:,} KB
-🌿 **Default Branch:** {stats['default_branch']}
-
-📅 **Created:** {stats['created']}
-🔄 **Last Updated:** {stats['updated']}
-"""
-        
-        if stats['topics']:
-            result += f"\n🏷️ **Topics:** {', '.join(stats['topics'])}"
-        
-        if stats['archived']:
-            result += "\n\n⚠️ **Note:** This repository is archived."
-        if stats['is_fork']:
-            result += "\n\n🍴 **Note:** This is a forked repository."
-            
-        return result
+        return RepoStats(
+            repo=data.get("full_name"),
+            description=data.get("description"),
+            stars=data.get("stargazers_count", 0),
+            forks=data.get("forks_count", 0),
+            watchers=data.get("subscribers_count", 0),
+            open_issues=data.get("open_issues_count", 0),
+            language=data.get("language"),
+            license=data["license"].get("name") if data.get("license") else None,
+            size_kb=data.get("size", 0),
+            default_branch=data.get("default_branch", "main"),
+            created=(data.get("created_at") or "")[:10],
+            updated=(data.get("updated_at") or "")[:10],
+            topics=tuple(data.get("topics", [])[:5]),
+            archived=data.get("archived", False),
+            is_fork=data.get("fork", False),
+        )
         
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
-def get_top_contributors(repo: str, limit: int = 10) -> str:
+def get_top_contributors(repo: str, limit: int = 10) -> ContributorList | EmptyResult | ToolError:
     """
     Fetches top contributors for a repository.
+    Pages beyond the first are fetched concurrently, so large limits
+    (e.g. top 100 or 500) are supported.
     
     Args:
         repo: Repository in 'owner/repo' format
         limit: Number of top contributors to return (default 10)
     
     Returns:
-        Formatted string with contributor information
+        Contributors with their commit counts, most active first
     """
-    headers = _get_headers()
-    url = f"{GITHUB_BASE_URL}/repos/{repo}/contributors"
-    params = {"per_page": min(limit, 30)}
-    
     try:
-        response = httpx.get(url, headers=headers, params=params)
-        _check_rate_limit(response)
-        
-        if response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
-        if response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
-        
-        contributors = response.json()[:limit]
+        contributors = _collect(f"/repos/{repo}/contributors", max_items=limit)
         
         if not contributors:
-            return f"📊 No contributors found for {repo}."
-        
-        result = f"👥 **Top {len(contributors)} Contributors for {repo}**\n\n"
-        
-        # Calculate total contributions for percentage
-        total_contributions = sum(c.get("contributions", 0) for c in contributors)
-        
-        for i, contributor in enumerate(contributors, 1):
-            name = contributor.get("login", "Unknown")
-            contributions = contributor.get("contributions", 0)
-            percentage = (contributions / total_contributions * 100) if total_contributions > 0 else 0
-            
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            result += f"{medal} **{name}** - {contributions:,} commits ({percentage:.1f}%)\n"
+            return EmptyResult(repo, f"No contributors found for {repo}.")
         
-        return result
+        return ContributorList(repo=repo, contributors=tuple(
+            Contributor(login=c.get("login", "Unknown"), contributions=c.get("contributions", 0))
+            for c in contributors
+        ))
         
+    except httpx.HTTPStatusError as e:
+        return _error_message(repo, e)
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
 
-def get_recent_commits(repo: str, limit: int = 10) -> str:
+def get_recent_commits(repo: str, limit: int = 10, since: Optional[str] = None,
+                       until: Optional[str] = None) -> CommitList | EmptyResult | ToolError:
     """
     Fetches recent commits from a repository.
     
     Args:
         repo: Repository in 'owner/repo' format
         limit: Number of recent commits to return (default 10)
+        since: Only commits after this ISO 8601 timestamp
+        until: Only commits before this ISO 8601 timestamp
     
     Returns:
-        Formatted string with commit information
+        Commits, newest first
     """
-    headers = _get_headers()
-    url = f"{GITHUB_BASE_URL}/repos/{repo}/commits"
-    params = {"per_page": min(limit, 30)}
+    params = {k: v for k, v in (("since", since), ("until", until)) if v}
     
     try:
-        response = httpx.get(url, headers=headers, params=params)
-        _check_rate_limit(response)
-        
-        if response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
-        if response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
-        
-        commits = response.json()[:limit]
+        commits = _collect(f"/repos/{repo}/commits", params=params, max_items=limit)
         
         if not commits:
-            return f"📊 No commits found for {repo}."
-        
-        result = f"📝 **Recent {len(commits)} Commits in {repo}**\n\n"
+            return EmptyResult(repo, f"No commits found for {repo}.")
         
+        result = []
         for commit in commits:
-            sha = commit.get("sha", "")[:7]
             commit_data = commit.get("commit", {})
-            message = commit_data.get("message", "No message").split("\n")[0][:60]
-            author = commit_data.get("author", {}).get("name", "Unknown")
-            date = commit_data.get("author", {}).get("date", "")[:10]
-            
-            result += f"• `{sha}` - {message}\n  👤 {author} | 📅 {date}\n\n"
-        
-        return result
-        
+            author = commit_data.get("author", {})
+            result.append(Commit(
+                sha=commit.get("sha", "")[:7],
+                message=commit_data.get("message", "No message").split("\n")[0][:60],
+                author=author.get("name", "Unknown"),
+                date=author.get("date", "")[:10],
+            ))
+        return CommitList(repo=repo, commits=tuple(result))
+        
+    except httpx.HTTPStatusError as e:
+        return _error_message(repo, e)
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
-def get_issue_stats(repo: str) -> str:
+def get_commit_activity(repo: str, since: str, until: Optional[str] = None,
+                        top: int = 10, max_commits: Optional[int] = None) -> CommitActivity | EmptyResult | ToolError:
+    """
+    Aggregates the commits in a time window (per author and per day).
+    Commits are streamed page by page, so long windows don't sit in memory.
+    
+    Args:
+        repo: Repository in 'owner/repo' format
+        since: Window start as ISO 8601 timestamp
+        until: Window end as ISO 8601 timestamp (default: now)
+        top: Number of most active authors to list
+        max_commits: Count at most this many of the newest commits
+                     (default: GITHUB_COMMIT_ACTIVITY_MAX), so a long window
+                     can't spend the whole rate-limit budget
+    
+    Returns:
+        Commit, author and day totals for the window, marked truncated when
+        the window had more commits than were counted
+    """
+    params = {"since": since}
+    if until:
+        params["until"] = until
+    max_commits = max_commits or settings.Settings.GITHUB_COMMIT_ACTIVITY_MAX
+    
+    async def aggregate():
+        authors, days, seen = Counter(), Counter(), 0
+        # One extra item tells a window of exactly max_commits from a longer one
+        async for commit in iter_paginated(f"/repos/{repo}/commits", params=params,
+                                           max_items=max_commits + 1):
+            seen += 1
+            if seen > max_commits:
+                continue
+            author = commit.get("commit", {}).get("author", {})
+            authors[author.get("name", "Unknown")] += 1
+            days[author.get("date", "")[:10]] += 1
+        return authors, days, min(seen, max_commits), seen > max_commits
+    
+    try:
+        authors, days, total, truncated = _run_sync(aggregate())
+        
+        if not total:
+            return EmptyResult(repo, f"No commits found for {repo} since {since[:10]}.")
+        
+        busiest_day, busiest_count = days.most_common(1)[0]
+        return CommitActivity(
+            repo=repo,
+            since=since,
+            until=until,
+            total=total,
+            authors=len(authors),
+            active_days=len(days),
+            busiest_day=busiest_day,
+            busiest_day_commits=busiest_count,
+            top_authors=tuple(authors.most_common(top)),
+            truncated=truncated,
+        )
+        
+    except httpx.HTTPStatusError as e:
+        return _error_message(repo, e)
+    except httpx.RequestError as e:
+        return _network_error(e)
+
+
+def get_issue_stats(repo: str) -> IssueStats | ToolError:
     """
     Fetches issue statistics for a repository.
     
@@ -320,7 +463,7 @@ def get_issue_stats(repo: str) -> str:
         repo: Repository in 'owner/repo' format
     
     Returns:
-        Formatted string with issue statistics
+        Open and closed issue counts
     """
     headers = _get_headers()
     
@@ -328,12 +471,12 @@ def get_issue_stats(repo: str) -> str:
         # Get open issues count
         open_url = f"{GITHUB_BASE_URL}/repos/{repo}/issues"
         open_params = {"state": "open", "per_page": 1}
-        open_response = httpx.get(open_url, headers=headers, params=open_params)
+        open_response = _http_get(open_url, headers=headers, params=open_params)
         
         if open_response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
+            return _not_found(repo)
         if open_response.status_code != 200:
-            return f"⚠️ GitHub API error: {open_response.json().get('message', 'Unknown error')}"
+            return _api_error(open_response.json().get('message', 'Unknown error'))
         
         # Parse open issues count from Link header
         open_link = open_response.headers.get("Link", "")
@@ -348,7 +491,7 @@ def get_issue_stats(repo: str) -> str:
         
         # Get closed issues count
         closed_params = {"state": "closed", "per_page": 1}
-        closed_response = httpx.get(open_url, headers=headers, params=closed_params)
+        closed_response = _http_get(open_url, headers=headers, params=closed_params)
         
         closed_link = closed_response.headers.get("Link", "")
         closed_links = _parse_link_header(closed_link)
@@ -360,27 +503,14 @@ def get_issue_stats(repo: str) -> str:
         else:
             closed_count = len(closed_response.json())
         
-        total = open_count + closed_count
-        close_rate = (closed_count / total * 100) if total > 0 else 0
-        
-        result = f"""🐛 **Issue Statistics for {repo}**
-
-📊 **Overview:**
-• **Open Issues:** {open_count:,}
-• **Closed Issues:** {closed_count:,}
-• **Total Issues:** {total:,}
-
-✅ **Close Rate:** {close_rate:.1f}%
-"""
-        
-        return result
+        return IssueStats(repo=repo, open=open_count, closed=closed_count)
         
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
-def get_language_breakdown(repo: str) -> str:
+def get_language_breakdown(repo: str) -> LanguageBreakdown | EmptyResult | ToolError:
     """
     Fetches programming language breakdown for a repository.
     
@@ -388,46 +518,35 @@ def get_language_breakdown(repo: str) -> str:
         repo: Repository in 'owner/repo' format
     
     Returns:
-        Formatted string with language breakdown
+        Bytes per language, largest first
     """
     headers = _get_headers()
     url = f"{GITHUB_BASE_URL}/repos/{repo}/languages"
     
     try:
-        response = httpx.get(url, headers=headers)
+        response = _http_get(url, headers=headers)
         _check_rate_limit(response)
         
         if response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
+            return _not_found(repo)
         if response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
+            return _api_error(response.json().get('message', 'Unknown error'))
         
         languages = response.json()
         
         if not languages:
-            return f"📊 No language data available for {repo}."
-        
-        total_bytes = sum(languages.values())
-        
-        result = f"💻 **Language Breakdown for {repo}**\n\n"
+            return EmptyResult(repo, f"No language data available for {repo}.")
         
-        # Sort by bytes and show percentages
+        # Sort by bytes, largest first
         sorted_langs = sorted(languages.items(), key=lambda x: x[1], reverse=True)
-        
-        for lang, bytes_count in sorted_langs:
-            percentage = (bytes_count / total_bytes * 100)
-            bar_length = int(percentage / 5)  # Scale to 20 chars max
-            bar = "█" * bar_length + "░" * (20 - bar_length)
-            result += f"**{lang}**\n{bar} {percentage:.1f}%\n\n"
-        
-        return result
+        return LanguageBreakdown(repo=repo, languages=tuple(sorted_langs))
         
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
-def get_latest_release(repo: str) -> str:
+def get_latest_release(repo: str) -> Release | EmptyResult | ToolError:
     """
     Fetches the latest release information for a repository.
     
@@ -435,64 +554,54 @@ def get_latest_release(repo: str) -> str:
         repo: Repository in 'owner/repo' format
     
     Returns:
-        Formatted string with release information
+        The latest release
     """
     headers = _get_headers()
     url = f"{GITHUB_BASE_URL}/repos/{repo}/releases/latest"
     
     try:
-        response = httpx.get(url, headers=headers)
+        response = _http_get(url, headers=headers)
         _check_rate_limit(response)
         
         if response.status_code == 404:
             releases_url = f"{GITHUB_BASE_URL}/repos/{repo}/releases"
-            releases_response = httpx.get(releases_url, headers=headers, params={"per_page": 1})
+            releases_response = _http_get(releases_url, headers=headers, params={"per_page": 1})
             
             if releases_response.status_code == 404:
-                return f"❌ Repository '{repo}' not found."
+                return _not_found(repo)
             
             releases = releases_response.json()
             if not releases:
-                return f"📦 No releases found for {repo}. The repository may use tags instead."
+                return EmptyResult(repo, f"No releases found for {repo}. The repository may use tags instead.")
             
             data = releases[0]
         elif response.status_code != 200:
-            return f"⚠️ GitHub API error: {response.json().get('message', 'Unknown error')}"
+            return _api_error(response.json().get('message', 'Unknown error'))
         else:
             data = response.json()
         
-        name = data.get("name") or data.get("tag_name", "Unnamed")
-        tag = data.get("tag_name", "No tag")
-        published = data.get("published_at", "")[:10]
-        author = data.get("author", {}).get("login", "Unknown")
-        prerelease = data.get("prerelease", False)
-        body = data.get("body", "No release notes")[:300]
-        
+        body = data.get("body") or "No release notes"
         assets = data.get("assets", [])
-        total_downloads = sum(a.get("download_count", 0) for a in assets)
         
-        result = f"""📦 **Latest Release for {repo}**
-
-🏷️ **{name}** (`{tag}`)
-{'⚠️ Pre-release' if prerelease else '✅ Stable Release'}
-
-📅 **Published:** {published}
-👤 **Author:** {author}
-📥 **Total Downloads:** {total_downloads:,}
-📎 **Assets:** {len(assets)} files
-
-📝 **Release Notes:**
-{body}{'...' if len(data.get('body', '')) > 300 else ''}
-"""
-        
-        return result
+        return Release(
+            repo=repo,
+            name=data.get("name") or data.get("tag_name", "Unnamed"),
+            tag=data.get("tag_name", "No tag"),
+            published=(data.get("published_at") or "")[:10],
+            author=(data.get("author") or {}).get("login", "Unknown"),
+            prerelease=data.get("prerelease", False),
+            downloads=sum(a.get("download_count", 0) for a in assets),
+            assets=len(assets),
+            notes=body[:300],
+            notes_truncated=len(body) > 300,
+        )
         
     except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+        return _network_error(e)
 
 
 
-def get_repo_overview(repo: str) -> str:
+def get_repo_overview(repo: str) -> RepoOverview | ToolError:
     """
     Fetches a comprehensive overview of a repository.
     Combines stats, latest release, and top contributor.
@@ -501,65 +610,137 @@ def get_repo_overview(repo: str) -> str:
         repo: Repository in 'owner/repo' format
     
     Returns:
-        Formatted string with comprehensive repository overview
+        Key metrics, top contributor and top languages
     """
     headers = _get_headers()
     
     try:
         repo_url = f"{GITHUB_BASE_URL}/repos/{repo}"
-        repo_response = httpx.get(repo_url, headers=headers)
+        repo_response = _http_get(repo_url, headers=headers)
         
         if repo_response.status_code == 404:
-            return f"❌ Repository '{repo}' not found."
+            return _not_found(repo)
         if repo_response.status_code != 200:
-            return f"⚠️ GitHub API error: {repo_response.json().get('message', 'Unknown error')}"
+            return _api_error(repo_response.json().get('message', 'Unknown error'))
         
         repo_data = repo_response.json()
         
         # Get top contributor
         contrib_url = f"{GITHUB_BASE_URL}/repos/{repo}/contributors"
-        contrib_response = httpx.get(contrib_url, headers=headers, params={"per_page": 1})
-        top_contributor = "N/A"
+        contrib_response = _http_get(contrib_url, headers=headers, params={"per_page": 1})
+        top_contributor = None
         if contrib_response.status_code == 200 and contrib_response.json():
             top_contributor = contrib_response.json()[0].get("login", "Unknown")
         
         # Get languages
         lang_url = f"{GITHUB_BASE_URL}/repos/{repo}/languages"
-        lang_response = httpx.get(lang_url, headers=headers)
+        lang_response = _http_get(lang_url, headers=headers)
         top_languages = []
         if lang_response.status_code == 200 and lang_response.json():
             langs = lang_response.json()
             total = sum(langs.values())
             top_languages = [(k, v/total*100) for k, v in sorted(langs.items(), key=lambda x: x[1], reverse=True)[:3]]
         
-        result = f"""🚀 **Repository Overview: {repo_data.get('full_name')}**
+        return RepoOverview(
+            repo=repo_data.get("full_name"),
+            description=repo_data.get("description"),
+            stars=repo_data.get("stargazers_count", 0),
+            forks=repo_data.get("forks_count", 0),
+            watchers=repo_data.get("subscribers_count", 0),
+            open_issues=repo_data.get("open_issues_count", 0),
+            top_contributor=top_contributor,
+            top_languages=tuple(top_languages),
+            topics=tuple(repo_data.get("topics", [])[:5]),
+        )
+        
+    except httpx.RequestError as e:
+        return _network_error(e)
 
-📝 {repo_data.get('description', 'No description')}
 
-**📊 Key Metrics:**
-• ⭐ Stars: {_format_number(repo_data.get('stargazers_count', 0))}
-• 🍴 Forks: {_format_number(repo_data.get('forks_count', 0))}
-• 👀 Watchers: {_format_number(repo_data.get('subscribers_count', 0))}
-• 🐛 Open Issues: {_format_number(repo_data.get('open_issues_count', 0))}
+def get_file_content(repo: str, path: str, ref: str) -> Optional[str]:
+    """
+    Fetches the text content of one file at a given commit.
+    
+    Args:
+        repo: Repository in 'owner/repo' format
+        path: File path inside the repository
+        ref: Commit SHA, branch or tag
+    
+    Returns:
+        File content, or None if the file is missing or not UTF-8 text
+    """
+    headers = {**_get_headers(), "Accept": "application/vnd.github.raw+json"}
+    url = f"{GITHUB_BASE_URL}/repos/{repo}/contents/{path}"
+    
+    response = _http_get(url, headers=headers, params={"ref": ref})
+    _check_rate_limit(response)
+    if response.status_code != 200:
+        return None
+    try:
+        return response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
 
-**👤 Top Contributor:** {top_contributor}
-"""
-        
-        if top_languages:
-            lang_str = ", ".join([f"{lang} ({pct:.0f}%)" for lang, pct in top_languages])
-            result += f"\n**💻 Top Languages:** {lang_str}"
-        
-        if repo_data.get('topics'):
-            result += f"\n\n**🏷️ Topics:** {', '.join(repo_data['topics'][:5])}"
-        
-        result += f"\n\n🔗 **URL:** https://github.com/{repo}"
-        
-        return result
-        
-    except httpx.RequestError as e:
-        return f"❌ Network error: {str(e)}"
+
+def get_head_sha(repo: str) -> Optional[str]:
+    """
+    Fetches the commit SHA the default branch currently points to.
+    
+    Returns:
+        The SHA, or None if the repo is missing or GitHub can't be reached
+    """
+    headers = {**_get_headers(), "Accept": "application/vnd.github.sha"}
+    url = f"{GITHUB_BASE_URL}/repos/{repo}/commits/HEAD"
+    
+    try:
+        response = _http_get(url, headers=headers)
+    except httpx.RequestError:
+        return None
+    _check_rate_limit(response)
+    if response.status_code != 200:
+        return None
+    return response.text.strip() or None
+
+
+def get_changed_files(repo: str, base: str, head: str) -> Optional[tuple[list, list]]:
+    """
+    Lists the files that differ between two commits (compare API).
+    
+    Args:
+        repo: Repository in 'owner/repo' format
+        base: Older commit SHA
+        head: Newer commit SHA
+    
+    Returns:
+        (changed, removed) file paths, or None if the comparison failed or was
+        truncated (GitHub lists at most 300 files), in which case the caller
+        should fall back to a full re-index
+    """
+    url = f"{GITHUB_BASE_URL}/repos/{repo}/compare/{base}...{head}"
+    
+    try:
+        response = _http_get(url, headers=_get_headers())
+    except httpx.RequestError:
+        return None
+    _check_rate_limit(response)
+    if response.status_code != 200:
+        return None
+    
+    files = response.json().get("files", [])
+    if len(files) >= 300:
+        return None
+    
+    changed, removed = set(), set()
+    for f in files:
+        if f["status"] == "removed":
+            removed.add(f["filename"])
+        else:
+            changed.add(f["filename"])
+        if f.get("previous_filename"):
+            removed.add(f["previous_filename"])
+    return sorted(changed), sorted(removed - changed)
 
 
-def get_open_pull_request(repo: str) -> str:
+def get_open_pull_request(repo: str) -> PullRequestStats | ToolError:
     """Backward compatible wrapper for get_open_pull_requests."""
     return get_open_pull_requests(repo)
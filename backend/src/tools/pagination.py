@@ -0,0 +1,132 @@
+"""
+Pagination Engine - Concurrent, streaming pagination for GitHub list endpoints
+
+GitHub list endpoints return a `Link` header with a `last` relation once there
+is more than one page. After the first page we know the page count, so the
+remaining pages can be fetched concurrently instead of following `next` one
+request at a time.
+
+Items are streamed through an async iterator in page order. At most
+`concurrency` pages are in flight or buffered at once, so memory stays bounded
+no matter how long the listing is.
+"""
+
+import asyncio
+import inspect
+import re
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Union
+
+import httpx
+
+PAGE_RE = re.compile(r"[?&]page=(\d+)")
+
+
+def parse_link_header(link_header: str) -> Dict[str, str]:
+    """Parse GitHub Link header for pagination info."""
+    links = {}
+    if not link_header:
+        return links
+
+    parts = link_header.split(", ")
+    for part in parts:
+        url_part, rel_part = part.split("; ")
+        url = url_part.strip("<>")
+        rel = rel_part.replace('rel="', '').replace('"', '')
+        links[rel] = url
+    return links
+
+
+def last_page_number(link_header: str) -> Optional[int]:
+    """Return the page number of the `last` link, or None for single-page results."""
+    last = parse_link_header(link_header).get("last")
+    if not last:
+        return None
+    match = PAGE_RE.search(last)
+    return int(match.group(1)) if match else None
+
+
+async def _call(callback: Callable, *args) -> Any:
+    """Call a sync or async callback and return its result."""
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def paginate(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None,
+    per_page: int = 100,
+    max_items: Optional[int] = None,
+    concurrency: int = 4,
+    on_response: Optional[Callable[[httpx.Response], Union[None, Awaitable[None]]]] = None,
+    request_budget: Optional[Callable[[], Union[Optional[int], Awaitable[Optional[int]]]]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Streams every item of a paginated GitHub list endpoint.
+
+    Args:
+        client: Async HTTP client to send requests with
+        url: Full endpoint URL
+        headers: Request headers (auth, API version)
+        params: Extra query params (e.g. since/until)
+        per_page: Page size (GitHub max is 100)
+        max_items: Stop after this many items (also limits pages fetched)
+        concurrency: Max pages in flight/buffered at once
+        on_response: Called with every response (e.g. rate-limit tracking)
+        request_budget: Called after the first page; returns how many more
+                        requests may be spent (None = unlimited)
+
+    Both callbacks may be coroutine functions, so callers can do blocking
+    work (e.g. a shared-state round trip) off the event loop.
+
+    Raises:
+        httpx.HTTPStatusError: If any page returns a non-2xx status
+    """
+    base_params = {**(params or {}), "per_page": per_page}
+
+    async def fetch(page: int) -> httpx.Response:
+        response = await client.get(url, headers=headers, params={**base_params, "page": page})
+        if on_response:
+            await _call(on_response, response)
+        response.raise_for_status()
+        return response
+
+    first = await fetch(1)
+    yielded = 0
+    for item in first.json():
+        if max_items is not None and yielded >= max_items:
+            return
+        yield item
+        yielded += 1
+
+    last_page = last_page_number(first.headers.get("Link", "")) or 1
+    if max_items is not None:
+        last_page = min(last_page, -(-max_items // per_page))
+    if request_budget is not None:
+        budget = await _call(request_budget)
+        if budget is not None:
+            last_page = min(last_page, 1 + max(budget, 0))
+
+    next_page = 2
+    pending: deque = deque()
+    try:
+        while next_page <= last_page or pending:
+            while next_page <= last_page and len(pending) < concurrency:
+                pending.append(asyncio.create_task(fetch(next_page)))
+                next_page += 1
+
+            response = await pending.popleft()
+            for item in response.json():
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,404 @@
+"""
+Tool Result Rendering - Markdown for humans, minimal text for the LLM
+
+- render_markdown(result): the emoji-rich markdown the tools used to return;
+  the answer users get when the synthesizer LLM call fails
+- to_prompt(result): compact `key=value` lines for the synthesizer prompt.
+  No decoration, no duplicated numbers (1.2K (1,234)), no bars or medals,
+  just the facts the model needs to write an answer.
+
+Both accept any tool result from src/tools/results.py; anything else (e.g. a
+RAG answer string) is passed through as str.
+"""
+
+from functools import singledispatch
+
+from src.tools.results import (
+    Comparison,
+    CommitActivity,
+    CommitList,
+    ContributorList,
+    EmptyResult,
+    IssueStats,
+    LanguageBreakdown,
+    PullRequestStats,
+    Release,
+    RepoOverview,
+    RepoStats,
+    RepoTree,
+    SearchResults,
+    SymbolMatches,
+    ToolError,
+)
+
+
+def format_bytes(num: int) -> str:
+    """Format a byte count as B/KB/MB."""
+    if num >= 1024 * 1024:
+        return f"{num / 1024 / 1024:.1f}MB"
+    elif num >= 1024:
+        return f"{num / 1024:.1f}KB"
+    return f"{num}B"
+
+
+def format_number(num: int) -> str:
+    """Format large numbers with K/M suffix for readability."""
+    if num >= 1_000_000:
+        return f"{num / 1_000_000:.1f}M"
+    elif num >= 1_000:
+        return f"{num / 1_000:.1f}K"
+    return str(num)
+
+
+def _flatten(text: str) -> str:
+    """Collapse a markdown result into a single table cell."""
+    lines = [line.strip().replace("**", "") for line in str(text).splitlines()]
+    return " · ".join(line for line in lines if line).replace("|", "\\|")
+
+
+# --- Markdown -------------------------------------------------------------
+
+@singledispatch
+def render_markdown(result) -> str:
+    return str(result)
+
+
+@render_markdown.register
+def _(result: ToolError) -> str:
+    icon = "⚠️" if result.kind in ("rate_limit", "api") else "❌"
+    return f"{icon} {result.message}"
+
+
+@render_markdown.register
+def _(result: EmptyResult) -> str:
+    return f"📊 {result.message}"
+
+
+@render_markdown.register
+def _(result: PullRequestStats) -> str:
+    return f"""📊 **Pull Request Stats for {result.repo}**
+
+**Open PRs:** {format_number(result.open)} ({result.open:,})
+**Closed PRs:** {format_number(result.closed)} ({result.closed:,})
+**Merged PRs:** {format_number(result.merged)} ({result.merged:,})
+**Total PRs:** {format_number(result.total)} ({result.total:,})
+
+**Merge Rate:** {result.merge_rate:.1f}% of closed PRs were merged
+"""
+
+
+@render_markdown.register
+def _(result: RepoStats) -> str:
+    text = f"""📊 **Repository Stats for {result.repo}**
+
+📝 **Description:** {result.description or 'No description'}
+
+⭐ **Stars:** {format_number(result.stars)} ({result.stars:,})
+🍴 **Forks:** {format_number(result.forks)} ({result.forks:,})
+👀 **Watchers:** {format_number(result.watchers)} ({result.watchers:,})
+🐛 **Open Issues:** {format_number(result.open_issues)} ({result.open_issues:,})
+
+💻 **Language:** {result.language or 'Not specified'}
+📜 **License:** {result.license or 'No license'}
+📁 **Size:** {result.size_kb:,} KB
+🌿 **Default Branch:** {result.default_branch}
+
+📅 **Created:** {result.created}
+🔄 **Last Updated:** {result.updated}
+"""
+    if result.topics:
+        text += f"\n🏷️ **Topics:** {', '.join(result.topics)}"
+    if result.archived:
+        text += "\n\n⚠️ **Note:** This repository is archived."
+    if result.is_fork:
+        text += "\n\n🍴 **Note:** This is a forked repository."
+    return text
+
+
+@render_markdown.register
+def _(result: ContributorList) -> str:
+    text = f"👥 **Top {len(result.contributors)} Contributors for {result.repo}**\n\n"
+    total = result.total_contributions
+    for i, c in enumerate(result.contributors, 1):
+        percentage = (c.contributions / total * 100) if total > 0 else 0
+        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+        text += f"{medal} **{c.login}** - {c.contributions:,} commits ({percentage:.1f}%)\n"
+    return text
+
+
+@render_markdown.register
+def _(result: CommitList) -> str:
+    text = f"📝 **Recent {len(result.commits)} Commits in {result.repo}**\n\n"
+    for c in result.commits:
+        text += f"• `{c.sha}` - {c.message}\n  👤 {c.author} | 📅 {c.date}\n\n"
+    return text
+
+
+@render_markdown.register
+def _(result: CommitActivity) -> str:
+    window = f"{result.since[:10]} → {result.until[:10] if result.until else 'now'}"
+    commits = f"{result.total:,}+ (only the newest {result.total:,} were counted)" if result.truncated else f"{result.total:,}"
+    text = f"""📈 **Commit Activity for {result.repo}** ({window})
+
+• **Commits:** {commits}
+• **Authors:** {result.authors:,}
+• **Active Days:** {result.active_days:,}
+• **Busiest Day:** {result.busiest_day} ({result.busiest_day_commits:,} commits)
+
+👥 **Most Active Authors:**
+"""
+    for name, count in result.top_authors:
+        text += f"• **{name}** - {count:,} commits\n"
+    return text
+
+
+@render_markdown.register
+def _(result: IssueStats) -> str:
+    return f"""🐛 **Issue Statistics for {result.repo}**
+
+📊 **Overview:**
+• **Open Issues:** {result.open:,}
+• **Closed Issues:** {result.closed:,}
+• **Total Issues:** {result.total:,}
+
+✅ **Close Rate:** {result.close_rate:.1f}%
+"""
+
+
+@render_markdown.register
+def _(result: LanguageBreakdown) -> str:
+    text = f"💻 **Language Breakdown for {result.repo}**\n\n"
+    for lang, percentage in result.percentages():
+        bar_length = int(percentage / 5)  # Scale to 20 chars max
+        bar = "█" * bar_length + "░" * (20 - bar_length)
+        text += f"**{lang}**\n{bar} {percentage:.1f}%\n\n"
+    return text
+
+
+@render_markdown.register
+def _(result: Release) -> str:
+    return f"""📦 **Latest Release for {result.repo}**
+
+🏷️ **{result.name}** (`{result.tag}`)
+{'⚠️ Pre-release' if result.prerelease else '✅ Stable Release'}
+
+📅 **Published:** {result.published}
+👤 **Author:** {result.author}
+📥 **Total Downloads:** {result.downloads:,}
+📎 **Assets:** {result.assets} files
+
+📝 **Release Notes:**
+{result.notes}{'...' if result.notes_truncated else ''}
+"""
+
+
+@render_markdown.register
+def _(result: RepoOverview) -> str:
+    text = f"""🚀 **Repository Overview: {result.repo}**
+
+📝 {result.description or 'No description'}
+
+**📊 Key Metrics:**
+• ⭐ Stars: {format_number(result.stars)}
+• 🍴 Forks: {format_number(result.forks)}
+• 👀 Watchers: {format_number(result.watchers)}
+• 🐛 Open Issues: {format_number(result.open_issues)}
+
+**👤 Top Contributor:** {result.top_contributor or 'N/A'}
+"""
+    if result.top_languages:
+        lang_str = ", ".join(f"{lang} ({pct:.0f}%)" for lang, pct in result.top_languages)
+        text += f"\n**💻 Top Languages:** {lang_str}"
+    if result.topics:
+        text += f"\n\n**🏷️ Topics:** {', '.join(result.topics)}"
+    text += f"\n\n🔗 **URL:** https://github.com/{result.repo}"
+    return text
+
+
+@render_markdown.register
+def _(result: SearchResults) -> str:
+    if not result.hits:
+        return f"🔍 No web results found for \"{result.query}\"."
+    text = f"🔍 **Web results for \"{result.query}\"**\n\n"
+    for hit in result.hits:
+        text += f"• [{hit.title}]({hit.url})\n  {hit.content}\n\n"
+    return text
+
+
+@render_markdown.register
+def _(result: RepoTree) -> str:
+    where = f"`{result.root}`" if result.root else result.repo
+    text = f"🗂️ **Structure of {where}** ({result.files:,} files, {format_bytes(result.bytes)})\n\n"
+    if result.languages:
+        total = sum(size for _, size in result.languages) or 1
+        text += "**💻 Languages:** " + ", ".join(
+            f"{lang} ({size / total * 100:.0f}%)" for lang, size in result.languages[:5]) + "\n\n"
+    lines = []
+    for entry in result.entries:
+        depth = entry.path[len(result.root):].rstrip("/").count("/")
+        name = entry.path.rstrip("/").rsplit("/", 1)[-1] + ("/" if entry.path.endswith("/") else "")
+        if entry.path.endswith("/"):
+            detail = f"{entry.files} files, {format_bytes(entry.bytes)}" + (f", {entry.language}" if entry.language else "")
+        else:
+            detail = format_bytes(entry.bytes) + (f" — {', '.join(entry.symbols)}" if entry.symbols else "")
+        lines.append(f"{'  ' * depth}{name}  ({detail})")
+    if result.truncated:
+        lines.append(f"… {result.truncated} more")
+    return text + "```\n" + "\n".join(lines) + "\n```"
+
+
+@render_markdown.register
+def _(result: SymbolMatches) -> str:
+    if not result.matches:
+        return f"🔎 No definition of `{result.symbol}` found in {result.repo}."
+    text = f"🔎 **`{result.symbol}` in {result.repo}**\n\n"
+    for m in result.matches:
+        text += f"• `{m.name}` ({m.kind}) — `{m.path}:{m.line}`\n"
+    if result.total > len(result.matches):
+        text += f"\n… and {result.total - len(result.matches)} more\n"
+    return text
+
+
+@render_markdown.register
+def _(result: Comparison) -> str:
+    repos = len(result.results) + len(result.failures)
+    text = f"📊 **Comparison ({result.action}) of {repos} repositories**\n\n"
+    text += "| Repository | Result |\n|---|---|\n"
+    for repo, item in result.results:
+        text += f"| {repo} | {_flatten(render_markdown(item))} |\n"
+    if result.failures:
+        text += f"\n⚠️ **Partial results:** {len(result.failures)} of {repos} lookups failed\n"
+        for repo, error in result.failures:
+            text += f"• {repo}: {_flatten(render_markdown(error))}\n"
+    return text
+
+
+# --- Prompt serialization ---------------------------------------------------
+
+def _kv(label: str, /, **fields) -> str:
+    parts = [label] + [f"{k}={v}" for k, v in fields.items() if v not in (None, "", ())]
+    return " ".join(parts)
+
+
+@singledispatch
+def to_prompt(result) -> str:
+    return str(result)
+
+
+@to_prompt.register
+def _(result: ToolError) -> str:
+    return _kv("error", kind=result.kind, message=result.message)
+
+
+@to_prompt.register
+def _(result: EmptyResult) -> str:
+    return _kv("empty", repo=result.repo, message=result.message)
+
+
+@to_prompt.register
+def _(result: PullRequestStats) -> str:
+    return _kv("pull_requests", repo=result.repo, open=result.open, closed=result.closed,
+               merged=result.merged, merge_rate=f"{result.merge_rate:.1f}%")
+
+
+@to_prompt.register
+def _(result: RepoStats) -> str:
+    return _kv(
+        "repo_stats", repo=result.repo, description=result.description, stars=result.stars,
+        forks=result.forks, watchers=result.watchers, open_issues=result.open_issues,
+        language=result.language, license=result.license, size_kb=result.size_kb,
+        default_branch=result.default_branch, created=result.created, updated=result.updated,
+        topics=",".join(result.topics), archived=result.archived or None, fork=result.is_fork or None,
+    )
+
+
+@to_prompt.register
+def _(result: ContributorList) -> str:
+    people = ",".join(f"{c.login}:{c.contributions}" for c in result.contributors)
+    return _kv("contributors", repo=result.repo, total_commits=result.total_contributions, top=people)
+
+
+@to_prompt.register
+def _(result: CommitList) -> str:
+    lines = [_kv("commits", repo=result.repo, count=len(result.commits))]
+    lines += [f"{c.sha} {c.date} {c.author}: {c.message}" for c in result.commits]
+    return "\n".join(lines)
+
+
+@to_prompt.register
+def _(result: CommitActivity) -> str:
+    authors = ",".join(f"{name}:{count}" for name, count in result.top_authors)
+    return _kv("commit_activity", repo=result.repo, since=result.since[:10],
+               until=result.until[:10] if result.until else "now",
+               commits=f"{result.total}+" if result.truncated else result.total,
+               authors=result.authors, active_days=result.active_days,
+               busiest_day=f"{result.busiest_day}:{result.busiest_day_commits}", top_authors=authors)
+
+
+@to_prompt.register
+def _(result: IssueStats) -> str:
+    return _kv("issues", repo=result.repo, open=result.open, closed=result.closed,
+               close_rate=f"{result.close_rate:.1f}%")
+
+
+@to_prompt.register
+def _(result: LanguageBreakdown) -> str:
+    langs = ",".join(f"{lang}:{pct:.1f}%" for lang, pct in result.percentages())
+    return _kv("languages", repo=result.repo, share=langs)
+
+
+@to_prompt.register
+def _(result: Release) -> str:
+    header = _kv("release", repo=result.repo, name=result.name, tag=result.tag,
+                 published=result.published, author=result.author,
+                 prerelease=result.prerelease or None, downloads=result.downloads, assets=result.assets)
+    notes = " ".join(result.notes.split())
+    return f"{header}\nnotes: {notes}" if notes else header
+
+
+@to_prompt.register
+def _(result: RepoOverview) -> str:
+    langs = ",".join(f"{lang}:{pct:.0f}%" for lang, pct in result.top_languages)
+    return _kv("overview", repo=result.repo, description=result.description, stars=result.stars,
+               forks=result.forks, watchers=result.watchers, open_issues=result.open_issues,
+               top_contributor=result.top_contributor, languages=langs, topics=",".join(result.topics))
+
+
+@to_prompt.register
+def _(result: SearchResults) -> str:
+    if not result.hits:
+        return f"no web results for: {result.query}"
+    lines = [f"web results for: {result.query}"]
+    for i, hit in enumerate(result.hits, 1):
+        lines.append(f"{i}. {hit.title} <{hit.url}> {hit.content}")
+        if hit.page_content:
+            lines.append(f"   page: {hit.page_content}")
+    return "\n".join(lines)
+
+
+@to_prompt.register
+def _(result: RepoTree) -> str:
+    langs = ",".join(f"{lang}:{format_bytes(size)}" for lang, size in result.languages[:5])
+    lines = [_kv("repo_tree", repo=result.repo, root=result.root or "/", files=result.files,
+                 size=format_bytes(result.bytes), languages=langs, omitted_entries=result.truncated or None)]
+    for entry in result.entries:
+        if entry.path.endswith("/"):
+            lines.append(_kv(entry.path, files=entry.files, size=format_bytes(entry.bytes), lang=entry.language))
+        else:
+            lines.append(_kv(entry.path, size=format_bytes(entry.bytes), symbols=",".join(entry.symbols)))
+    return "\n".join(lines)
+
+
+@to_prompt.register
+def _(result: SymbolMatches) -> str:
+    lines = [_kv("symbol_definitions", repo=result.repo, symbol=result.symbol, found=result.total)]
+    lines += [f"{m.kind} {m.name} {m.path}:{m.line}" for m in result.matches]
+    return "\n".join(lines)
+
+
+@to_prompt.register
+def _(result: Comparison) -> str:
+    lines = [f"comparison action={result.action}"]
+    lines += [to_prompt(item) for _, item in result.results]
+    lines += [f"failed {repo}: {error.message}" for repo, error in result.failures]
+    return "\n".join(lines)
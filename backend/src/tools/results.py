@@ -0,0 +1,226 @@
+"""
+Tool Results - Typed, compact payloads returned by the GitHub and search tools
+
+Tools return these instead of pre-rendered markdown. src/tools/render.py turns
+them into markdown for humans (render_markdown) or into a minimal text form
+for the synthesizer prompt (to_prompt).
+
+All results are frozen slotted dataclasses: cheap to keep in the result
+cache and safe to share between threads.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ToolError:
+    """
+    A failed lookup.
+
+    kind is one of: not_found, rate_limit, api, network
+    """
+    message: str
+    kind: str = "api"
+
+    # Checked by observability.tracing.is_error_result
+    is_error = True
+
+
+@dataclass(frozen=True, slots=True)
+class EmptyResult:
+    """The lookup worked but there is nothing to show (no releases, no commits, ...)."""
+    repo: str
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class PullRequestStats:
+    repo: str
+    open: int
+    closed: int
+    merged: int
+
+    @property
+    def total(self) -> int:
+        return self.open + self.closed
+
+    @property
+    def merge_rate(self) -> float:
+        return self.merged / self.closed * 100 if self.closed else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class RepoStats:
+    repo: str
+    description: Optional[str]
+    stars: int
+    forks: int
+    watchers: int
+    open_issues: int
+    language: Optional[str]
+    license: Optional[str]
+    size_kb: int
+    default_branch: str
+    created: str
+    updated: str
+    topics: tuple = ()
+    archived: bool = False
+    is_fork: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Contributor:
+    login: str
+    contributions: int
+
+
+@dataclass(frozen=True, slots=True)
+class ContributorList:
+    repo: str
+    contributors: tuple  # of Contributor, most active first
+
+    @property
+    def total_contributions(self) -> int:
+        return sum(c.contributions for c in self.contributors)
+
+
+@dataclass(frozen=True, slots=True)
+class Commit:
+    sha: str
+    message: str
+    author: str
+    date: str
+
+
+@dataclass(frozen=True, slots=True)
+class CommitList:
+    repo: str
+    commits: tuple  # of Commit, newest first
+
+
+@dataclass(frozen=True, slots=True)
+class CommitActivity:
+    repo: str
+    since: str
+    until: Optional[str]
+    total: int
+    authors: int
+    active_days: int
+    busiest_day: str
+    busiest_day_commits: int
+    top_authors: tuple  # of (name, commits)
+    truncated: bool = False  # window had more commits than were counted (newest first)
+
+
+@dataclass(frozen=True, slots=True)
+class IssueStats:
+    repo: str
+    open: int
+    closed: int
+
+    @property
+    def total(self) -> int:
+        return self.open + self.closed
+
+    @property
+    def close_rate(self) -> float:
+        return self.closed / self.total * 100 if self.total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageBreakdown:
+    repo: str
+    languages: tuple  # of (language, bytes), largest first
+
+    def percentages(self) -> list[tuple[str, float]]:
+        total = sum(size for _, size in self.languages) or 1
+        return [(lang, size / total * 100) for lang, size in self.languages]
+
+
+@dataclass(frozen=True, slots=True)
+class Release:
+    repo: str
+    name: str
+    tag: str
+    published: str
+    author: str
+    prerelease: bool
+    downloads: int
+    assets: int
+    notes: str
+    notes_truncated: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RepoOverview:
+    repo: str
+    description: Optional[str]
+    stars: int
+    forks: int
+    watchers: int
+    open_issues: int
+    top_contributor: Optional[str]
+    top_languages: tuple = ()  # of (language, percent)
+    topics: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    title: str
+    url: str
+    content: str
+    page_content: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResults:
+    query: str
+    provider: str
+    hits: tuple  # of SearchHit
+
+
+@dataclass(frozen=True, slots=True)
+class TreeEntry:
+    path: str       # directories end with "/"
+    files: int      # files below a directory (1 for a file)
+    bytes: int
+    language: Optional[str] = None  # main language of a directory
+    symbols: tuple = ()             # top-level symbol names of a file
+
+
+@dataclass(frozen=True, slots=True)
+class RepoTree:
+    """Part of a repo's directory tree, from the repo index built at ingestion."""
+    repo: str
+    root: str       # "" for the repository root, else "dir/sub/"
+    files: int
+    bytes: int
+    languages: tuple = ()  # of (language, bytes), largest first
+    entries: tuple = ()    # of TreeEntry, depth first
+    truncated: int = 0     # entries left out to keep the answer short
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolLocation:
+    name: str
+    kind: str  # class, function, method, variable, interface, type, enum, heading
+    path: str
+    line: int
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolMatches:
+    """Where a name is defined, from the repo index built at ingestion."""
+    repo: str
+    symbol: str
+    matches: tuple  # of SymbolLocation, best first
+    total: int      # matches before the result was cut
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """One action run for several repos; failed lookups are kept apart."""
+    action: str
+    results: tuple = ()   # of (repo, result), in request order
+    failures: tuple = ()  # of (repo, ToolError)
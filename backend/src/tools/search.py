@@ -1,40 +1,240 @@
+"""
+Web Search - Async, cached and deadline-bounded search over pluggable providers
+
+- Per-call deadline (SEARCH_DEADLINE): the search returns an error result
+  instead of blocking a worker for as long as the provider takes
+- Hedged requests: when the preferred provider hasn't answered within
+  SEARCH_HEDGE_DELAY (or fails), the next provider is queried as well and
+  the first non-empty answer wins
+- TTL cache keyed on the normalized query
+- Optional concurrent fetching of the top result pages (SEARCH_FETCH_PAGES),
+  trimmed to SEARCH_PAGE_CHARS of visible text each
+
+`aweb_search` is the async entry point; `web_search` is the sync wrapper used
+by the router. The shared backend is built on first use (get_search_backend),
+so a bad SEARCH_PROVIDERS setting is reported by settings.validate() at
+startup rather than failing the import.
+"""
+
+import asyncio
+import html
+import re
+from typing import Dict, List, Optional
+
 import httpx
-from typing import List, Dict
-from duckduckgo_search import DDGS
 
-def web_search(query: str, num_results: int = 5) -> List[Dict]:
+from src.config.settings import settings
+from src.observability.tracing import stage_span
+from src.tools.cache import ToolResultCache, make_result_cache
+from src.tools.results import SearchHit, SearchResults, ToolError
+from src.tools.search_providers import SearchProvider, build_providers
+from src.utils.aio import run_sync
+
+_SCRIPT_RE = re.compile(r"<(script|style|noscript)\b.*?</\1>", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Used by the providers and page fetches; benchmarks swap in a SearxNG stand-in
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Route SearxNG and page-fetch requests through a custom httpx transport (None = network)."""
+    global _transport
+    _transport = transport
+
+
+def normalize_query(query: str) -> str:
+    """Case/whitespace/trailing-punctuation insensitive cache key."""
+    return " ".join(query.lower().split()).strip(" ?!.")
+
+
+def html_to_text(page: str, max_chars: int) -> str:
+    """Strip scripts, styles and tags from an HTML page and trim it."""
+    text = _TAG_RE.sub(" ", _SCRIPT_RE.sub(" ", page))
+    text = " ".join(html.unescape(text).split())
+    return text[:max_chars]
+
+
+class SearchBackend:
+    """
+    Runs searches across providers with a deadline, hedging and a result cache.
+
+    Args:
+        providers: Providers in preference order
+        deadline: Seconds a whole search (including page fetches) may take
+        hedge_delay: Seconds to wait on a provider before also asking the next
+        cache: Result cache (None disables caching)
+        fetch_pages: How many top result pages to fetch (0 = off)
+        page_chars: Max characters of text kept per fetched page
+    """
+
+    def __init__(self, providers: List[SearchProvider], deadline: float, hedge_delay: float,
+                 cache: Optional[ToolResultCache] = None, fetch_pages: int = 0,
+                 page_chars: int = 2000):
+        self.providers = providers
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.cache = cache
+        self.fetch_pages = fetch_pages
+        self.page_chars = page_chars
+
+    async def search(self, query: str, num_results: int = 5,
+                     fetch_pages: Optional[int] = None) -> SearchResults | ToolError:
+        """Search the web; failures are returned as a ToolError like the other tools."""
+        fetch_pages = self.fetch_pages if fetch_pages is None else fetch_pages
+        cache_key = f"{num_results}:{fetch_pages}"
+        normalized = normalize_query(query)
+
+        with stage_span("web_search", action="search") as span:
+            if self.cache is not None:
+                cached = self.cache.get(cache_key, normalized)
+                if cached is not None:
+                    span.action = "cache"
+                    return cached
+
+            loop = asyncio.get_running_loop()
+            deadline_at = loop.time() + self.deadline
+            print(f"🔍 Searching the web for: {query}")
+
+            async with httpx.AsyncClient(transport=_transport, timeout=self.deadline,
+                                         follow_redirects=True) as client:
+                provider, results, errors = await self._hedged_search(client, query, num_results, deadline_at)
+                if provider is None:
+                    if loop.time() >= deadline_at:
+                        span.outcome = "error"
+                        return ToolError(f"Search failed: no provider answered within {self.deadline:g}s",
+                                         kind="network")
+                    if errors:
+                        span.outcome = "error"
+                        return ToolError(f"Search failed: {'; '.join(errors)}", kind="network")
+                    return SearchResults(query=query, provider="none", hits=())
+
+                span.action = provider
+                if fetch_pages:
+                    await self._fetch_pages(client, results[:fetch_pages], deadline_at)
+
+            print(f"✅ Found {len(results)} results via {provider}")
+            hits = SearchResults(query=query, provider=provider, hits=tuple(
+                SearchHit(title=r["title"], url=r["url"], content=r["content"],
+                          page_content=r.get("page_content"))
+                for r in results
+            ))
+            if self.cache is not None:
+                self.cache.set(cache_key, normalized, hits)
+            return hits
+
+    async def _hedged_search(self, client: httpx.AsyncClient, query: str, num_results: int,
+                             deadline_at: float):
+        """Returns (provider name, results, errors); name is None if nobody answered in time."""
+        loop = asyncio.get_running_loop()
+        remaining_providers = iter(self.providers)
+        tasks: dict = {}
+        errors: List[str] = []
+
+        def launch() -> None:
+            provider = next(remaining_providers, None)
+            if provider is not None:
+                tasks[asyncio.create_task(provider.search(client, query, num_results))] = provider.name
+
+        launch()
+        try:
+            while tasks:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    tasks, timeout=min(self.hedge_delay, remaining), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Preferred provider is slow: hedge with the next one
+                    launch()
+                    continue
+                for task in done:
+                    name = tasks.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(f"{name}: {str(error) or type(error).__name__}")
+                    elif task.result():
+                        return name, task.result(), errors
+                if not tasks:
+                    # Everything in flight failed or came back empty: try the next provider now
+                    launch()
+            return None, [], errors
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_pages(self, client: httpx.AsyncClient, results: List[Dict], deadline_at: float) -> None:
+        """Add trimmed page text to results in place; pages not fetched by the deadline are skipped."""
+        async def fetch(result: Dict) -> None:
+            response = await client.get(result["url"])
+            response.raise_for_status()
+            if "html" in response.headers.get("content-type", ""):
+                result["page_content"] = html_to_text(response.text, self.page_chars)
+
+        tasks = [asyncio.create_task(fetch(r)) for r in results if r.get("url")]
+        if not tasks:
+            return
+        remaining = max(deadline_at - asyncio.get_running_loop().time(), 0)
+        _, pending = await asyncio.wait(tasks, timeout=remaining)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Built on first use from the SEARCH_* settings, not at import time
+_search_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the shared search backend, creating it on first use."""
+    global _search_backend
+    if _search_backend is None:
+        _search_backend = SearchBackend(
+            providers=build_providers(settings.SEARCH_PROVIDERS),
+            deadline=settings.SEARCH_DEADLINE,
+            hedge_delay=settings.SEARCH_HEDGE_DELAY,
+            cache=make_result_cache(
+                ttl=settings.SEARCH_CACHE_TTL,
+                max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+                name="web_search"
+            ),
+            fetch_pages=settings.SEARCH_FETCH_PAGES,
+            page_chars=settings.SEARCH_PAGE_CHARS,
+        )
+    return _search_backend
+
+
+def set_search_backend(backend: Optional[SearchBackend]) -> None:
+    """Replace the shared search backend (e.g. one with stand-in providers); None resets it."""
+    global _search_backend
+    _search_backend = backend
+
+
+def __getattr__(name):
+    # Keeps `search.search_backend` working, lazily
+    if name == "search_backend":
+        return get_search_backend()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def aweb_search(query: str, num_results: int = 5,
+                      fetch_pages: Optional[int] = None) -> SearchResults | ToolError:
+    """Async web search through the shared backend."""
+    return await get_search_backend().search(query, num_results, fetch_pages)
+
+
+def web_search(query: str, num_results: int = 5) -> SearchResults | ToolError:
     """
-    Search the web using DuckDuckGo.
+    Search the web (DuckDuckGo / SearxNG).
 
     Parameters:
         query (str): the search query
         num_results (int): how many results to return
 
     Returns:
-        List of search results (title, url, content)
+        SearchResults (title, url, content[, page_content] per hit)
     """
-    try:
-        print(f"🔍 Searching DuckDuckGo for: {query}")
-        
-        # Use DuckDuckGo search
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=num_results))
-        
-        if not results:
-            return [{"message": "No results found"}]
-        
-        # Format results
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "title": result.get("title", "No title"),
-                "url": result.get("href", result.get("link", "")),
-                "content": result.get("body", result.get("snippet", "No description"))
-            })
-        
-        print(f"✅ Found {len(formatted_results)} results")
-        return formatted_results
-        
-    except Exception as e:
-        print(f"❌ Search error: {str(e)}")
-        return [{"error": f"Search failed: {str(e)}"}]
\ No newline at end of file
+    return run_sync(aweb_search(query, num_results))
@@ -0,0 +1,103 @@
+"""
+Search Providers - Pluggable async web search backends
+
+- DuckDuckGoProvider: duckduckgo_search (sync library) on a dedicated thread pool
+- SearxNGProvider: a SearxNG instance's JSON API over httpx
+
+Every provider returns results as {"title", "url", "content"} dicts and raises
+on failure; deadlines, hedging and caching live in src/tools/search.py.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import httpx
+
+from src.config.settings import settings
+
+# DDGS is blocking. Its own pool (instead of asyncio.to_thread) means a search
+# abandoned at its deadline never holds up event loop shutdown.
+_ddg_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ddg")
+
+
+class SearchProvider(ABC):
+    """Base class: `search` returns up to num_results formatted results."""
+
+    name = "base"
+
+    @abstractmethod
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int) -> List[Dict]:
+        ...
+
+
+class DuckDuckGoProvider(SearchProvider):
+    name = "duckduckgo"
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_ddg_executor, self._search_sync, query, num_results)
+
+    @staticmethod
+    def _search_sync(query: str, num_results: int) -> List[Dict]:
+        from duckduckgo_search import DDGS
+
+        with DDGS() as ddgs:
+            results = list(ddgs.text(query, max_results=num_results))
+        return [
+            {
+                "title": result.get("title", "No title"),
+                "url": result.get("href", result.get("link", "")),
+                "content": result.get("body", result.get("snippet", "No description"))
+            }
+            for result in results
+        ]
+
+
+class SearxNGProvider(SearchProvider):
+    """
+    Queries a SearxNG instance (needs `json` enabled in its search.formats).
+
+    Args:
+        base_url: Instance URL, e.g. http://localhost:8080
+    """
+
+    name = "searxng"
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int) -> List[Dict]:
+        response = await client.get(
+            f"{self.base_url}/search",
+            params={"q": query, "format": "json"},
+            headers={"Accept": "application/json"},
+        )
+        response.raise_for_status()
+        return [
+            {
+                "title": result.get("title", "No title"),
+                "url": result.get("url", ""),
+                "content": result.get("content") or "No description"
+            }
+            for result in response.json().get("results", [])[:num_results]
+        ]
+
+
+def build_providers(names: List[str]) -> List[SearchProvider]:
+    """
+    Instantiate providers by name, in the given (preference) order.
+
+    Raises:
+        ValueError: If a name isn't a known provider (the message lists them)
+    """
+    factories = {
+        "duckduckgo": DuckDuckGoProvider,
+        "searxng": lambda: SearxNGProvider(settings.SEARXNG_URL),
+    }
+    unknown = [name for name in names if name not in factories]
+    if unknown:
+        raise ValueError(f"Unknown search provider(s) {', '.join(unknown)}; "
+                         f"valid providers: {', '.join(factories)}")
+    return [factories[name]() for name in names]
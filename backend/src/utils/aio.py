@@ -0,0 +1,38 @@
+"""
+Asyncio helpers for calling async code from the sync tool/agent layer
+
+Coroutines run on one background event loop shared by the whole process, so
+async clients created on it (e.g. the GitHub pagination client) keep their
+connection pools across calls instead of being rebuilt per call.
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="aio-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared loop and wait for it (callable from any thread but the loop's own)."""
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the shared event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
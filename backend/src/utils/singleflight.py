@@ -0,0 +1,98 @@
+"""
+Single-flight - Coalesce identical in-flight work
+
+Concurrent callers asking for the same key share one underlying execution:
+the first caller runs the function, the others block until it finishes and
+get the same result (or the same exception). Nothing is cached afterwards -
+once the call completes, the next caller starts a fresh execution.
+
+Usage:
+    _flight = SingleFlight("github_http")
+    response = _flight.do(("GET", url), client.get, url)
+
+AsyncSingleFlight does the same for coroutines running on one event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from src.observability.metrics import SINGLEFLIGHT_SAVED
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group; `name` labels the calls-saved metric."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            SINGLEFLIGHT_SAVED.labels(self.name).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for coroutine functions, used from a single event loop.
+
+    A caller that is cancelled stops waiting, but the shared call keeps
+    running for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            SINGLEFLIGHT_SAVED.labels(self.name).inc()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._tasks.pop(key, None)
+        # Every caller may have been cancelled: mark a failure as seen
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
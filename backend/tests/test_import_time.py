@@ -0,0 +1,33 @@
+"""
+Import Time Test - Cold start budget for `import src.main`
+
+Runs benchmarks.import_time in fresh interpreters and fails when the median
+import exceeds BUDGET_MS or a module from DEFERRED_MODULES loads eagerly.
+
+Usage (from backend/):
+    python -m pytest tests/test_import_time.py
+    python -m unittest tests.test_import_time
+"""
+
+import unittest
+
+from benchmarks.import_time import BUDGET_MS, measure
+
+
+class ImportTimeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.median_ms, cls.eager, _ = measure(runs=5)
+
+    def test_deferred_modules_are_not_imported(self):
+        self.assertEqual(self.eager, [], f"imported eagerly, expected deferred: {self.eager}")
+
+    def test_within_budget(self):
+        self.assertLessEqual(
+            self.median_ms, BUDGET_MS,
+            f"import src.main took {self.median_ms:.0f} ms (median), budget {BUDGET_MS} ms",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
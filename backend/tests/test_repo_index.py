@@ -0,0 +1,271 @@
+"""
+Repo Index Test - What the repo index stores and which questions it answers
+
+parse_structural_query must only claim structure and symbol questions;
+anything about file contents or behaviour has to go on to RAG. RepoIndex is
+built from in-memory Documents (plus a file listing) to check the tree,
+find_symbol and the per-language symbol extractors.
+
+Usage (from backend/):
+    python -m pytest tests/test_repo_index.py
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("GITHUB_TOKEN", "test")
+
+from langchain_core.documents import Document  # noqa: E402
+
+from src.rag.repo_index import RepoIndex, extract_symbols, parse_structural_query  # noqa: E402
+
+REPO = "fastapi/fastapi"
+
+TREE_QUESTIONS = [
+    "What is the folder structure of fastapi/fastapi?",
+    "How is the repo structured?",
+    "What's in the `fastapi/` folder?",
+    "List the files in src/agents/",
+    "list files under src/agents",
+    "Show me the contents of the docs directory",
+    "show the folders in the root folder",
+    "List all the files in the `tests` dir of fastapi/fastapi",
+]
+
+SYMBOL_QUESTIONS = {
+    "Where is the APIRouter class defined in fastapi/fastapi?": "APIRouter",
+    "Which file defines `get_openapi`?": "get_openapi",
+    "Find the definition of Depends": "Depends",
+}
+
+RAG_QUESTIONS = [
+    "Show me the contents of the README",
+    "show me the contents of README.md",
+    "Show me the contents of src/main.py",
+    "List the files that handle authentication",
+    "Show me the files related to routing in fastapi/fastapi",
+    "List the contents of the settings object",
+    "How does dependency injection work in fastapi/fastapi?",
+    "What does the APIRouter class do?",
+    "Explain the structure of the request handling code path",
+]
+
+
+class ParseStructuralQueryTest(unittest.TestCase):
+    def test_tree_questions(self):
+        for question in TREE_QUESTIONS:
+            with self.subTest(question=question):
+                parsed = parse_structural_query(question, REPO)
+                self.assertIsNotNone(parsed)
+                self.assertEqual(parsed[0], "tree")
+
+    def test_symbol_questions(self):
+        for question, name in SYMBOL_QUESTIONS.items():
+            with self.subTest(question=question):
+                self.assertEqual(parse_structural_query(question, REPO), ("symbol", name))
+
+    def test_content_questions_go_to_rag(self):
+        for question in RAG_QUESTIONS:
+            with self.subTest(question=question):
+                self.assertIsNone(parse_structural_query(question, REPO))
+
+
+PYTHON_SOURCE = """\
+import os
+
+MAX_RETRIES = 3
+timeout: float = 1.5
+
+
+class APIRouter:
+    def add_route(self, path):
+        pass
+
+    async def _dispatch(self, request):
+        pass
+
+
+def get_openapi(app):
+    return {}
+
+
+async def serve():
+    pass
+"""
+
+JS_SOURCE = """\
+export default function createApp() {}
+export async function fetchData(url) {}
+export class Router {}
+export const routes = [];
+let counter = 0;
+interface Props {}
+export type Handler = () => void;
+enum Color { Red }
+  const nested = 1;
+"""
+
+JAVA_SOURCE = """\
+package com.example;
+
+public class UserService {
+    private final Repo repo;
+
+    public User findUser(String id) {
+        if (id == null) {
+            return null;
+        }
+        return repo.get(id);
+    }
+
+    public static <T> List<T> listAll(Class<T> type) {
+        return List.of();
+    }
+}
+
+interface Repo {}
+"""
+
+MARKDOWN_SOURCE = """\
+# Project Title
+
+Intro text.
+
+## Getting Started
+
+```bash
+# not a heading
+```
+
+### Deep heading
+"""
+
+
+def _doc(path: str, text: str) -> Document:
+    return Document(page_content=text, metadata={"source": path})
+
+
+def _build_index() -> RepoIndex:
+    docs = [
+        _doc("fastapi/routing.py", PYTHON_SOURCE),
+        _doc("fastapi/openapi/utils.py", "def get_openapi(app):\n    return {}\n"),
+        _doc("tests/test_routing.py", "class APIRouter:\n    pass\n"),
+        _doc("docs/index.md", MARKDOWN_SOURCE),
+    ]
+    # The clone also has files the ingestion policy doesn't load
+    listing = {
+        "fastapi/routing.py": len(PYTHON_SOURCE),
+        "fastapi/openapi/utils.py": 34,
+        "tests/test_routing.py": 27,
+        "docs/index.md": len(MARKDOWN_SOURCE),
+        "docs/logo.png": 5000,
+        "scripts/build.sh": 120,
+    }
+    return RepoIndex.from_documents(REPO, docs, listing)
+
+
+class SymbolExtractionTest(unittest.TestCase):
+    def test_python(self):
+        self.assertEqual(extract_symbols("app.py", PYTHON_SOURCE), [
+            ("MAX_RETRIES", "variable", 3),
+            ("timeout", "variable", 4),
+            ("APIRouter", "class", 7),
+            ("APIRouter.add_route", "method", 8),
+            ("APIRouter._dispatch", "method", 11),
+            ("get_openapi", "function", 15),
+            ("serve", "function", 19),
+        ])
+
+    def test_python_syntax_error(self):
+        self.assertEqual(extract_symbols("broken.py", "def broken(:\n"), [])
+
+    def test_javascript(self):
+        self.assertEqual(extract_symbols("app.ts", JS_SOURCE), [
+            ("createApp", "function", 1),
+            ("fetchData", "function", 2),
+            ("Router", "class", 3),
+            ("routes", "variable", 4),
+            ("counter", "variable", 5),
+            ("Props", "interface", 6),
+            ("Handler", "type", 7),
+            ("Color", "enum", 8),
+        ])
+
+    def test_java(self):
+        self.assertEqual(extract_symbols("UserService.java", JAVA_SOURCE), [
+            ("UserService", "class", 3),
+            ("UserService.findUser", "method", 6),
+            ("UserService.listAll", "method", 13),
+            ("Repo", "interface", 18),
+        ])
+
+    def test_markdown_skips_fenced_code(self):
+        self.assertEqual(extract_symbols("README.md", MARKDOWN_SOURCE), [
+            ("Project Title", "heading", 1),
+            ("Getting Started", "heading", 5),
+        ])
+
+    def test_unknown_language(self):
+        self.assertEqual(extract_symbols("main.go", "func main() {}\n"), [])
+
+
+class RepoIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = _build_index()
+
+    def test_tree_counts_listed_files(self):
+        tree = self.index.tree()
+        self.assertEqual(tree.files, 6)
+        self.assertEqual(tree.bytes, sum(entry[0] for entry in self.index.files.values()))
+        dirs = {entry.path: entry for entry in tree.entries if entry.path.endswith("/")}
+        self.assertEqual(set(dirs), {"docs/", "fastapi/", "fastapi/openapi/", "scripts/", "tests/"})
+        self.assertEqual(dirs["docs/"].files, 2)
+        self.assertEqual(dirs["fastapi/"].files, 2)
+        self.assertEqual(dirs["fastapi/"].language, "Python")
+
+    def test_tree_of_subdirectory(self):
+        tree = self.index.tree("fastapi/")
+        self.assertEqual(tree.root, "fastapi/")
+        self.assertEqual(tree.files, 2)
+        files = {entry.path: entry for entry in tree.entries if not entry.path.endswith("/")}
+        self.assertEqual(files["fastapi/routing.py"].symbols, ("APIRouter", "get_openapi", "serve", "MAX_RETRIES", "timeout"))
+        self.assertIsNone(self.index.tree("missing"))
+
+    def test_listed_files_have_no_symbols(self):
+        self.assertEqual(self.index.files["docs/logo.png"], [5000, None, None, []])
+        self.assertEqual(self.index.files["scripts/build.sh"][2], "Shell")
+
+    def test_find_symbol_prefers_exact_non_test_matches(self):
+        result = self.index.find_symbol("APIRouter")
+        self.assertEqual(result.total, 2)
+        self.assertEqual([(m.path, m.line) for m in result.matches],
+                         [("fastapi/routing.py", 7), ("tests/test_routing.py", 1)])
+
+    def test_find_symbol_by_method_name(self):
+        result = self.index.find_symbol("`add_route`")
+        self.assertEqual(result.symbol, "add_route")
+        self.assertEqual([m.name for m in result.matches], ["APIRouter.add_route"])
+
+    def test_find_symbol_case_insensitive(self):
+        result = self.index.find_symbol("get_OpenAPI")
+        self.assertEqual({m.path for m in result.matches}, {"fastapi/routing.py", "fastapi/openapi/utils.py"})
+        self.assertEqual(self.index.find_symbol("missing").total, 0)
+
+    def test_update_keeps_skipped_changed_files(self):
+        self.index.update([_doc("fastapi/new.py", "def added():\n    pass\n")],
+                          removed=["tests/test_routing.py"], listed=["scripts/build.sh", "bin/tool"])
+        self.assertNotIn("tests/test_routing.py", self.index.files)
+        self.assertEqual(self.index.files["scripts/build.sh"][0], 120)
+        self.assertEqual(self.index.files["bin/tool"][0], 0)
+        self.assertEqual([m.path for m in self.index.find_symbol("added").matches], ["fastapi/new.py"])
+        self.assertEqual(self.index.find_symbol("APIRouter").total, 1)
+
+    def test_round_trip(self):
+        loaded = RepoIndex.from_bytes(self.index.to_bytes())
+        self.assertEqual(loaded.files, self.index.files)
+        self.assertEqual(loaded.tree(), self.index.tree())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,6 +23,8 @@ export function ChatInterface() {
     const [inputValue, setInputValue] = useState("");
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const chatInputRef = useRef<{ focus: () => void }>(null);
+    // Server-side conversation context, so follow-ups can omit the repo name
+    const sessionIdRef = useRef<string | null>(null);
 
     const scrollToBottom = () => {
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -43,7 +45,9 @@ export function ChatInterface() {
             const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
             const response = await axios.post(`${apiUrl}/chat`, {
                 query: input,
+                session_id: sessionIdRef.current,
             });
+            sessionIdRef.current = response.data.session_id ?? sessionIdRef.current;
 
             const content = response.data.response || response.data.message || JSON.stringify(response.data);
 